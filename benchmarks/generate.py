@@ -0,0 +1,147 @@
+"""
+Deterministic generator of synthetic member datasets.
+
+The data mimics the members export: one row per application with names,
+PUP webmail, student number, course, year level and section. Rates of name
+typos, case mix-ups, missing values and duplicate webmails are configurable,
+and the same arguments always produce the same data.
+
+Usage:
+    python -m benchmarks.generate 10000 --output members_10k.csv --seed 1
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = [
+    'Mary Grace', 'Juan', 'Maria', 'Jose', 'Ana', 'Mark', 'John Paul', 'Angela', 'Paolo',
+    'Kristine', 'Miguel', 'Carlo', 'Andrea', 'Patricia', 'Joshua', 'Nicole', 'Pedro',
+    'Rafael', 'Camille', 'Bea', 'Christian', 'Jasmine', 'Gabriel', 'Sofia', 'Luis', 'Katrina'
+]
+LAST_NAMES = [
+    'Dela Cruz', 'Santos', 'Reyes', 'Bautista', 'Garcia', 'Mendoza', 'Torres', 'Flores',
+    'Villanueva', 'Ramos', 'Castillo', 'Aquino', 'Navarro', 'Gonzales', 'Lopez', 'Mercado',
+    'Domingo', 'Salazar', 'Pascual', 'Soriano', 'Del Rosario', 'Manalo', 'Cruz', 'Tolentino'
+]
+COURSES = ['BSIT', 'BSCS', 'BSIE', 'BSECE', 'BSIS', 'BSA', 'BSBA']
+WEBMAIL_DOMAIN = 'iskolarngbayan.pup.edu.ph'
+
+# Output columns, named as in the members export.
+COLUMNS = [
+    'First Name', 'Middle Name', 'Last Name', 'Full Name', 'PUP Webmail',
+    'Student Number', 'Course', 'Year Level', 'Section'
+]
+
+# Columns that can be left blank; the student number and names are always filled in.
+OPTIONAL_COLUMNS = ['Middle Name', 'PUP Webmail', 'Course', 'Year Level', 'Section']
+
+
+def _typo(rng, s):
+    """Substitute, delete or swap one character."""
+    if len(s) < 3:
+        return s
+    i = int(rng.integers(1, len(s) - 1))
+    kind = rng.integers(3)
+    if kind == 0:
+        return s[:i] + chr(int(rng.integers(ord('a'), ord('z') + 1))) + s[i + 1:]
+    if kind == 1:
+        return s[:i] + s[i + 1:]
+    return s[:i - 1] + s[i] + s[i - 1] + s[i + 1:]
+
+
+def _mix_case(rng, s):
+    """Uppercase, lowercase or randomly case a name."""
+    kind = rng.integers(3)
+    if kind == 0:
+        return s.upper()
+    if kind == 1:
+        return s.lower()
+    flips = rng.random(len(s)) < 0.5
+    return ''.join(c.upper() if flip else c.lower() for c, flip in zip(s, flips))
+
+
+def generate_members(rows, seed=0, typo_rate=0.05, case_rate=0.1, missing_rate=0.05, duplicate_rate=0.05):
+    """
+    Generate a synthetic members dataset.
+
+    Parameters:
+        rows (int): Number of rows.
+        seed (int): Random seed; the same arguments always give the same data (default is 0).
+        typo_rate (float): Share of rows with a typo in one of their names (default is 0.05).
+        case_rate (float): Share of rows with a mis-cased first or last name (default is 0.1).
+        missing_rate (float): Share of blank cells in each optional column (default is 0.05).
+        duplicate_rate (float): Share of rows that repeat the webmail and names of
+            another row, like a member applying twice (default is 0.05).
+
+    Returns:
+        pd.DataFrame: The dataset with the columns in COLUMNS and a 0-based index.
+    """
+    rng = np.random.default_rng(seed)
+
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=rows)]
+    middle = np.array(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=rows)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=rows)]
+    year = rng.integers(2018, 2025, size=rows)
+    ids = np.arange(rows)
+
+    webmail = np.array([
+        f"{f.split()[0].lower()}{l.replace(' ', '').lower()}{i}@{WEBMAIL_DOMAIN}"
+        for f, l, i in zip(first, last, ids)
+    ], dtype=object)
+    student_number = np.array([f"{y}-{i:05d}-MN-0" for y, i in zip(year, ids % 100000)], dtype=object)
+
+    # Repeat applicants: copy the person, keep their own student number
+    duplicates = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    duplicates = duplicates[duplicates > 0]
+    sources = (rng.random(len(duplicates)) * duplicates).astype('int64')
+    first[duplicates], middle[duplicates], last[duplicates] = first[sources], middle[sources], last[sources]
+    webmail[duplicates] = webmail[sources]
+
+    for i in np.flatnonzero(rng.random(rows) < case_rate):
+        if rng.random() < 0.5:
+            first[i] = _mix_case(rng, first[i])
+        else:
+            last[i] = _mix_case(rng, last[i])
+    for i in np.flatnonzero(rng.random(rows) < typo_rate):
+        if rng.random() < 0.5:
+            first[i] = _typo(rng, first[i])
+        else:
+            last[i] = _typo(rng, last[i])
+
+    df = pd.DataFrame({
+        'First Name': first,
+        'Middle Name': middle,
+        'Last Name': last,
+        'Full Name': [f"{f} {m} {l}" for f, m, l in zip(first, middle, last)],
+        'PUP Webmail': webmail,
+        'Student Number': student_number,
+        'Course': np.array(COURSES, dtype=object)[rng.integers(len(COURSES), size=rows)],
+        'Year Level': rng.integers(1, 5, size=rows).astype(object),
+        'Section': rng.integers(1, 6, size=rows).astype(object)
+    })
+    for col in OPTIONAL_COLUMNS:
+        df.loc[rng.random(rows) < missing_rate, col] = None
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic members CSV.")
+    parser.add_argument('rows', type=int, help="Number of rows")
+    parser.add_argument('-o', '--output', default='members.csv', help="CSV file to write (default: members.csv)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--typo-rate', type=float, default=0.05)
+    parser.add_argument('--case-rate', type=float, default=0.1)
+    parser.add_argument('--missing-rate', type=float, default=0.05)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    df = generate_members(
+        args.rows, args.seed, args.typo_rate, args.case_rate, args.missing_rate, args.duplicate_rate
+    )
+    df.to_csv(args.output)
+    print(f"Wrote {len(df)} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
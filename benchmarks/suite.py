@@ -0,0 +1,245 @@
+"""
+Benchmarks for the `helpers` and `visualizations` functions.
+
+Every function is timed (best of several runs) and its peak memory is
+measured with tracemalloc on generated member data of each size. The data
+is loaded through `ingest` like an upload, so the benchmarks see the same
+compact dtypes as the app. Results are written as JSON and can be compared
+with a saved baseline: a benchmark regresses when it is slower or uses more
+memory than the baseline by more than the tolerance.
+
+Usage (from the repository root):
+    python -m benchmarks.suite --output results.json --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import helpers as h
+import ingest
+import visualizations as viz
+from benchmarks.generate import generate_members
+from duplicates import DuplicateIndex
+from profiling import profile_dataframe
+
+# Dataset sizes benchmarked by default.
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Timed runs per benchmark; the fastest counts.
+DEFAULT_REPEAT = 3
+
+# Allowed slowdown and memory growth against the baseline (0.25 = 25%).
+DEFAULT_TOLERANCE = 0.25
+
+# Benchmarks whose first run takes longer than this are not repeated.
+LONG_RUN_SECONDS = 10
+
+# Timings and peaks below these are too noisy to flag.
+MIN_FLAGGED_SECONDS = 0.005
+MIN_FLAGGED_BYTES = 2 ** 20
+
+
+def load_members(rows, seed=0):
+    """
+    Generated member data, loaded and cleaned like an upload.
+
+    Parameters:
+        rows (int): Number of rows.
+        seed (int): Generator seed (default is 0).
+
+    Returns:
+        pd.DataFrame: The data with compact dtypes and cleaned column names.
+    """
+    csv = generate_members(rows, seed).to_csv().encode('utf-8')
+    data, _ = ingest.read_members_csv(csv)
+    return h.clean_column_names(data)
+
+
+def benchmark_cases(df):
+    """
+    The benchmarked calls on one dataset.
+
+    Each case is a setup function, run outside the measurement, and a
+    function that receives the setup's result.
+
+    Parameters:
+        df (pd.DataFrame): The loaded data.
+
+    Returns:
+        dict: Benchmark name to `(setup, run)`.
+    """
+    profile = profile_dataframe(df)
+    case_analysis = h.analyze_text_case(df, profile=profile)
+    groups = DuplicateIndex(df).groups(['pup_webmail'])
+
+    def same(value):
+        return lambda: value
+
+    return {
+        'helpers.clean_column_names': (
+            lambda: h.adjust_column_names_for_download(df), h.clean_column_names
+        ),
+        'helpers.adjust_column_names_for_download': (same(df), h.adjust_column_names_for_download),
+        'helpers.calculate_data_metrics': (same(df), h.calculate_data_metrics),
+        'helpers.calculate_data_metrics[profile]': (same(df), lambda data: h.calculate_data_metrics(data, profile)),
+        'helpers.analyze_text_case': (same(df), h.analyze_text_case),
+        'helpers.analyze_text_case[profile]': (same(df), lambda data: h.analyze_text_case(data, profile=profile)),
+        'helpers.find_similar_strings_with_rows': (
+            same(df), lambda data: h.find_similar_strings_with_rows(data, 'full_name', 0.8, workers=1)
+        ),
+        'helpers.duplicate_groups_table': (same(df), lambda data: h.duplicate_groups_table(data, ['pup_webmail'], groups)),
+        'visualizations.create_missing_values_chart': (same(df), viz.create_missing_values_chart),
+        'visualizations.create_missing_values_chart[profile]': (
+            same(df), lambda data: viz.create_missing_values_chart(data, profile)
+        ),
+        'visualizations.create_text_case_chart': (same(case_analysis), viz.create_text_case_chart)
+    }
+
+
+def measure(setup, run, repeat=DEFAULT_REPEAT):
+    """
+    Time a call and measure its peak memory.
+
+    Parameters:
+        setup (callable): Builds the argument of `run`; not measured.
+        run (callable): The measured call.
+        repeat (int): Timed runs; the fastest is reported (default is DEFAULT_REPEAT).
+            A run longer than LONG_RUN_SECONDS is not repeated.
+
+    Returns:
+        dict: `seconds` (fastest run) and `peak_bytes` (traced peak of one extra run).
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        gc.collect()
+        started = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - started)
+        if times[-1] > LONG_RUN_SECONDS:
+            break
+
+    # Tracing slows Python code down, so memory is measured in a run of its own
+    arg = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(times), 'peak_bytes': peak}
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, only=None, seed=0):
+    """
+    Run every benchmark at every size.
+
+    Parameters:
+        sizes (list): Dataset sizes in rows (default is DEFAULT_SIZES).
+        repeat (int): Timed runs per benchmark (default is DEFAULT_REPEAT).
+        only (list): Only run benchmarks whose name contains one of these strings.
+        seed (int): Generator seed (default is 0).
+
+    Returns:
+        dict: `meta` (environment) and `results`, one entry per benchmark and size
+            with its name, rows, seconds and peak_bytes.
+    """
+    results = []
+    for rows in sizes:
+        df = load_members(rows, seed)
+        for name, (setup, run) in benchmark_cases(df).items():
+            if only and not any(part in name for part in only):
+                continue
+            result = {'name': name, 'rows': rows, **measure(setup, run, repeat)}
+            results.append(result)
+            print(f"{name:<55} {rows:>7} rows {result['seconds'] * 1000:>10.1f} ms "
+                  f"{result['peak_bytes'] / 2 ** 20:>8.1f} MiB", flush=True)
+    return {
+        'meta': {
+            'created': pd.Timestamp.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'seed': seed,
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Find regressions against a baseline.
+
+    Parameters:
+        results (dict): Output of `run_suite`.
+        baseline (dict): An earlier output of `run_suite`.
+        tolerance (float): Allowed relative growth of time and memory (default is DEFAULT_TOLERANCE).
+
+    Returns:
+        list: One dict per regression with the benchmark name, rows, metric,
+            baseline value, current value and ratio.
+    """
+    previous = {(r['name'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        base = previous.get((result['name'], result['rows']))
+        if base is None:
+            continue
+        for metric, floor in (('seconds', MIN_FLAGGED_SECONDS), ('peak_bytes', MIN_FLAGGED_BYTES)):
+            if result[metric] < floor:
+                continue
+            if base[metric] and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append({
+                    'name': result['name'],
+                    'rows': result['rows'],
+                    'metric': metric,
+                    'baseline': base[metric],
+                    'current': result[metric],
+                    'ratio': round(result[metric] / base[metric], 2)
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the helpers and visualizations functions.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Dataset sizes in rows")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark")
+    parser.add_argument('--only', nargs='+', help="Only run benchmarks whose name contains one of these")
+    parser.add_argument('--seed', type=int, default=0, help="Generator seed")
+    parser.add_argument('-o', '--output', help="Write the results to this JSON file")
+    parser.add_argument('-b', '--baseline', help="Compare with the results in this JSON file")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Write the results as a new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.repeat, args.only, args.seed)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['name']} at {r['rows']} rows: {r['metric']} "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} (x{r['ratio']})")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Run the data quality checks over a directory of member CSVs without the UI.
+
+Each file is read with the pyarrow CSV reader, its columns are cleaned as in the app, and its
+metrics, missing values, text case analysis, duplicates and similar values
+are written as machine-readable reports. Files are processed in parallel,
+one process per file. Neither Streamlit nor Plotly is imported.
+
+Usage:
+    python cli.py DATA_DIR --output reports [--workers 4] [--format parquet]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import export
+import helpers as h
+import ingest
+from duplicates import DuplicateIndex
+from profiling import profile_dataframe
+
+# Columns checked for duplicates and similar values when none are given.
+DEFAULT_DUPLICATE_COLUMNS = ['pup_webmail']
+DEFAULT_SIMILARITY_COLUMNS = ['full_name']
+
+# Formats of the per-file report tables; summaries are always JSON.
+REPORT_FORMATS = ['json', 'parquet']
+
+# Default number of files checked at once.
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+def _json_default(value):
+    """Convert numpy scalars and other non-JSON values found in reports."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _write_table(df, path, report_format):
+    """Write a report table as JSON records or Parquet and return the file name."""
+    path = f"{path}.{report_format}"
+    if report_format == 'parquet':
+        export.arrow_compatible(df).to_parquet(path, index=False)
+    else:
+        df.to_json(path, orient='records', indent=2, force_ascii=False)
+    return os.path.basename(path)
+
+
+def find_csv_files(data_dir):
+    """
+    List the CSV files in a directory, sorted by name.
+
+    Parameters:
+        data_dir (str): The directory to scan (not recursive).
+
+    Returns:
+        list: Paths of the CSV files.
+    """
+    return sorted(
+        os.path.join(data_dir, name)
+        for name in os.listdir(data_dir)
+        if name.lower().endswith('.csv') and os.path.isfile(os.path.join(data_dir, name))
+    )
+
+
+def check_file(path, output_dir, duplicate_columns=None, similarity_columns=None,
+               threshold=0.8, report_format='json', block_size=ingest.DEFAULT_BLOCK_SIZE):
+    """
+    Run the quality checks on one CSV and write its reports.
+
+    Reports go to a directory named after the file inside `output_dir`:
+    `summary.json` with the ingest report, metrics, missing values and
+    finding counts, plus one table per check (`columns`, `case_analysis`,
+    `duplicates_<columns>` and `similar_<column>`).
+
+    Parameters:
+        path (str): The CSV file.
+        output_dir (str): The directory receiving the reports.
+        duplicate_columns (list): Column sets checked for duplicate rows (default is
+            each of DEFAULT_DUPLICATE_COLUMNS on its own). Sets with a missing column are skipped.
+        similarity_columns (list): Columns checked for similar values (default is DEFAULT_SIMILARITY_COLUMNS).
+        threshold (float): The similarity threshold (default is 0.8).
+        report_format (str): 'json' or 'parquet' for the tables (default is 'json').
+        block_size (int): Bytes parsed per block (default is ingest.DEFAULT_BLOCK_SIZE).
+
+    Returns:
+        dict: The file summary, as written to `summary.json`.
+    """
+    started = time.perf_counter()
+    if duplicate_columns is None:
+        duplicate_columns = [[col] for col in DEFAULT_DUPLICATE_COLUMNS]
+    if similarity_columns is None:
+        similarity_columns = DEFAULT_SIMILARITY_COLUMNS
+
+    data, report = ingest.read_members_csv(path, block_size)
+    data = h.clean_column_names(data)
+    profile = profile_dataframe(data)
+
+    file_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0])
+    os.makedirs(file_dir, exist_ok=True)
+    tables = {}
+
+    columns = pd.DataFrame([
+        {
+            'column': name,
+            'dtype': str(data[name].dtype),
+            'null_count': column.null_count,
+            'distinct_count': column.distinct_count,
+            'duplicate_count': column.duplicate_count,
+            'min_length': column.min_length,
+            'max_length': column.max_length,
+            'mean_length': column.mean_length
+        }
+        for name, column in profile.columns.items()
+    ])
+    tables['columns'] = _write_table(columns, os.path.join(file_dir, 'columns'), report_format)
+
+    case_analysis = h.analyze_text_case(data, profile=profile)
+    tables['case_analysis'] = _write_table(
+        case_analysis.rename_axis('check').reset_index(), os.path.join(file_dir, 'case_analysis'), report_format
+    )
+
+    duplicates = {}
+    duplicate_index = DuplicateIndex(data)
+    for subset in duplicate_columns:
+        if not all(col in data.columns for col in subset):
+            continue
+        name = '_'.join(subset)
+        groups = duplicate_index.groups(subset)
+        table = h.duplicate_groups_table(data, subset, groups)
+        tables[f'duplicates_{name}'] = _write_table(table, os.path.join(file_dir, f'duplicates_{name}'), report_format)
+        duplicates[name] = {'groups': len(groups), 'rows': int(groups['size'].sum())}
+
+    similar = {}
+    for column in similarity_columns:
+        if column not in data.columns:
+            continue
+        # Files already run in parallel, so each column is scored in this process
+        pairs_df, matching_rows = h.find_similar_strings_with_rows(data, column, threshold, workers=1)
+        tables[f'similar_{column}'] = _write_table(pairs_df, os.path.join(file_dir, f'similar_{column}'), report_format)
+        similar[column] = {'pairs': len(pairs_df), 'rows': len(matching_rows)}
+
+    summary = {
+        'file': os.path.abspath(path),
+        'ingest': report,
+        'metrics': h.calculate_data_metrics(data, profile),
+        'missing_values': profile.missing_counts().to_dict(),
+        'duplicates': duplicates,
+        'similar': similar,
+        'tables': tables,
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    with open(os.path.join(file_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, default=_json_default)
+    return summary
+
+
+def run(paths, output_dir, workers=DEFAULT_WORKERS, **options):
+    """
+    Check several CSV files, in parallel when there is more than one worker.
+
+    A file that fails does not stop the others; its error is recorded in the
+    run summary instead.
+
+    Parameters:
+        paths (list): The CSV files.
+        output_dir (str): The directory receiving the reports.
+        workers (int): Number of files checked at once (default is one per CPU).
+        **options: Keyword arguments passed on to `check_file`.
+
+    Returns:
+        dict: The run summary with one entry per file, in the order of `paths`.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    results = {}
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                results[path] = check_file(path, output_dir, **options)
+            except Exception as e:
+                results[path] = {'file': os.path.abspath(path), 'error': str(e)}
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            futures = {executor.submit(check_file, path, output_dir, **options): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    results[path] = {'file': os.path.abspath(path), 'error': str(e)}
+
+    run_summary = {
+        'files': [
+            {key: value for key, value in results[path].items() if key in ('file', 'metrics', 'duplicates', 'similar', 'seconds', 'error')}
+            for path in paths
+        ],
+        'failed': sum('error' in results[path] for path in paths),
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(run_summary, f, indent=2, default=_json_default)
+    return run_summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run AWSCC data quality checks over a directory of CSV files.")
+    parser.add_argument('data_dir', help="Directory containing the CSV files")
+    parser.add_argument('-o', '--output', default='reports', help="Directory for the reports (default: reports)")
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS, help="Files checked at once (default: one per CPU)")
+    parser.add_argument('-f', '--format', choices=REPORT_FORMATS, default='json', help="Format of the report tables (default: json)")
+    parser.add_argument(
+        '-d', '--duplicates', action='append', metavar='COLUMNS',
+        help="Comma-separated columns checked together for duplicates; repeatable (default: pup_webmail)"
+    )
+    parser.add_argument(
+        '-s', '--similarity', action='append', metavar='COLUMN',
+        help="Column checked for similar values; repeatable (default: full_name)"
+    )
+    parser.add_argument('-t', '--threshold', type=float, default=0.8, help="Similarity threshold (default: 0.8)")
+    parser.add_argument('--block-size', type=int, default=ingest.DEFAULT_BLOCK_SIZE, help="Bytes parsed per block")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = find_csv_files(args.data_dir)
+    if not paths:
+        print(f"No CSV files found in {args.data_dir}", file=sys.stderr)
+        return 1
+
+    run_summary = run(
+        paths,
+        args.output,
+        workers=args.workers,
+        duplicate_columns=[columns.split(',') for columns in args.duplicates] if args.duplicates else None,
+        similarity_columns=args.similarity,
+        threshold=args.threshold,
+        report_format=args.format,
+        block_size=args.block_size
+    )
+    for result in run_summary['files']:
+        status = f"error: {result['error']}" if 'error' in result else f"{result['metrics']['total_rows']} rows in {result['seconds']}s"
+        print(f"{os.path.basename(result['file'])}: {status}")
+    print(f"Checked {len(paths)} files in {run_summary['seconds']}s, reports in {args.output}")
+    return 1 if run_summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
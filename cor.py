@@ -0,0 +1,324 @@
+import csv
+import io
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Fields read from each Certificate of Registration.
+COR_FIELDS = ['student_number', 'pup_webmail', 'name', 'course']
+
+# Header names accepted for each field in CSV exports, after lowercasing and
+# turning every run of other characters into an underscore.
+HEADER_ALIASES = {
+    'student_number': ['student_number', 'student_no', 'stud_no', 'student_id', 'sn'],
+    'pup_webmail': ['pup_webmail', 'webmail', 'email', 'email_address'],
+    'name': ['name', 'full_name', 'student_name'],
+    'course': ['course', 'program', 'course_code']
+}
+
+# PUP student numbers, e.g. 2021-00123-MN-0; separators may be missing or spaced.
+STUDENT_NUMBER_PATTERN = r'(\d{4})\W*(\d{5})\W*([A-Z]{2})\W*(\d)'
+
+# Webmail addresses found in text exports.
+WEBMAIL_PATTERN = r'[\w.+-]+@iskolarngbayan\.pup\.edu\.ph'
+
+# Labelled lines of text exports, e.g. "Name: DELA CRUZ, JUAN".
+_TEXT_LABELS = {
+    'name': re.compile(r'^\s*(?:student\s*)?name\s*[:\-]\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE),
+    'course': re.compile(r'^\s*(?:course|program)\s*[:\-]\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+}
+_STUDENT_NUMBER = re.compile(STUDENT_NUMBER_PATTERN, re.IGNORECASE)
+_WEBMAIL = re.compile(WEBMAIL_PATTERN, re.IGNORECASE)
+
+# Default number of worker processes for parsing.
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Fewer files than this are always parsed serially. Parsing takes tens of
+# microseconds per file, while starting the spawned workers takes seconds.
+PARALLEL_MIN_FILES = 20000
+
+# Number of chunks handed to each worker, so uneven chunks even out.
+CHUNKS_PER_WORKER = 4
+
+# Match statuses of a COR, in display order.
+STATUSES = ['enrolled', 'conflict', 'unmatched']
+
+
+def _header_key(header):
+    return re.sub(r'[^a-z0-9]+', '_', header.strip().lower()).strip('_')
+
+
+def _csv_fields(header):
+    """Map each COR field to its column in a CSV header, or None if the header has no student key."""
+    keys = [_header_key(cell) for cell in header]
+    fields = {
+        field: next((keys.index(alias) for alias in aliases if alias in keys), None)
+        for field, aliases in HEADER_ALIASES.items()
+    }
+    if fields['student_number'] is None and fields['pup_webmail'] is None:
+        return None
+    return fields
+
+
+def parse_cor(name, content):
+    """
+    Read the student records of one COR export.
+
+    CSV exports need a header with a student number or webmail column and
+    give one record per row. Anything else is read as the text of a single
+    COR: the first student number and webmail found anywhere in it, and the
+    name and course from labelled lines.
+
+    Parameters:
+        name (str): The file name, kept as the source of the records.
+        content (bytes): The file contents.
+
+    Returns:
+        list: One dict per student with `source` and the fields in COR_FIELDS
+            (None where absent).
+
+    Raises:
+        ValueError: If the file holds no student number or webmail.
+    """
+    text = content.decode('utf-8-sig', errors='replace') if isinstance(content, bytes) else content
+    lines = text.splitlines()
+    first_line = next((line for line in lines if line.strip()), '')
+
+    dialect = ',' if first_line.count(',') >= first_line.count('\t') else '\t'
+    rows = csv.reader(io.StringIO(text), delimiter=dialect)
+    header = next(rows, [])
+    fields = _csv_fields(header) if len(header) > 1 else None
+    if fields is not None:
+        records = []
+        for row in rows:
+            if not any(cell.strip() for cell in row):
+                continue
+            record = {'source': name}
+            for field, column in fields.items():
+                value = row[column].strip() if column is not None and column < len(row) else ''
+                record[field] = value or None
+            records.append(record)
+        return records
+
+    student_number = _STUDENT_NUMBER.search(text)
+    webmail = _WEBMAIL.search(text)
+    if student_number is None and webmail is None:
+        raise ValueError("no student number or webmail found")
+    record = {
+        'source': name,
+        'student_number': student_number.group(0) if student_number else None,
+        'pup_webmail': webmail.group(0) if webmail else None
+    }
+    for field, pattern in _TEXT_LABELS.items():
+        match = pattern.search(text)
+        record[field] = match.group(1) if match else None
+    return [record]
+
+
+def _parse_chunk(files):
+    """Parse a list of `(name, content)` files, collecting errors instead of raising."""
+    records, errors = [], []
+    for name, content in files:
+        try:
+            records.extend(parse_cor(name, content))
+        except (ValueError, UnicodeError, csv.Error) as e:
+            errors.append({'file': name, 'error': str(e)})
+    return records, errors
+
+
+def read_cor_files(files, workers=None):
+    """
+    Parse many COR exports, in parallel when there are enough of them.
+
+    Parameters:
+        files (list): `(name, content)` tuples.
+        workers (int): Number of worker processes (default is DEFAULT_WORKERS). Fewer
+            than PARALLEL_MIN_FILES files are parsed serially.
+
+    Returns:
+        tuple: A tuple containing:
+            - records (pd.DataFrame): One row per student with `source` and COR_FIELDS,
+              in file order, the student numbers and webmails normalized.
+            - errors (pd.DataFrame): The files that could not be read, with `file` and `error`.
+    """
+    files = list(files)
+    if workers is None:
+        workers = DEFAULT_WORKERS
+
+    if workers > 1 and len(files) >= PARALLEL_MIN_FILES:
+        size = -(-len(files) // (workers * CHUNKS_PER_WORKER))
+        chunks = [files[i:i + size] for i in range(0, len(files), size)]
+        # Spawned workers do not inherit the state of the threads serving the app.
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            results = list(executor.map(_parse_chunk, chunks))
+    else:
+        results = [_parse_chunk(files)]
+
+    records = pd.DataFrame(
+        [record for chunk_records, _ in results for record in chunk_records],
+        columns=['source'] + COR_FIELDS
+    )
+    records['student_number'] = normalize_student_numbers(records['student_number'])
+    records['pup_webmail'] = normalize_webmails(records['pup_webmail'])
+    errors = pd.DataFrame([error for _, chunk_errors in results for error in chunk_errors], columns=['file', 'error'])
+    return records, errors
+
+
+def normalize_student_numbers(values):
+    """
+    Bring student numbers to the form 2021-00123-MN-0.
+
+    Parameters:
+        values (pd.Series): Raw student numbers.
+
+    Returns:
+        pd.Series: Normalized numbers, missing where a value is not a student number.
+    """
+    parts = pd.Series(values, dtype='string').str.upper().str.extract(STUDENT_NUMBER_PATTERN)
+    return parts[0].str.cat(parts[[1, 2, 3]], sep='-')
+
+
+def normalize_webmails(values):
+    """
+    Trim and lowercase email addresses.
+
+    Parameters:
+        values (pd.Series): Raw addresses.
+
+    Returns:
+        pd.Series: Normalized addresses, missing where a value is blank.
+    """
+    values = pd.Series(values, dtype='string').str.strip().str.lower()
+    return values.mask(values == '')
+
+
+class MemberKeyIndex:
+    """
+    Hash index from normalized student numbers and webmails to member rows.
+
+    Each key field keeps a hash table of its distinct normalized values, the
+    first row holding each value and how many rows hold it, so a batch of
+    CORs is joined with one vectorized lookup per field.
+    """
+
+    KEY_FIELDS = ['student_number', 'pup_webmail']
+
+    def __init__(self, members):
+        self.size = len(members)
+        self.keys = {}
+        self._tables = {}
+        for field, normalize in zip(self.KEY_FIELDS, (normalize_student_numbers, normalize_webmails)):
+            if field in members.columns:
+                keys = normalize(members[field].reset_index(drop=True))
+            else:
+                keys = pd.Series(pd.NA, index=range(len(members)), dtype='string')
+            codes, uniques = pd.factorize(keys)
+            valid = np.flatnonzero(codes >= 0)
+            _, first = np.unique(codes[valid], return_index=True)
+            counts = np.bincount(codes[valid], minlength=len(uniques))
+            self.keys[field] = keys.to_numpy(dtype=object, na_value=None)
+            self._tables[field] = (pd.Index(uniques), valid[first], counts)
+
+    def lookup(self, field, keys):
+        """
+        Find the member rows holding each key.
+
+        Parameters:
+            field (str): 'student_number' or 'pup_webmail'.
+            keys (pd.Series): Normalized keys.
+
+        Returns:
+            tuple: A tuple containing:
+                - positions (np.ndarray): The first member row holding each key, -1 if none.
+                - counts (np.ndarray): How many member rows hold each key.
+        """
+        table, first, counts = self._tables[field]
+        codes = table.get_indexer(pd.Series(keys, dtype='string').to_numpy(dtype=object, na_value=None))
+        # Missing keys are never stored, so they always come back as -1
+        found = codes >= 0
+        positions = np.full(len(codes), -1, dtype='int64')
+        positions[found] = first[codes[found]]
+        matches = np.zeros(len(codes), dtype='int64')
+        matches[found] = counts[codes[found]]
+        return positions, matches
+
+
+def match_cors(records, index):
+    """
+    Join COR records to the members they belong to.
+
+    A COR is matched by its student number, or by its webmail when the
+    student number is not in the roster. It is a conflict when its student
+    number and webmail point to different members, when it disagrees with
+    the matched member's student number or webmail, when its key is held
+    by several members, or when another COR matched the same member.
+
+    Parameters:
+        records (pd.DataFrame): Records from `read_cor_files`.
+        index (MemberKeyIndex): The index of the members data.
+
+    Returns:
+        pd.DataFrame: The records with `position` (member row, -1 if unmatched),
+            `matched_by`, `status` (one of STATUSES) and `reason`.
+    """
+    sn_positions, sn_counts = index.lookup('student_number', records['student_number'])
+    wm_positions, wm_counts = index.lookup('pup_webmail', records['pup_webmail'])
+    positions = np.where(sn_positions >= 0, sn_positions, wm_positions)
+    matched = positions >= 0
+
+    by_student_number = sn_positions >= 0
+    matched_by = np.where(
+        by_student_number & (wm_positions >= 0), 'student_number, pup_webmail',
+        np.where(by_student_number, 'student_number', np.where(matched, 'pup_webmail', ''))
+    )
+
+    cor_numbers = records['student_number'].to_numpy(dtype=object, na_value=None)
+    cor_webmails = records['pup_webmail'].to_numpy(dtype=object, na_value=None)
+    safe = np.where(matched, positions, 0)
+    member_numbers = index.keys['student_number'][safe] if index.size else np.full(len(records), None, dtype=object)
+    member_webmails = index.keys['pup_webmail'][safe] if index.size else np.full(len(records), None, dtype=object)
+
+    def differs(cor_values, member_values):
+        both = pd.notna(cor_values) & pd.notna(member_values)
+        return matched & both & (cor_values != member_values)
+
+    checks = [
+        (by_student_number & (wm_positions >= 0) & (sn_positions != wm_positions),
+         "student number and webmail belong to different members"),
+        (differs(cor_numbers, member_numbers), "student number differs from the roster"),
+        (differs(cor_webmails, member_webmails), "webmail differs from the roster"),
+        (np.where(by_student_number, sn_counts, wm_counts) > 1, "member is listed more than once in the roster"),
+        (matched & pd.Series(positions).where(matched).duplicated(keep=False).to_numpy(), "several CORs match this member")
+    ]
+    reasons = np.full(len(records), '', dtype=object)
+    for mask, reason in checks:
+        reasons[mask] = np.where(reasons[mask] == '', reason, reasons[mask] + '; ' + reason)
+
+    result = records.copy()
+    result['position'] = positions
+    result['matched_by'] = matched_by
+    result['status'] = np.where(~matched, 'unmatched', np.where(reasons != '', 'conflict', 'enrolled'))
+    result['reason'] = np.where(~matched, 'not in the roster', reasons)
+    return result
+
+
+def members_without_cor(matches, size):
+    """
+    Positions of the members no COR was matched to.
+
+    Parameters:
+        matches (pd.DataFrame): Output of `match_cors`.
+        size (int): Number of members.
+
+    Returns:
+        np.ndarray: Member row positions, in order.
+    """
+    covered = np.zeros(size, dtype=bool)
+    positions = matches['position'].to_numpy()
+    covered[positions[positions >= 0]] = True
+    return np.flatnonzero(~covered)
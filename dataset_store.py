@@ -0,0 +1,226 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Memory the store may use for parsed frames and their artifacts, in MB.
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get('AWSCC_CACHE_MEMORY_MB', 512))
+
+# Disk space for spilled entries, in MB. The oldest spill files go first.
+DEFAULT_DISK_BUDGET_MB = int(os.environ.get('AWSCC_CACHE_DISK_MB', 2048))
+
+# Directory for spilled entries.
+DEFAULT_SPILL_DIR = os.environ.get(
+    'AWSCC_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'awscc-data-tool-cache')
+)
+
+
+def dataset_key(data):
+    """
+    Content hash identifying an uploaded dataset.
+
+    Args:
+        data (bytes): The raw bytes of the upload.
+
+    Returns:
+        str: The SHA-256 hex digest of `data`.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class DatasetEntry:
+    """A parsed dataset and the artifacts computed from it (report, profile, metrics, figures)."""
+    key: str
+    frame: pd.DataFrame
+    artifacts: dict = field(default_factory=dict)
+    size: int = 0
+
+
+def _entry_size(frame, artifacts):
+    return int(frame.memory_usage(deep=True).sum()) + len(pickle.dumps(artifacts))
+
+
+class DatasetStore:
+    """
+    Process-wide cache of parsed datasets keyed by the hash of their bytes.
+
+    Entries are kept in least-recently-used order. When the entries in memory
+    exceed the memory budget, the least recently used ones are written to the
+    spill directory (the frame as Parquet, its artifacts pickled) and dropped
+    from memory; a later `get` reloads them from disk. Entries that cannot be
+    written are logged and dropped. Frames handed out by
+    the store are shared between sessions and must not be modified.
+    """
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                 disk_budget_mb=DEFAULT_DISK_BUDGET_MB, spill_dir=DEFAULT_SPILL_DIR):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.disk_budget = disk_budget_mb * 1024 * 1024
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.RLock()
+
+    def _spill_paths(self, key):
+        return (
+            os.path.join(self.spill_dir, f"{key}.parquet"),
+            os.path.join(self.spill_dir, f"{key}.pkl")
+        )
+
+    def _spill(self, entry):
+        frame_path, artifacts_path = self._spill_paths(entry.key)
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            if not os.path.exists(frame_path):
+                entry.frame.to_parquet(frame_path)
+            with open(artifacts_path, 'wb') as f:
+                pickle.dump(entry.artifacts, f)
+        except Exception:
+            # The entry is already out of memory, so it is dropped and parsed
+            # again on its next upload; eviction must not fail another session's call
+            logger.warning("Could not spill dataset %s, dropping it", entry.key, exc_info=True)
+            for path in (frame_path, artifacts_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return
+        self._trim_disk()
+
+    def _trim_disk(self):
+        files = [
+            os.path.join(self.spill_dir, name)
+            for name in os.listdir(self.spill_dir)
+            if name.endswith(('.parquet', '.pkl'))
+        ]
+        files.sort(key=os.path.getmtime)
+        total = sum(os.path.getsize(path) for path in files)
+        while files and total > self.disk_budget:
+            path = files.pop(0)
+            total -= os.path.getsize(path)
+            os.remove(path)
+
+    def _load_spilled(self, key):
+        frame_path, artifacts_path = self._spill_paths(key)
+        if not (os.path.exists(frame_path) and os.path.exists(artifacts_path)):
+            return None
+        frame = pd.read_parquet(frame_path)
+        # Parquet metadata records string columns without their storage.
+        for col in frame.columns:
+            if isinstance(frame[col].dtype, pd.StringDtype):
+                frame[col] = frame[col].astype('string[pyarrow]')
+        with open(artifacts_path, 'rb') as f:
+            artifacts = pickle.load(f)
+        return DatasetEntry(key, frame, artifacts, _entry_size(frame, artifacts))
+
+    def _insert(self, entry):
+        old = self._entries.pop(entry.key, None)
+        if old is not None:
+            self._memory_used -= old.size
+        self._entries[entry.key] = entry
+        self._memory_used += entry.size
+        self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry in memory, even if it alone exceeds the budget.
+        while self._memory_used > self.memory_budget and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_used -= evicted.size
+            self._spill(evicted)
+
+    def get(self, key):
+        """
+        Look up a dataset, reloading it from the spill directory if it was evicted.
+
+        Args:
+            key (str): The dataset key from `dataset_key`.
+
+        Returns:
+            DatasetEntry: The entry, or None if the dataset is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+            entry = self._load_spilled(key)
+            if entry is not None:
+                self._insert(entry)
+            return entry
+
+    def put(self, key, frame, artifacts=None):
+        """
+        Add a parsed dataset to the store.
+
+        Args:
+            key (str): The dataset key from `dataset_key`.
+            frame (pd.DataFrame): The parsed data. It is shared and must not be modified afterwards.
+            artifacts (dict): Values computed from `frame`, e.g. the ingest report and profile.
+
+        Returns:
+            DatasetEntry: The stored entry.
+        """
+        artifacts = dict(artifacts or {})
+        entry = DatasetEntry(key, frame, artifacts, _entry_size(frame, artifacts))
+        with self._lock:
+            self._insert(entry)
+        return entry
+
+    def get_or_load(self, key, loader):
+        """
+        Look up a dataset, parsing it with `loader` on a miss.
+
+        Args:
+            key (str): The dataset key from `dataset_key`.
+            loader (callable): Returns `(frame, artifacts)` for the dataset.
+
+        Returns:
+            DatasetEntry: The cached or newly stored entry.
+        """
+        entry = self.get(key)
+        if entry is None:
+            frame, artifacts = loader()
+            entry = self.put(key, frame, artifacts)
+        return entry
+
+    def set_artifact(self, key, name, value):
+        """
+        Attach a computed artifact (e.g. figures) to a cached dataset.
+
+        Args:
+            key (str): The dataset key.
+            name (str): The artifact name.
+            value: The artifact. It must be picklable so the entry can be spilled.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.artifacts[name] = value
+            size = _entry_size(entry.frame, entry.artifacts)
+            self._memory_used += size - entry.size
+            entry.size = size
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def stats(self):
+        """
+        Current usage of the store.
+
+        Returns:
+            dict: Entries and bytes held in memory, and the memory budget.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'memory_bytes': self._memory_used,
+                'memory_budget_bytes': self.memory_budget
+            }
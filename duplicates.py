@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from profiling import is_missing
+
+
+class _ColumnCodes:
+    """Integer code of every row's value in one column, -1 when missing."""
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self.codes = codes.astype('int64')
+        self.ids = {value: i for i, value in enumerate(uniques.tolist())}
+
+    def code(self, value):
+        if is_missing(value):
+            return -1
+        code = self.ids.get(value)
+        if code is None:
+            code = self.ids[value] = len(self.ids)
+        return code
+
+
+class _RowKeys:
+    """Key of every row over a set of columns (-1 when any of them is missing) and the size of each key."""
+
+    def __init__(self, column_codes):
+        keys = np.zeros(len(column_codes[0].codes), dtype='int64')
+        missing = np.zeros(len(keys), dtype=bool)
+        for column in column_codes:
+            # Pairs of (key so far, column code) are renumbered, so keys stay below the row count
+            keys, _ = pd.factorize(keys * (len(column.ids) + 1) + column.codes + 1)
+            missing |= column.codes < 0
+        keys = keys.astype('int64')
+        keys[~missing] = pd.factorize(keys[~missing])[0]
+        keys[missing] = -1
+        self.keys = keys
+        self.counts = np.bincount(keys[~missing], minlength=int(keys.max(initial=-1)) + 1)
+        self.column_codes = column_codes
+        self._ids = None
+
+    def _row_tuple(self, position):
+        return tuple(column.codes[position] for column in self.column_codes)
+
+    def index_keys(self):
+        """Map the column codes of each key to the key; built before the first edit."""
+        if self._ids is None:
+            keys, first_rows = np.unique(self.keys, return_index=True)
+            self._ids = {
+                self._row_tuple(row): key for key, row in zip(keys.tolist(), first_rows.tolist()) if key >= 0
+            }
+
+    def update(self, positions):
+        """Recompute the keys of rows after some of their columns changed."""
+        positions = np.unique(np.asarray(positions, dtype='int64'))
+        old = self.keys[positions]
+        np.subtract.at(self.counts, old[old >= 0], 1)
+
+        new = np.empty(len(positions), dtype='int64')
+        added = 0  # Keys first seen in this batch, counted once the loop is done
+        for i, position in enumerate(positions.tolist()):
+            row = self._row_tuple(position)
+            if min(row) < 0:
+                new[i] = -1
+                continue
+            key = self._ids.get(row)
+            if key is None:
+                key = self._ids[row] = len(self.counts) + added
+                added += 1
+            new[i] = key
+
+        if added:
+            self.counts = np.concatenate([self.counts, np.zeros(added, dtype=self.counts.dtype)])
+        np.add.at(self.counts, new[new >= 0], 1)
+        self.keys[positions] = new
+
+
+class DuplicateIndex:
+    """
+    Duplicate and missing-value lookups for sets of columns.
+
+    Every column is factorized once into integer codes, and every column
+    set that has been checked keeps a key per row and the number of rows
+    sharing each key. Masks and duplicate groups are then array lookups.
+    `update` applies cell edits to the codes and to every cached key set
+    that includes the edited column, so nothing is recomputed after edits.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._codes = {}
+        self._keys = {}
+
+    def _column_codes(self, column):
+        if column not in self._codes:
+            self._codes[column] = _ColumnCodes(self.df[column])
+        return self._codes[column]
+
+    def _row_keys(self, columns):
+        key = tuple(sorted(columns))
+        if key not in self._keys:
+            self._keys[key] = _RowKeys([self._column_codes(column) for column in key])
+        return self._keys[key]
+
+    def update(self, changes):
+        """
+        Apply a batch of edits to the cached codes and row keys.
+
+        Args:
+            changes (pd.DataFrame): Edits from `edits.apply_edits`, with `position`, `column` and `new`.
+        """
+        changes = changes[changes['column'].isin(list(self._codes))]
+        edited = set(changes['column'])
+        affected = {columns: row_keys for columns, row_keys in self._keys.items() if edited.intersection(columns)}
+        # The code tuples of the existing keys are read before any code changes
+        for row_keys in affected.values():
+            row_keys.index_keys()
+        for column, column_changes in changes.groupby('column', sort=False):
+            codes = self._codes[column]
+            codes.codes[column_changes['position'].to_numpy(dtype='int64')] = [
+                codes.code(value) for value in column_changes['new']
+            ]
+        for columns, row_keys in affected.items():
+            row_keys.update(changes.loc[changes['column'].isin(columns), 'position'])
+
+    def missing_mask(self, columns):
+        """
+        Rows missing a value in any of the columns.
+
+        Args:
+            columns (list): The column names.
+
+        Returns:
+            np.ndarray: One boolean per row.
+        """
+        return self._row_keys(columns).keys < 0
+
+    def duplicate_mask(self, columns):
+        """
+        Rows whose values in the columns appear in another row, like
+        `DataFrame.duplicated(subset=columns, keep=False)` without rows missing any value.
+
+        Args:
+            columns (list): The column names.
+
+        Returns:
+            np.ndarray: One boolean per row.
+        """
+        row_keys = self._row_keys(columns)
+        counts = np.append(row_keys.counts, 0)  # Missing rows use the -1 key, i.e. the trailing 0
+        return counts[row_keys.keys] > 1
+
+    def groups(self, columns):
+        """
+        Groups of rows sharing the same values in the columns.
+
+        Args:
+            columns (list): The column names.
+
+        Returns:
+            pd.DataFrame: One row per duplicate group, largest first, with its
+            `size` and the row `positions` of its members in data order.
+        """
+        positions = np.flatnonzero(self.duplicate_mask(columns))
+        if not len(positions):
+            return pd.DataFrame({'size': pd.Series(dtype='int64'), 'positions': pd.Series(dtype=object)})
+        keys = self._row_keys(columns).keys[positions]
+        order = np.argsort(keys, kind='stable')
+        keys, positions = keys[order], positions[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        members = np.split(positions, starts[1:])
+        groups = pd.DataFrame({
+            'size': [len(group) for group in members],
+            'positions': members
+        })
+        first = np.array([group[0] for group in members], dtype='int64')
+        return groups.iloc[np.lexsort((first, -groups['size'].to_numpy()))].reset_index(drop=True)
@@ -0,0 +1,300 @@
+import numpy as np
+import pandas as pd
+
+import ingest
+from profiling import same_value
+
+# Columns of the change log, one row per edited cell.
+LOG_COLUMNS = ['row_id', 'column', 'old', 'new', 'timestamp']
+
+# Columns of a delta passed to `apply_edits`.
+DELTA_COLUMNS = ['row_id', 'position', 'column', 'new']
+
+# Rows shown per page of the edit history.
+DEFAULT_PAGE_SIZE = 50
+
+
+def editor_delta(edited_rows, view, index):
+    """
+    Flatten a `st.data_editor` delta into one row per edited cell.
+
+    Args:
+        edited_rows (dict): The editor's `edited_rows`, mapping row positions
+            in the editor to `{column: new value}`.
+        view (views.RowView): The rows that were shown in the editor.
+        index (pd.Index): The row labels of the data the view was built on.
+
+    Returns:
+        pd.DataFrame: Columns `row_id` (the row label), `position` (the row
+            position in the data), `column` and `new`.
+    """
+    cells = [
+        (int(editor_position), column, value)
+        for editor_position, row_edits in edited_rows.items()
+        if int(editor_position) < len(view)
+        for column, value in row_edits.items()
+    ]
+    delta = pd.DataFrame(cells, columns=['editor_position', 'column', 'new'])
+    positions = view.data_positions(delta.pop('editor_position'))
+    delta.insert(0, 'position', positions)
+    delta.insert(0, 'row_id', index[positions])
+    return delta
+
+
+def apply_edits(df, delta, profile=None):
+    """
+    Write a batch of cell edits into a DataFrame.
+
+    Cells whose value does not change are dropped. The remaining cells are
+    written with one assignment per column, and the profile, if given, is
+    updated with one batch per column.
+
+    Args:
+        df (pd.DataFrame): The data to update in place.
+        delta (pd.DataFrame): Edits from `editor_delta`.
+        profile (profiling.DataProfile): A profile of `df` to keep up to date.
+
+    Returns:
+        pd.DataFrame: The applied edits with columns `row_id`, `position`, `column`, `old` and `new`.
+    """
+    applied = []
+    for column, edits in delta.groupby('column', sort=False):
+        if column not in df.columns:
+            continue
+        positions = edits['position'].to_numpy()
+        row_ids = edits['row_id'].to_numpy()
+        new = edits['new'].to_numpy()
+        old = df[column].iloc[positions].to_numpy(dtype=object)
+
+        changed = np.fromiter(
+            (not same_value(a, b) for a, b in zip(old, new)), dtype=bool, count=len(old)
+        )
+        if not changed.any():
+            continue
+        ingest.assign_cells(df, positions[changed], column, list(new[changed]))
+        applied.append(pd.DataFrame({
+            'row_id': row_ids[changed],
+            'position': positions[changed],
+            'column': column,
+            'old': old[changed],
+            'new': new[changed]
+        }))
+
+    if not applied:
+        return pd.DataFrame(columns=['row_id', 'position', 'column', 'old', 'new'])
+    applied = pd.concat(applied, ignore_index=True)
+    if profile is not None:
+        for column, changes in applied.groupby('column', sort=False):
+            profile.update_cells(column, changes['old'].tolist(), changes['new'].tolist())
+    return applied
+
+
+class ChangeLog:
+    """
+    Append-only history of cell edits, stored column by column.
+
+    Each edited cell is one entry with the row id, column, old value, new
+    value and time of the edit. Appending extends five lists, so the cost of
+    recording a batch does not depend on the size of the history.
+    """
+
+    def __init__(self):
+        self._data = {name: [] for name in LOG_COLUMNS}
+
+    def __len__(self):
+        return len(self._data['row_id'])
+
+    def append(self, changes, timestamp=None):
+        """
+        Record a batch of applied edits.
+
+        Args:
+            changes (pd.DataFrame): Edits from `apply_edits`.
+            timestamp (pd.Timestamp): Time of the edits (default is now).
+        """
+        if changes.empty:
+            return
+        timestamp = timestamp or pd.Timestamp.now().floor('s')
+        for name in LOG_COLUMNS[:-1]:
+            self._data[name].extend(changes[name].tolist())
+        self._data['timestamp'].extend([timestamp] * len(changes))
+
+    def to_frame(self, columns=None, search=None):
+        """
+        The history as a DataFrame, newest edit first.
+
+        Args:
+            columns (list): Only keep edits to these columns.
+            search (str): Only keep edits whose row id, old or new value contains this text.
+
+        Returns:
+            pd.DataFrame: One row per edited cell with the columns in LOG_COLUMNS.
+        """
+        frame = pd.DataFrame({
+            name: pd.array(values, dtype=object) if name in ('row_id', 'old', 'new') else values
+            for name, values in self._data.items()
+        }, columns=LOG_COLUMNS).iloc[::-1].reset_index(drop=True)
+        if columns:
+            frame = frame[frame['column'].isin(columns)]
+        if search:
+            mask = pd.Series(False, index=frame.index)
+            for name in ('row_id', 'old', 'new'):
+                mask |= frame[name].astype(str).str.contains(search, case=False, regex=False)
+            frame = frame[mask]
+        return frame
+
+
+class VersionHistory:
+    """
+    Undo, redo and jumps between the versions of a session's data.
+
+    Version 0 is the uploaded data and version n is the data after the first
+    n edit batches. Each batch is stored only as its cell deltas (row
+    position, column, old and new value), and a version is reached by
+    replaying the batches between it and the current version. No copy of
+    the data is kept, so memory grows with the number of edited cells.
+    Recording a batch after an undo drops the versions that were undone.
+    """
+
+    def __init__(self):
+        self._batches = []
+        self.current = 0
+
+    def __len__(self):
+        return len(self._batches)
+
+    @property
+    def can_undo(self):
+        return self.current > 0
+
+    @property
+    def can_redo(self):
+        return self.current < len(self._batches)
+
+    def record(self, applied, label, timestamp=None):
+        """
+        Add a batch of applied edits as the version after the current one.
+
+        Args:
+            applied (pd.DataFrame): Edits from `apply_edits`.
+            label (str): What made the edits, shown in the version list.
+            timestamp (pd.Timestamp): Time of the edits (default is now).
+        """
+        if applied.empty:
+            return
+        del self._batches[self.current:]
+        self._batches.append({
+            'label': label,
+            'timestamp': timestamp or pd.Timestamp.now().floor('s'),
+            'row_id': applied['row_id'].to_numpy(dtype=object),
+            'position': applied['position'].to_numpy(dtype='int64'),
+            'column': applied['column'].to_numpy(dtype=object),
+            'old': applied['old'].to_numpy(dtype=object),
+            'new': applied['new'].to_numpy(dtype=object)
+        })
+        self.current = len(self._batches)
+
+    def delta_to(self, version):
+        """
+        The cell edits that turn the current version into another one.
+
+        Going back replays the batches in between newest first with their
+        old values; going forward replays them oldest first with their new
+        values. A cell edited by several of them keeps the last value replayed.
+
+        Args:
+            version (int): The target version, clamped to the recorded ones.
+
+        Returns:
+            pd.DataFrame: Edits with the columns in DELTA_COLUMNS, for `apply_edits`.
+        """
+        version = min(max(version, 0), len(self._batches))
+        if version < self.current:
+            batches, values = self._batches[version:self.current][::-1], 'old'
+        else:
+            batches, values = self._batches[self.current:version], 'new'
+        if not batches:
+            return pd.DataFrame(columns=DELTA_COLUMNS)
+        delta = pd.DataFrame({
+            'row_id': np.concatenate([batch['row_id'] for batch in batches]),
+            'position': np.concatenate([batch['position'] for batch in batches]),
+            'column': np.concatenate([batch['column'] for batch in batches]),
+            'new': np.concatenate([batch[values] for batch in batches])
+        })
+        return delta.drop_duplicates(['position', 'column'], keep='last').reset_index(drop=True)
+
+    def jump(self, version):
+        """
+        Make another version current.
+
+        Args:
+            version (int): The target version, clamped to the recorded ones.
+
+        Returns:
+            pd.DataFrame: The edits to apply to the data, from `delta_to`.
+        """
+        delta = self.delta_to(version)
+        self.current = min(max(version, 0), len(self._batches))
+        return delta
+
+    def undo(self):
+        """Step back one version and return the edits that do it."""
+        return self.jump(self.current - 1)
+
+    def redo(self):
+        """Step forward one version and return the edits that do it."""
+        return self.jump(self.current + 1)
+
+    def positions(self):
+        """
+        Row positions edited in the current version.
+
+        Returns:
+            np.ndarray: Sorted positions of the rows changed by the batches up to the current version.
+        """
+        batches = self._batches[:self.current]
+        if not batches:
+            return np.array([], dtype='int64')
+        return np.unique(np.concatenate([batch['position'] for batch in batches]))
+
+    def to_frame(self):
+        """
+        The versions, oldest first.
+
+        Returns:
+            pd.DataFrame: Columns `version`, `label`, `cells`, `rows`, `timestamp`
+                and `current` (True for the current version).
+        """
+        frame = pd.DataFrame(
+            [{'version': 0, 'label': "Uploaded data", 'cells': 0, 'rows': 0, 'timestamp': pd.NaT}] + [
+                {
+                    'version': version,
+                    'label': batch['label'],
+                    'cells': len(batch['position']),
+                    'rows': len(np.unique(batch['position'])),
+                    'timestamp': batch['timestamp']
+                }
+                for version, batch in enumerate(self._batches, start=1)
+            ]
+        )
+        frame['current'] = frame['version'] == self.current
+        return frame
+
+
+def paginate(frame, page, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Slice one page out of a DataFrame.
+
+    Args:
+        frame (pd.DataFrame): The rows to page through.
+        page (int): The 1-based page number; out of range pages are clamped.
+        page_size (int): Rows per page (default is DEFAULT_PAGE_SIZE).
+
+    Returns:
+        tuple: A tuple containing:
+            - page_df (pd.DataFrame): The rows on the page.
+            - page_count (int): The number of pages, at least 1.
+    """
+    page_count = max(1, -(-len(frame) // page_size))
+    page = min(max(page, 1), page_count)
+    return frame.iloc[(page - 1) * page_size:page * page_size], page_count
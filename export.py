@@ -0,0 +1,181 @@
+import importlib.util
+import io
+
+import numpy as np
+
+from helpers import adjust_column_names_for_download
+from profiling import is_missing
+
+# Download formats: label, file extension and MIME type.
+EXPORT_FORMATS = {
+    'csv': ("CSV", 'csv', 'text/csv'),
+    'parquet': ("Parquet", 'parquet', 'application/vnd.apache.parquet'),
+    'xlsx': ("Excel", 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+}
+
+# Which rows are exported: every row, the current filter result, or rows with logged edits.
+EXPORT_SCOPES = ['all', 'view', 'changed']
+
+# Rows formatted per CSV chunk. Downloads still hold the whole file as bytes,
+# but pandas never formats the whole file as one string first.
+CSV_CHUNK_ROWS = 10000
+
+
+def available_formats():
+    """
+    The export formats that can be written here.
+
+    XLSX needs openpyxl, which is optional; the other formats only need pandas and pyarrow.
+
+    Returns:
+        list: Keys of EXPORT_FORMATS.
+    """
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'xlsx' or importlib.util.find_spec('openpyxl')]
+
+
+def export_frame(df, positions=None):
+    """
+    The rows to export, with download column names.
+
+    Only the selected rows are gathered, and the columns are renamed on a
+    shallow copy, so `df` itself is left untouched.
+
+    Parameters:
+        df (pd.DataFrame): The data.
+        positions (array-like): Row positions to export, in order (default is every row).
+
+    Returns:
+        pd.DataFrame: The rows with their original index and adjusted column names.
+    """
+    rows = df if positions is None else df.take(np.asarray(positions, dtype='int64'))
+    return adjust_column_names_for_download(rows)
+
+
+def arrow_compatible(df):
+    """
+    Make every column writable as a single Arrow type.
+
+    Edits can leave values of several types in one object column; those
+    columns are written as text, keeping missing values missing.
+
+    Parameters:
+        df (pd.DataFrame): The data to write.
+
+    Returns:
+        pd.DataFrame: `df` itself if nothing needed converting, otherwise a converted copy.
+    """
+    converted = {
+        col: df[col].map(lambda value: None if is_missing(value) else str(value))
+        for col in df.columns
+        if df[col].dtype == object
+    }
+    return df.assign(**converted) if converted else df
+
+
+def iter_csv(df, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Encode a DataFrame as CSV, a chunk of rows at a time.
+
+    Only one chunk is formatted at a time; `export_bytes` still joins the
+    chunks into one file, since downloads need the whole file.
+
+    Parameters:
+        df (pd.DataFrame): The data, written without its index.
+        chunk_rows (int): Rows per chunk (default is CSV_CHUNK_ROWS).
+
+    Yields:
+        bytes: UTF-8 CSV text, starting with the header.
+    """
+    yield df.iloc[:0].to_csv(index=False).encode('utf-8')
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False).encode('utf-8')
+
+
+def export_bytes(df, fmt):
+    """
+    Write a DataFrame as a file in memory.
+
+    Parameters:
+        df (pd.DataFrame): The data, written without its index.
+        fmt (str): A key of EXPORT_FORMATS.
+
+    Returns:
+        bytes: The file contents.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'csv':
+        return b''.join(iter_csv(df))
+    buffer = io.BytesIO()
+    if fmt == 'parquet':
+        arrow_compatible(df).to_parquet(buffer, index=False)
+    else:
+        df.to_excel(buffer, index=False, engine='openpyxl')
+    return buffer.getvalue()
+
+
+def file_name(base, fmt):
+    """The download file name for a format, e.g. `members_data.csv`."""
+    return f"{base}.{EXPORT_FORMATS[fmt][1]}"
+
+
+class ExportCache:
+    """
+    Files built for download, kept until the data changes.
+
+    Files are only built when requested. Each is stored under its format
+    and selected rows for the data version it was built from; the first
+    request for a newer version drops every older file.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._files = {}
+
+    @staticmethod
+    def _key(fmt, positions):
+        if positions is None:
+            return fmt, None
+        positions = np.asarray(positions, dtype='int64')
+        return fmt, len(positions), hash(positions.tobytes())
+
+    def _sync(self, version):
+        if version != self.version:
+            self.version = version
+            self._files = {}
+
+    def get(self, version, fmt, positions=None):
+        """
+        A file built earlier for the same data version, format and rows.
+
+        Parameters:
+            version: The data version, e.g. `(dataset key, edit version)`.
+            fmt (str): A key of EXPORT_FORMATS.
+            positions (array-like): The exported row positions (default is every row).
+
+        Returns:
+            bytes: The file, or None if it has not been built.
+        """
+        self._sync(version)
+        return self._files.get(self._key(fmt, positions))
+
+    def build(self, df, version, fmt, positions=None):
+        """
+        Build a file, or return the one built earlier for the same request.
+
+        Parameters:
+            df (pd.DataFrame): The data.
+            version: The data version of `df`.
+            fmt (str): A key of EXPORT_FORMATS.
+            positions (array-like): Row positions to export (default is every row).
+
+        Returns:
+            bytes: The file contents.
+        """
+        data = self.get(version, fmt, positions)
+        if data is None:
+            data = self._files[self._key(fmt, positions)] = export_bytes(export_frame(df, positions), fmt)
+        return data
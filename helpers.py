@@ -1,9 +1,9 @@
 import pandas as pd
-import re
-from difflib import SequenceMatcher
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from instrumentation import instrumented
+from profiling import TEXT_LABELS, is_text_column, profile_dataframe, text_counts
+from similarity import find_similar_pairs
 
+@instrumented
 def clean_column_names(df):
     """
     Standardize column names in a DataFrame.
@@ -25,73 +25,73 @@ def clean_column_names(df):
     return df
 
 
+@instrumented
 def adjust_column_names_for_download(df):
     """
     Adjusts the column names of a DataFrame for download.
 
-    This function modifies the column names of the given DataFrame by:
-    1. Stripping any leading or trailing whitespace.
-    2. Replacing underscores with spaces.
-    3. Converting the column names to title case.
+    This function returns a shallow copy of the given DataFrame whose column names are:
+    1. Stripped of any leading or trailing whitespace.
+    2. Spaced, replacing underscores with spaces.
+    3. Converted to title case.
+
+    The data is not copied, and `df` keeps its own column names.
 
     Parameters:
         df (pandas.DataFrame): The DataFrame whose column names need to be adjusted.
 
     Returns:
-        pandas.DataFrame: The DataFrame with adjusted column names.
+        pandas.DataFrame: A view of the data with adjusted column names.
     """
-    df.columns = df.columns.str.strip().str.replace('_', ' ').str.title()
-    return df
+    renamed = df.copy(deep=False)
+    renamed.columns = df.columns.str.strip().str.replace('_', ' ').str.title()
+    return renamed
 
-def calculate_data_metrics(df):
+@instrumented
+def calculate_data_metrics(df, profile=None):
     """
     Calculate key metrics for data quality checks.
     
     Args:
         df (pd.DataFrame): The dataframe to analyze.
+        profile (profiling.DataProfile): A precomputed profile of `df`. If omitted,
+            only the webmail column is profiled.
     
     Returns:
         dict: Metrics including total rows, unique webmails, duplicate webmails,
               and members not using webmail.
     """
-    metrics = {
-        'total_rows': len(df),
-        'unique_webmails': df['pup_webmail'].nunique() if 'pup_webmail' in df.columns else 0,
-        'duplicate_webmails': df.duplicated(subset=['pup_webmail']).sum() if 'pup_webmail' in df.columns else 0,
-        'non_webmail_members': df['pup_webmail'].isna().sum() if 'pup_webmail' in df.columns else 0
-    }
-    return metrics
-
-def analyze_text_case(df, columns):
+    if profile is None:
+        profile = profile_dataframe(df[[col for col in ['pup_webmail'] if col in df.columns]])
+    return profile.metrics('pup_webmail')
+
+@instrumented
+def analyze_text_case(df, columns=None, profile=None):
     """
-    Analyze text case (uppercase, lowercase, title case) for specified columns.
+    Analyze text case and string health for text columns.
+
+    Counts uppercase, lowercase, title case and mixed case values, values with
+    leading or trailing whitespace, double spaces and non-ASCII characters.
+    The strings are classified with vectorized Arrow kernels in one pass per column.
     
     Args:
         df (pd.DataFrame): The dataframe to analyze.
-        columns (list): List of column names to analyze.
+        columns (list): List of column names to analyze (default is every text column).
+        profile (profiling.DataProfile): A precomputed profile of `df`. If omitted,
+            the columns are classified directly.
     
     Returns:
-        pd.DataFrame: Dataframe with counts of uppercase, lowercase, and title case for each column.
+        pd.DataFrame: Dataframe with one row per check in `profiling.TEXT_LABELS` and one column per text column.
     """
-    case_analysis = {}
-    for col in columns:
-        if col in df.columns:
-            # Handle NaN values by replacing with empty strings
-            col_values = df[col].fillna('')
-            
-            # Count uppercase, lowercase, and title case
-            uppercase = col_values.str.isupper().sum()
-            lowercase = col_values.str.islower().sum()
-            titlecase = col_values.str.istitle().sum()
-            
-            case_analysis[col] = {
-                'Uppercase': uppercase,
-                'Lowercase': lowercase,
-                'Title Case': titlecase
-            }
-    return pd.DataFrame(case_analysis)
-
-def find_similar_strings_with_rows(df, column, threshold=0.8):
+    if profile is not None:
+        return profile.case_analysis(columns)
+
+    selected = df.columns if columns is None else [col for col in columns if col in df.columns]
+    case_analysis = {col: text_counts(df[col]) for col in selected if is_text_column(df[col])}
+    return pd.DataFrame(case_analysis, index=TEXT_LABELS if case_analysis else None)
+
+@instrumented
+def find_similar_strings_with_rows(df, column, threshold=0.8, workers=1):
     """
     Find similar strings within a specified column of a DataFrame and return the pairs of similar strings along with the rows containing them.
     
@@ -99,6 +99,10 @@ def find_similar_strings_with_rows(df, column, threshold=0.8):
         df (pd.DataFrame): The DataFrame to search for similar strings.
         column (str): The column name in the DataFrame to search for similar strings.
         threshold (float): The similarity threshold (default is 0.8). Strings with a similarity ratio above this threshold are considered similar.
+        workers (int): Number of worker processes used to score candidate pairs (default is 1, serial). Small columns are always scored serially.
+
+    Candidate pairs come from the n-gram index in `similarity`, so only pairs
+    that can reach the threshold are scored with SequenceMatcher.
     
     Returns:
         tuple: A tuple containing two DataFrames:
@@ -106,36 +110,11 @@ def find_similar_strings_with_rows(df, column, threshold=0.8):
             - matching_rows (pd.DataFrame): A DataFrame containing the rows from the original DataFrame that match either value1 or value2 from pairs_df.
     """
 
-    if column not in df.columns or df[column].dtype not in ['object', 'category']:
+    if column not in df.columns or not is_text_column(df[column]):
         return pd.DataFrame(), pd.DataFrame()
 
     unique_values = df[column].dropna().unique()
-    similar_pairs = []
-
-    def normalize_string(s):
-        if not isinstance(s, str):
-            return ""
-        s = s.lower()
-        s = " ".join(s.split())
-        s = re.sub(r'[^\w\s]', '', s)
-        return s
-
-    def string_similarity(s1, s2):
-        s1_norm = normalize_string(s1)
-        s2_norm = normalize_string(s2)
-        if not s1_norm or not s2_norm:
-            return 0.0
-        return SequenceMatcher(None, s1_norm, s2_norm).ratio()
-
-    for i, val1 in enumerate(unique_values):
-        for val2 in unique_values[i + 1:]:
-            similarity = string_similarity(val1, val2)
-            if similarity >= threshold:
-                similar_pairs.append({
-                    'value1': val1,
-                    'value2': val2,
-                    'similarity': round(similarity, 3)
-                })
+    similar_pairs = find_similar_pairs(unique_values, threshold, workers)
 
     pairs_df = pd.DataFrame(similar_pairs)
 
@@ -147,3 +126,22 @@ def find_similar_strings_with_rows(df, column, threshold=0.8):
 
     return pairs_df, matching_rows
 
+@instrumented
+def duplicate_groups_table(df, columns, groups):
+    """
+    Summarize duplicate groups: the shared values, group size and member row ids.
+
+    Parameters:
+        df (pd.DataFrame): The data the groups were found in.
+        columns (list): The columns the rows were compared on.
+        groups (pd.DataFrame): Groups from `duplicates.DuplicateIndex.groups`.
+
+    Returns:
+        pd.DataFrame: One row per group with its `size`, the values of `columns` and
+            the comma-separated `rows` ids.
+    """
+    first_rows = [positions[0] for positions in groups['positions']]
+    table = df[columns].iloc[first_rows].reset_index(drop=True)
+    table.insert(0, 'size', groups['size'].to_numpy())
+    table['rows'] = [', '.join(map(str, df.index[positions])) for positions in groups['positions']]
+    return table
@@ -0,0 +1,248 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+# Bytes parsed per block by the pyarrow CSV reader.
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# String columns become categoricals when they have at most this many
+# distinct values, and the distinct values are at most this share of the
+# non-null values (course, year level, section, ...).
+CATEGORY_MAX_UNIQUE = 50
+CATEGORY_MAX_UNIQUE_RATIO = 0.1
+
+# Approximate size of a Python str object without its characters, and of the
+# float NaN that pandas stores for missing values in object columns.
+_PY_STR_OVERHEAD = 49
+_PY_NAN_SIZE = 24
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    if hasattr(source, 'read'):
+        return source.read()
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def open_csv_reader(source, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Open a pyarrow CSV reader that parses the data block by block, with every column read as text.
+
+    The header is taken from the first block; all columns are read as strings
+    so later blocks can never disagree with types inferred from the first one.
+    The whole source is read into memory first.
+
+    Parameters:
+        source: A path, bytes, or a file-like object (e.g. a Streamlit upload).
+        block_size (int): Bytes parsed per block (default is DEFAULT_BLOCK_SIZE).
+
+    Returns:
+        pyarrow.csv.CSVStreamingReader: A reader yielding one record batch per block.
+    """
+    data = pa.py_buffer(_read_bytes(source))
+    read_options = pv.ReadOptions(block_size=block_size)
+
+    header = pv.open_csv(pa.BufferReader(data), read_options=read_options).schema.names
+    convert_options = pv.ConvertOptions(
+        column_types={name: pa.string() for name in header},
+        strings_can_be_null=True
+    )
+    return pv.open_csv(pa.BufferReader(data), read_options=read_options, convert_options=convert_options)
+
+
+def _to_numeric(column, downcast=True):
+    """Return the column as a pandas numeric array if every value parses, else None."""
+    for target in (pa.int64(), pa.float64()):
+        try:
+            values = pc.cast(column, target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+        series = values.to_pandas()
+        if downcast and target == pa.int64() and values.null_count == 0:
+            series = pd.to_numeric(series, downcast='integer')
+        return series.array
+    return None
+
+
+def _is_low_cardinality(column):
+    non_null = len(column) - column.null_count
+    if not non_null:
+        return False
+    unique = pc.count_distinct(column).as_py()
+    return unique <= CATEGORY_MAX_UNIQUE and unique <= non_null * CATEGORY_MAX_UNIQUE_RATIO
+
+
+def _object_memory_estimate(column):
+    """Estimate the bytes a text column would use as object dtype."""
+    nulls = column.null_count
+    text_bytes = pc.sum(pc.binary_length(column)).as_py() or 0
+    return 8 * len(column) + (len(column) - nulls) * _PY_STR_OVERHEAD + text_bytes + nulls * _PY_NAN_SIZE
+
+
+def _compact_column(column, categorical):
+    """Convert an Arrow string column to its most compact pandas array."""
+    numeric = _to_numeric(column)
+    if numeric is not None:
+        return numeric, 'numeric'
+    if categorical or _is_low_cardinality(column):
+        return column.dictionary_encode().to_pandas().array, 'categorical'
+    return pd.arrays.ArrowStringArray(column), 'string'
+
+
+def _mangle_duplicate_names(names):
+    """
+    Rename repeated column names the way `pd.read_csv` does: a, a.1, a.2.
+
+    Suffixes already used by another header are skipped, so `a, a, a.1`
+    becomes `a, a.2, a.1`.
+    """
+    header = set(names)
+    counts = {}
+    mangled = []
+    for name in names:
+        original = name
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in header else counts.get(name, 0)
+        mangled.append(name)
+        counts[name] = count + 1
+    return mangled
+
+
+def read_members_csv(source, block_size=DEFAULT_BLOCK_SIZE, categorical_columns=None):
+    """
+    Read a members CSV into a compact DataFrame.
+
+    The file is parsed block by block by the pyarrow CSV reader and the
+    blocks are joined into one table before any column is converted, so the
+    whole file and its parsed table are in memory at once. The first column
+    becomes the index (like `pd.read_csv(..., index_col=0)`), numeric columns
+    get numeric dtypes with integers downcast, low-cardinality text columns
+    become categoricals and all other text columns use Arrow-backed strings.
+    Repeated column names are renamed like pandas does (a, a.1, a.2).
+
+    Parameters:
+        source: A path, bytes, or a file-like object (e.g. a Streamlit upload).
+        block_size (int): Bytes parsed per block (default is DEFAULT_BLOCK_SIZE).
+        categorical_columns (list): Columns to always store as categoricals.
+
+    Returns:
+        tuple: A tuple containing:
+            - df (pd.DataFrame): The loaded data.
+            - report (dict): Rows, columns, blocks parsed (`chunks`), the dtype chosen for each column,
+              memory used, estimated memory as object dtype, and bytes saved.
+    """
+    categorical_columns = set(categorical_columns or [])
+    reader = open_csv_reader(source, block_size)
+    batches = list(reader)
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+
+    index_name = table.column_names[0]
+    index = _to_numeric(table.column(0), downcast=False)
+    if index is None:
+        index = pd.arrays.ArrowStringArray(table.column(0))
+
+    # Repeated headers (e.g. form questions with the same title) are kept as separate columns
+    names = _mangle_duplicate_names(table.column_names[1:])
+    columns = {}
+    dtypes = {}
+    object_memory = 0
+    for name, column in zip(names, table.columns[1:]):
+        columns[name], dtypes[name] = _compact_column(column, name in categorical_columns)
+        if dtypes[name] == 'numeric':
+            object_memory += columns[name].nbytes
+        else:
+            object_memory += _object_memory_estimate(column)
+
+    # Column labels stay strings even when the file has no column besides the index
+    df = pd.DataFrame(columns, index=pd.Index(index, name=index_name or None), columns=pd.Index(names, dtype=object))
+
+    memory = int(df.memory_usage(deep=True, index=False).sum())
+    report = {
+        'rows': len(df),
+        'columns': len(df.columns),
+        'chunks': len(batches),
+        'dtypes': dtypes,
+        'memory_bytes': memory,
+        'object_memory_bytes': int(object_memory),
+        'saved_bytes': max(int(object_memory) - memory, 0),
+    }
+    return df, report
+
+
+def _is_missing(value):
+    return value is None or (np.ndim(value) == 0 and pd.isna(value))
+
+
+def assign_cells(df, positions, column, values):
+    """
+    Set several cells of one column at once, widening compact dtypes when the values do not fit.
+
+    Categoricals gain the new values as categories, and downcast integer
+    columns are widened when a value is out of range, missing or not an
+    integer. The column is widened at most once for the whole batch.
+
+    Parameters:
+        df (pd.DataFrame): The DataFrame to update in place.
+        positions (array-like): Row positions of the cells.
+        column (str): The column name.
+        values (list): The new values, one per position.
+    """
+    dtype = df[column].dtype
+    values = list(values)
+    present = [value for value in values if not _is_missing(value)]
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        new_categories = pd.unique(pd.Series([value for value in present if value not in dtype.categories], dtype=object))
+        if len(new_categories):
+            df[column] = df[column].cat.add_categories(new_categories)
+    elif isinstance(dtype, np.dtype) and dtype.kind in 'iuf':
+        if not all(isinstance(value, (int, np.integer, float, np.floating)) for value in present):
+            df[column] = df[column].astype(object)
+        elif dtype.kind == 'f':
+            pass
+        elif len(present) < len(values) or any(not float(value).is_integer() for value in present):
+            df[column] = df[column].astype('float64')
+        else:
+            info = np.iinfo(dtype)
+            if any(not info.min <= int(value) <= info.max for value in values):
+                df[column] = df[column].astype('int64')
+
+    dtype = df[column].dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iuf':
+        values = np.array([np.nan if _is_missing(value) else value for value in values], dtype=dtype)
+    elif isinstance(dtype, np.dtype):
+        values = np.array(values + [None], dtype=object)[:-1]  # Keeps sequences as single cells
+    else:
+        values = pd.array(values, dtype=dtype)
+    df.iloc[np.asarray(positions, dtype='int64'), df.columns.get_loc(column)] = values
+
+
+def assign_cell(df, index, column, value):
+    """
+    Set a single cell, widening compact dtypes when the value does not fit.
+
+    Parameters:
+        df (pd.DataFrame): The DataFrame to update in place.
+        index: The row label.
+        column (str): The column name.
+        value: The new value.
+    """
+    assign_cells(df, [df.index.get_loc(index)], column, [value])
+
+
+def format_bytes(n):
+    """Format a byte count for display, e.g. 1536 -> '1.5 KB'."""
+    size = float(n)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,212 @@
+import contextlib
+import functools
+import json
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+
+import pandas as pd
+
+# Script runs kept in a session's diagnostics history.
+MAX_RUNS = 20
+
+# Columns of a stage record.
+STAGE_COLUMNS = ['stage', 'depth', 'start', 'seconds', 'rows', 'memory_delta']
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# The recorder of the script run executing in this thread, if diagnostics are on
+_active = ContextVar('instrumentation_recorder', default=None)
+
+
+def _rss_bytes():
+    """Resident memory of the process, or None where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _row_count(args):
+    """Rows of the first DataFrame or Series argument."""
+    for arg in args:
+        if isinstance(arg, (pd.DataFrame, pd.Series)):
+            return len(arg)
+    return None
+
+
+class Recorder:
+    """
+    Stage timings of one script run.
+
+    Each stage records its wall time, the rows it processed and the change
+    in resident memory of the process (None where it cannot be read). The
+    memory delta is process-wide, so other sessions running at the same
+    time show up in it too.
+    """
+
+    def __init__(self, kind='app'):
+        self.kind = kind
+        self.started = pd.Timestamp.now()
+        self._origin = time.perf_counter()
+        self._depth = 0
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        """
+        Time a block of code as one stage.
+
+        Args:
+            name (str): The stage name.
+            rows (int): Rows processed by the stage, if known.
+
+        Yields:
+            dict: The stage record; set its `rows` once the count is known.
+        """
+        record = {'stage': name, 'depth': self._depth, 'rows': rows}
+        memory = _rss_bytes()
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            after = _rss_bytes()
+            record['start'] = start - self._origin
+            record['seconds'] = time.perf_counter() - start
+            record['memory_delta'] = None if memory is None or after is None else after - memory
+            self.stages.append(record)
+
+    @property
+    def seconds(self):
+        """Wall time of the run so far."""
+        return time.perf_counter() - self._origin
+
+    def to_dict(self):
+        """The run as a JSON-ready dict, stages in start order."""
+        return {
+            'kind': self.kind,
+            'started': self.started.isoformat(timespec='milliseconds'),
+            'seconds': self.seconds,
+            'stages': [
+                {name: record[name] for name in STAGE_COLUMNS}
+                for record in sorted(self.stages, key=lambda record: record['start'])
+            ]
+        }
+
+
+def stage(name, rows=None):
+    """
+    Time a block as a stage of the active run.
+
+    Without an active recorder this is an empty context manager, so
+    instrumented code costs one context variable lookup when diagnostics
+    are off.
+
+    Args:
+        name (str): The stage name.
+        rows (int): Rows processed by the stage, if known.
+
+    Returns:
+        A context manager yielding the stage record (a throwaway dict when
+        nothing is recorded), whose `rows` can be set inside the block.
+    """
+    recorder = _active.get()
+    if recorder is None:
+        return contextlib.nullcontext({})
+    return recorder.stage(name, rows)
+
+
+def instrumented(func):
+    """
+    Record every call of a function as a stage of the active run.
+
+    The stage is named `module.function`, and its rows are those of the
+    first DataFrame or Series argument.
+    """
+    name = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _active.get()
+        if recorder is None:
+            return func(*args, **kwargs)
+        with recorder.stage(name, _row_count(args)):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextlib.contextmanager
+def recording(history, kind='app'):
+    """
+    Record a script run into a history, unless a run is already being recorded.
+
+    Args:
+        history (RunHistory): Where the finished run is kept.
+        kind (str): 'app' for a full run, 'fragment' for a fragment rerun.
+    """
+    if _active.get() is not None:
+        yield
+        return
+    recorder = Recorder(kind)
+    token = _active.set(recorder)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+        history.add(recorder)
+
+
+class RunHistory:
+    """The most recent recorded runs of a session, newest last."""
+
+    def __init__(self, max_runs=MAX_RUNS):
+        self.runs = deque(maxlen=max_runs)
+        self.count = 0
+
+    def __len__(self):
+        return len(self.runs)
+
+    def add(self, recorder):
+        self.count += 1
+        self.runs.append({'run': self.count, **recorder.to_dict()})
+
+    def stages(self, run=None):
+        """
+        Stage records as a DataFrame.
+
+        Args:
+            run (int): Only this run number (default is every kept run).
+
+        Returns:
+            pd.DataFrame: One row per stage with the run number and STAGE_COLUMNS.
+        """
+        rows = [
+            {'run': record['run'], **stage}
+            for record in self.runs
+            if run is None or record['run'] == run
+            for stage in record['stages']
+        ]
+        return pd.DataFrame(rows, columns=['run'] + STAGE_COLUMNS)
+
+    def summary(self):
+        """
+        Wall time per stage across the kept runs.
+
+        Returns:
+            pd.DataFrame: Calls, mean, max and total seconds per stage, slowest total first.
+        """
+        stages = self.stages()
+        if stages.empty:
+            return pd.DataFrame(columns=['stage', 'calls', 'mean_seconds', 'max_seconds', 'total_seconds'])
+        summary = stages.groupby('stage')['seconds'].agg(
+            calls='size', mean_seconds='mean', max_seconds='max', total_seconds='sum'
+        )
+        return summary.sort_values('total_seconds', ascending=False).reset_index()
+
+    def to_json(self):
+        """The kept runs as a JSON document."""
+        return json.dumps({'runs': list(self.runs)}, indent=2)
@@ -0,0 +1,272 @@
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from profiling import is_missing
+from similarity import normalize_string
+
+# Fields compared by default and their weights.
+DEFAULT_FIELDS = {'full_name': 0.5, 'pup_webmail': 0.3, 'student_number': 0.2}
+
+# Identifier fields, which only count as matching when equal.
+EXACT_FIELDS = ['student_number']
+
+# Weighted similarity at which two rows are linked.
+DEFAULT_THRESHOLD = 0.8
+
+# Rows compared with each neighbour within this distance after sorting
+# by a field (sorted-neighbourhood blocking).
+SORTED_WINDOW = 5
+
+# Rows sharing an identical field value are all compared with each other,
+# unless more rows than this share it; larger blocks only use the window.
+MAX_BLOCK_SIZE = 50
+
+# Slack applied to the pruning bound so float rounding never drops a pair.
+_EPSILON = 1e-9
+
+
+def normalize_field(value):
+    """
+    Normalize a value for record linkage.
+
+    Missing values normalize to an empty string. Email addresses keep only
+    their local part, so the shared domain does not inflate similarity;
+    the rest follows `similarity.normalize_string`.
+
+    Parameters:
+        value: The cell value.
+
+    Returns:
+        str: The normalized string.
+    """
+    if is_missing(value):
+        return ""
+    value = str(value)
+    if '@' in value:
+        value = value.split('@', 1)[0]
+    return normalize_string(value)
+
+
+def _pair_codes(left, right, n):
+    low, high = np.minimum(left, right), np.maximum(left, right)
+    keep = low != high
+    return low[keep] * n + high[keep]
+
+
+def candidate_row_pairs(norms, window=SORTED_WINDOW):
+    """
+    Blocking: row pairs worth scoring.
+
+    For every field, rows are sorted by the normalized value and by the
+    value reversed (so a typo near the start still sorts close), and each
+    row is paired with the next `window - 1` rows in both orders. Rows with
+    an identical value are also paired when their block has at most
+    MAX_BLOCK_SIZE rows. Empty values never form pairs.
+
+    Parameters:
+        norms (dict): Field name to a numpy object array of normalized values, one per row.
+        window (int): The sorted-neighbourhood window (default is SORTED_WINDOW).
+
+    Returns:
+        tuple: Two int64 arrays with the first and second row position of each pair (first < second).
+    """
+    n = len(next(iter(norms.values()))) if norms else 0
+    codes = []
+    for values in norms.values():
+        present = np.flatnonzero(values != "")
+        for keys in (values[present], np.array([value[::-1] for value in values[present]], dtype=object)):
+            order = present[np.argsort(keys, kind='stable')]
+            for offset in range(1, window):
+                codes.append(_pair_codes(order[:-offset], order[offset:], n))
+
+        block_ids = pd.factorize(values[present])[0]
+        block_sizes = np.bincount(block_ids) if len(block_ids) else np.array([], dtype='int64')
+        small = (block_sizes[block_ids] > 1) & (block_sizes[block_ids] <= MAX_BLOCK_SIZE)
+        rows, ids = present[small], block_ids[small]
+        order = np.argsort(ids, kind='stable')
+        rows, ids = rows[order], ids[order]
+        for offset in range(1, MAX_BLOCK_SIZE):
+            same = ids[:-offset] == ids[offset:]
+            if not same.any():
+                break
+            codes.append(_pair_codes(rows[:-offset][same], rows[offset:][same], n))
+
+    if not codes:
+        return np.array([], dtype='int64'), np.array([], dtype='int64')
+    codes = np.unique(np.concatenate(codes))
+    return codes // n, codes % n
+
+
+def score_row_pairs(norms, weights, first, second, threshold=DEFAULT_THRESHOLD, exact_fields=()):
+    """
+    Weighted field similarity of row pairs, keeping the pairs at or above `threshold`.
+
+    Fields in `exact_fields` score 1 when the normalized values are equal and
+    0 otherwise; the other fields are compared with SequenceMatcher. Fields
+    empty in either row are left out of that pair's weighted average.
+
+    Exact fields and a length-based upper bound of the other fields are
+    computed for all pairs at once, which prunes most candidates. The
+    remaining pairs compare their fields from the heaviest down and stop as
+    soon as `threshold` is out of reach.
+
+    Parameters:
+        norms (dict): Field name to normalized values, as for `candidate_row_pairs`.
+        weights (dict): Field name to weight.
+        first (np.ndarray): First row position of each pair.
+        second (np.ndarray): Second row position of each pair.
+        threshold (float): The weighted similarity threshold (default is DEFAULT_THRESHOLD).
+        exact_fields (iterable): Fields compared for equality only.
+
+    Returns:
+        pd.DataFrame: Columns first, second, score and one similarity column per field.
+    """
+    fields = [field for field in norms if weights.get(field, 0) > 0]
+    fuzzy = sorted((field for field in fields if field not in exact_fields), key=lambda field: -weights[field])
+
+    total_weight = np.zeros(len(first))
+    score = np.zeros(len(first))
+    bound = np.zeros(len(first))
+    sims = {}
+    for field in fields:
+        values = norms[field]
+        a, b = values[first], values[second]
+        both = (a != "") & (b != "")
+        total_weight += np.where(both, weights[field], 0.0)
+        if field in fuzzy:
+            # Upper bound of the ratio from the lengths alone
+            len1 = np.fromiter(map(len, a), dtype='int64', count=len(a))
+            len2 = np.fromiter(map(len, b), dtype='int64', count=len(b))
+            bound += np.where(both, weights[field] * 2 * np.minimum(len1, len2) / np.maximum(len1 + len2, 1), 0.0)
+        else:
+            sims[field] = np.where(both, (a == b).astype(float), np.nan)
+            score += np.where(both, weights[field] * sims[field], 0.0)
+
+    keep = np.flatnonzero((total_weight > 0) & (score + bound >= threshold * total_weight - _EPSILON))
+    for field in fuzzy:
+        sims[field] = np.full(len(first), np.nan)
+
+    linked = []
+    ratios = {}
+    for k in keep.tolist():
+        i, j = first[k], second[k]
+        target = threshold * total_weight[k] - _EPSILON
+        current = score[k]
+        # Weight of the fuzzy fields still to compare; the score can gain at most this much
+        remaining = sum(weights[field] for field in fuzzy if norms[field][i] and norms[field][j])
+        for field in fuzzy:
+            a, b = norms[field][i], norms[field][j]
+            if not (a and b):
+                continue
+            remaining -= weights[field]
+            key = (a, b) if a <= b else (b, a)
+            ratio = ratios.get(key)
+            if ratio is None:
+                matcher = SequenceMatcher(None, *key)
+                # quick_ratio() bounds ratio() from above and is much cheaper
+                ratio = matcher.quick_ratio()
+                if current + weights[field] * ratio + remaining < target:
+                    break
+                ratio = ratios[key] = 1.0 if a == b else matcher.ratio()
+            sims[field][k] = ratio
+            current += weights[field] * ratio
+            if current + remaining < target:
+                break
+        else:
+            if current >= target:
+                score[k] = current
+                linked.append(k)
+
+    linked = np.array(linked, dtype='int64')
+    pairs = pd.DataFrame({
+        'first': first[linked],
+        'second': second[linked],
+        'score': score[linked] / total_weight[linked]
+    })
+    for field in fields:
+        pairs[field] = sims[field][linked]
+    return pairs
+
+
+def cluster_rows(n, first, second):
+    """
+    Transitive clusters of linked rows, with union-find.
+
+    Parameters:
+        n (int): Number of rows.
+        first (array-like): First row position of each linked pair.
+        second (array-like): Second row position of each linked pair.
+
+    Returns:
+        np.ndarray: A cluster id per row. Clusters with several rows are numbered
+        first, largest first; every unlinked row gets its own id after them.
+    """
+    parent = np.arange(n)
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in zip(first, second):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    # Point every row straight at its root
+    while True:
+        grandparent = parent[parent]
+        if (grandparent == parent).all():
+            break
+        parent = grandparent
+
+    roots, inverse, sizes = np.unique(parent, return_inverse=True, return_counts=True)
+    # Order clusters by size (largest first), then by their first row
+    order = np.lexsort((roots, -sizes))
+    ranks = np.empty(len(roots), dtype='int64')
+    ranks[order] = np.arange(len(roots))
+    return ranks[inverse]
+
+
+def link_records(df, fields=None, threshold=DEFAULT_THRESHOLD, exact_fields=None, window=SORTED_WINDOW):
+    """
+    Link rows that describe the same member across several fields.
+
+    Candidate pairs come from blocking (`candidate_row_pairs`), are scored
+    with per-field weights (`score_row_pairs`) and grouped into transitive
+    clusters (`cluster_rows`).
+
+    Parameters:
+        df (pd.DataFrame): The data.
+        fields (dict): Column name to weight (default is DEFAULT_FIELDS); columns not in `df` are skipped.
+        threshold (float): The weighted similarity threshold (default is DEFAULT_THRESHOLD).
+        exact_fields (list): Fields that must be equal to match (default is EXACT_FIELDS).
+        window (int): The sorted-neighbourhood window (default is SORTED_WINDOW).
+
+    Returns:
+        tuple: A tuple containing:
+            - clusters (pd.DataFrame): `cluster` and `cluster_size` for every row, indexed like `df`.
+            - pairs_df (pd.DataFrame): The linked pairs with the row ids, the weighted
+              score and the similarity of each field.
+    """
+    weights = {col: weight for col, weight in (fields or DEFAULT_FIELDS).items() if col in df.columns}
+    norms = {
+        col: np.array([normalize_field(value) for value in df[col].tolist()], dtype=object)
+        for col in weights
+    }
+
+    first, second = candidate_row_pairs(norms, window)
+    exact_fields = EXACT_FIELDS if exact_fields is None else exact_fields
+    pairs = score_row_pairs(norms, weights, first, second, threshold, exact_fields)
+
+    cluster = cluster_rows(len(df), pairs['first'].to_numpy(), pairs['second'].to_numpy())
+    clusters = pd.DataFrame({'cluster': cluster}, index=df.index)
+    clusters['cluster_size'] = clusters.groupby('cluster')['cluster'].transform('size')
+
+    pairs_df = pairs.drop(columns=['first', 'second'])
+    pairs_df.insert(0, 'row1', df.index[pairs['first'].to_numpy()])
+    pairs_df.insert(1, 'row2', df.index[pairs['second'].to_numpy()])
+    return clusters, pairs_df.sort_values('score', ascending=False, ignore_index=True)
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+# Patterns listed by default, most common first.
+DEFAULT_TOP = 10
+
+
+def null_bits(df):
+    """
+    Pack the null mask of every row into bits.
+
+    Columns are packed eight to a byte as they are read, so no row-by-column
+    boolean matrix is built.
+
+    Args:
+        df (pd.DataFrame): The data.
+
+    Returns:
+        np.ndarray: A uint8 array with one row per data row and one byte per
+            eight columns. The most significant bit of the first byte is the
+            first column, and a set bit means the value is missing.
+    """
+    bits = np.zeros((len(df), -(-df.shape[1] // 8)), dtype=np.uint8)
+    for j in range(df.shape[1]):
+        missing = df.iloc[:, j].isna().to_numpy(dtype=bool)
+        bits[:, j >> 3] |= missing.view(np.uint8) << np.uint8(7 - (j & 7))
+    return bits
+
+
+def _row_words(bits):
+    """View packed rows as big-endian 64-bit words, so each row of up to 64 columns is one integer."""
+    width = -(-bits.shape[1] // 8) * 8
+    padded = np.zeros((len(bits), width), dtype=np.uint8)
+    padded[:, :bits.shape[1]] = bits
+    return padded.view('>u8')
+
+
+class MissingPatterns:
+    """
+    Rows grouped by which of their columns are missing.
+
+    Each row's null mask is packed into bits and identical masks are
+    grouped, so rows that skip the same fields (a whole optional form
+    section, say) share a pattern. Patterns are numbered from the most
+    common down.
+    """
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        if not self.columns:
+            # Without columns every row has the same, empty pattern
+            self.row_patterns = np.zeros(len(df), dtype='int64')
+            self.counts = np.array([len(df)] if len(df) else [], dtype='int64')
+            self.bits = np.zeros((len(self.counts), 0), dtype=np.uint8)
+            return
+        bits = null_bits(df)
+        words = _row_words(bits)
+
+        # Sort the rows by their words; equal neighbours share a pattern
+        order = np.lexsort(words.T[::-1])
+        ordered = words[order]
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+        inverse = np.empty(len(order), dtype='int64')
+        inverse[order] = np.cumsum(starts) - 1
+        first = order[starts]  # The sort is stable, so this is each pattern's first row
+        counts = np.diff(np.append(np.flatnonzero(starts), len(order)))
+
+        # Renumber the patterns by descending row count
+        order = np.argsort(-counts, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        self.row_patterns = rank[inverse]
+        self.counts = counts[order]
+        self.bits = bits[first[order]]
+
+    def __len__(self):
+        return len(self.counts)
+
+    def missing_columns(self, pattern):
+        """
+        The columns missing in a pattern.
+
+        Args:
+            pattern (int): The pattern number.
+
+        Returns:
+            list: Column names, in data order.
+        """
+        flags = np.unpackbits(self.bits[pattern], count=len(self.columns)).astype(bool)
+        return [col for col, flag in zip(self.columns, flags) if flag]
+
+    def find(self, columns):
+        """
+        The pattern of rows missing exactly these columns.
+
+        Args:
+            columns (list): Column names.
+
+        Returns:
+            int: The pattern number, or None if no row has this pattern.
+        """
+        flags = np.isin(self.columns, list(columns))
+        matches = np.flatnonzero((self.bits == np.packbits(flags)).all(axis=1))
+        return int(matches[0]) if len(matches) else None
+
+    def rows(self, pattern):
+        """
+        Positions of the rows with a pattern.
+
+        Args:
+            pattern (int): The pattern number.
+
+        Returns:
+            np.ndarray: Row positions, in order.
+        """
+        return np.flatnonzero(self.row_patterns == pattern)
+
+    def table(self, top=DEFAULT_TOP, include_complete=False):
+        """
+        The most common patterns.
+
+        Args:
+            top (int): Number of patterns listed (default is DEFAULT_TOP).
+            include_complete (bool): Also list the rows with no missing value.
+
+        Returns:
+            pd.DataFrame: Columns `pattern`, `rows`, `share` (of all rows),
+                `missing` (number of missing columns) and `columns` (their names).
+        """
+        total = max(int(self.counts.sum()), 1)
+        records = []
+        for pattern in range(len(self)):
+            if len(records) == top:
+                break
+            columns = self.missing_columns(pattern)
+            if not columns and not include_complete:
+                continue
+            records.append({
+                'pattern': pattern,
+                'rows': int(self.counts[pattern]),
+                'share': self.counts[pattern] / total,
+                'missing': len(columns),
+                'columns': ', '.join(columns)
+            })
+        return pd.DataFrame(records, columns=['pattern', 'rows', 'share', 'missing', 'columns'])
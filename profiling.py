@@ -0,0 +1,382 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Column holding the member's PUP webmail, used for the metric cards.
+WEBMAIL_COLUMN = 'pup_webmail'
+
+CASE_LABELS = ['Uppercase', 'Lowercase', 'Title Case', 'Mixed Case']
+
+# String problems counted next to the case labels.
+HEALTH_LABELS = ['Leading/Trailing Whitespace', 'Double Spaces', 'Non-ASCII']
+
+TEXT_LABELS = CASE_LABELS + HEALTH_LABELS
+
+# Letters that have a case, and the characters `str.isspace` accepts, as RE2 patterns.
+_CASED_PATTERN = r'[\p{Lu}\p{Ll}\p{Lt}]'
+_SPACE_CLASS = r'[\t\n\x{0b}\f\r\x{1c}-\x{1f}\x{85}\p{Z}]'
+_EDGE_SPACE_PATTERN = rf'^{_SPACE_CLASS}|{_SPACE_CLASS}$'
+
+
+def is_text_column(series):
+    """
+    Check whether a Series holds text.
+
+    Accepts object columns as well as the compact representations produced
+    by `ingest.read_members_csv`: Arrow-backed strings and categoricals.
+
+    Args:
+        series (pd.Series): The column to check.
+
+    Returns:
+        bool: True for object, string and categorical columns.
+    """
+    dtype = series.dtype
+    return (
+        pd.api.types.is_object_dtype(dtype)
+        or isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype))
+    )
+
+
+def is_missing(value):
+    """Check whether a cell value is missing (None, NaN, NA or NaT)."""
+    return value is None or (np.ndim(value) == 0 and bool(pd.isna(value)))
+
+
+def same_value(a, b):
+    """Check whether two cell values are equal, treating missing values as equal."""
+    if is_missing(a) or is_missing(b):
+        return is_missing(a) and is_missing(b)
+    return bool(a == b)
+
+
+def string_flags(values):
+    """
+    Classify strings with Arrow compute kernels.
+
+    Upper, lower and title case follow `str.isupper`, `str.islower` and
+    `str.istitle`, except that Arrow treats the few letters Python counts as
+    cased outside the Lu, Ll and Lt categories (e.g. 'ª') as uncased. Mixed case strings have cased letters but are none of
+    these (e.g. 'McDonald', 'mARY'). Whitespace is anything `str.strip`
+    removes; double spaces are two spaces in a row.
+
+    Args:
+        values (pa.Array): Non-null strings.
+
+    Returns:
+        dict: A boolean numpy array for each of TEXT_LABELS.
+    """
+    upper = pc.utf8_is_upper(values)
+    lower = pc.utf8_is_lower(values)
+    title = pc.utf8_is_title(values)
+    cased = pc.match_substring_regex(values, _CASED_PATTERN)
+    flags = {
+        'Uppercase': upper,
+        'Lowercase': lower,
+        'Title Case': title,
+        'Mixed Case': pc.and_not(cased, pc.or_(pc.or_(upper, lower), title)),
+        'Leading/Trailing Whitespace': pc.match_substring_regex(values, _EDGE_SPACE_PATTERN),
+        'Double Spaces': pc.match_substring(values, '  '),
+        'Non-ASCII': pc.invert(pc.string_is_ascii(values))
+    }
+    return {label: flag.to_numpy(zero_copy_only=False) for label, flag in flags.items()}
+
+
+def classify_case(value):
+    """
+    Text flags of a single string, as computed by `string_flags`.
+
+    Args:
+        value (str): The string to classify.
+
+    Returns:
+        dict: 1 or 0 for each of TEXT_LABELS.
+    """
+    flags = string_flags(pa.array([value], type=pa.string()))
+    return {label: int(flag[0]) for label, flag in flags.items()}
+
+
+def _string_values(values, counts):
+    """Distinct values that are strings as an Arrow array, with their counts."""
+    if isinstance(values.dtype, pd.StringDtype) and values.dtype.storage == 'pyarrow':
+        return pa.array(values.array), counts
+    if pd.api.types.is_object_dtype(values.dtype):
+        mask = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+        values, counts = values[mask], counts[mask]
+    return pa.array(np.asarray(values, dtype=object), type=pa.string()), counts
+
+
+def text_counts(series):
+    """
+    Count the values of a text column matching each of TEXT_LABELS.
+
+    Unlike `profile_column` this does not count distinct values first:
+    categoricals are classified once per category, other columns value by
+    value in a single set of Arrow kernel calls.
+
+    Args:
+        series (pd.Series): A text column.
+
+    Returns:
+        dict: The number of values matching each label.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        values = series.cat.categories
+        weights = np.bincount(codes[codes >= 0], minlength=len(values))
+    else:
+        values = series.dropna()
+        weights = np.ones(len(values), dtype='int64')
+    strings, weights = _string_values(values, weights)
+    return {label: int(weights[flag].sum()) for label, flag in string_flags(strings).items()}
+
+
+@dataclass
+class ColumnProfile:
+    """
+    Summary statistics of a single column.
+
+    `duplicate_count` follows `DataFrame.duplicated`: every row repeating an
+    earlier value counts, and missing values count as equal to each other.
+    `case_counts` (one count per TEXT_LABELS entry) and the length statistics
+    are only set for text columns.
+
+    Tracked columns keep `value_counts`, so `update` can maintain their
+    distinct and duplicate counts; for other columns these two become None
+    after the first update.
+    """
+    name: str
+    row_count: int
+    null_count: int
+    distinct_count: int
+    duplicate_count: int
+    case_counts: dict = None
+    min_length: int = None
+    max_length: int = None
+    mean_length: float = None
+    value_counts: dict = None
+    length_counts: dict = None
+
+    def _add(self, value, sign):
+        if is_missing(value):
+            self.null_count += sign
+        elif self.value_counts is not None:
+            count = self.value_counts.get(value, 0) + sign
+            if count:
+                self.value_counts[value] = count
+            else:
+                del self.value_counts[value]
+            if count == (1 if sign > 0 else 0):
+                self.distinct_count += sign
+
+        if self.length_counts is not None and isinstance(value, str):
+            length = len(value)
+            count = self.length_counts.get(length, 0) + sign
+            if count:
+                self.length_counts[length] = count
+            else:
+                del self.length_counts[length]
+
+    def update(self, old, new):
+        """
+        Replace one occurrence of `old` with `new` in O(1).
+
+        Args:
+            old: The previous cell value.
+            new: The new cell value.
+        """
+        self.update_many([old], [new])
+
+    def update_many(self, old_values, new_values):
+        """
+        Replace one occurrence of each old value with the matching new value.
+
+        Same result as calling `update` for each pair, but the strings of
+        the batch are classified with one set of Arrow kernel calls.
+
+        Args:
+            old_values (list): The previous cell values.
+            new_values (list): The new cell values.
+        """
+        for old, new in zip(old_values, new_values):
+            self._add(old, -1)
+            self._add(new, 1)
+
+        if self.case_counts is not None:
+            for values, sign in ((old_values, -1), (new_values, 1)):
+                strings = [value for value in values if isinstance(value, str)]
+                if strings:
+                    for label, flags in string_flags(pa.array(strings, type=pa.string())).items():
+                        self.case_counts[label] += sign * int(flags.sum())
+
+        if self.value_counts is not None:
+            self.duplicate_count = self.row_count - self.distinct_count - (1 if self.null_count else 0)
+        else:
+            self.distinct_count = None
+            self.duplicate_count = None
+
+        if self.length_counts is not None:
+            lengths = self.length_counts
+            total = sum(count for count in lengths.values())
+            self.min_length = min(lengths) if lengths else None
+            self.max_length = max(lengths) if lengths else None
+            self.mean_length = sum(length * count for length, count in lengths.items()) / total if total else None
+
+
+@dataclass
+class DataProfile:
+    """Profile of a DataFrame, one ColumnProfile per column."""
+    row_count: int
+    columns: dict = field(default_factory=dict)
+
+    def update_cell(self, column, old, new):
+        """
+        Apply a single cell edit to the profile without rescanning the data.
+
+        Args:
+            column (str): The edited column.
+            old: The previous cell value.
+            new: The new cell value.
+        """
+        if column in self.columns and not same_value(old, new):
+            self.columns[column].update(old, new)
+
+    def update_cells(self, column, old_values, new_values):
+        """
+        Apply a batch of edits to one column without rescanning the data.
+
+        Args:
+            column (str): The edited column.
+            old_values (list): The previous cell values.
+            new_values (list): The new cell values.
+        """
+        if column not in self.columns:
+            return
+        pairs = [(old, new) for old, new in zip(old_values, new_values) if not same_value(old, new)]
+        if pairs:
+            old_values, new_values = zip(*pairs)
+            self.columns[column].update_many(list(old_values), list(new_values))
+
+    def missing_counts(self):
+        """
+        Missing values per column.
+
+        Returns:
+            pd.Series: Number of missing values, indexed by column name.
+        """
+        return pd.Series(
+            {name: column.null_count for name, column in self.columns.items()},
+            dtype='int64'
+        )
+
+    def case_analysis(self, columns=None):
+        """
+        Text case and string health counts, like `helpers.analyze_text_case`.
+
+        Args:
+            columns (list): Column names; columns that are missing or not text are skipped.
+                Defaults to every text column.
+
+        Returns:
+            pd.DataFrame: Counts for each of TEXT_LABELS, one column per text column.
+        """
+        if columns is None:
+            columns = list(self.columns)
+        case_analysis = {
+            col: self.columns[col].case_counts
+            for col in columns
+            if col in self.columns and self.columns[col].case_counts is not None
+        }
+        return pd.DataFrame(case_analysis, index=TEXT_LABELS if case_analysis else None)
+
+    def metrics(self, key_column=WEBMAIL_COLUMN):
+        """
+        Metric card values, like `helpers.calculate_data_metrics`.
+
+        Args:
+            key_column (str): The webmail column (default is WEBMAIL_COLUMN).
+
+        Returns:
+            dict: Total rows, unique webmails, duplicate webmails and members not using webmail.
+        """
+        column = self.columns.get(key_column)
+        return {
+            'total_rows': self.row_count,
+            'unique_webmails': column.distinct_count if column else 0,
+            'duplicate_webmails': column.duplicate_count if column else 0,
+            'non_webmail_members': column.null_count if column else 0
+        }
+
+
+def profile_column(series, track_values=False):
+    """
+    Profile a column in a single pass.
+
+    The only scan of the column is one hash-based value count; null, distinct
+    and duplicate counts follow from it, and text flags and lengths are
+    computed over the distinct values with Arrow kernels and weighted by
+    their counts.
+
+    Args:
+        series (pd.Series): The column to profile.
+        track_values (bool): Keep the value counts so distinct and duplicate counts
+            can be maintained by `ColumnProfile.update`.
+
+    Returns:
+        ColumnProfile: The column statistics.
+    """
+    counts = series.value_counts(dropna=False, sort=False)
+    # Categoricals report unused categories with a count of zero.
+    counts = counts[counts > 0]
+    null_mask = counts.index.isna()
+    null_count = int(counts[null_mask].sum())
+    values = counts.index[~null_mask]
+    value_counts = counts.to_numpy()[~null_mask]
+
+    profile = ColumnProfile(
+        name=series.name,
+        row_count=len(series),
+        null_count=null_count,
+        distinct_count=int((~null_mask).sum()),
+        duplicate_count=len(series) - len(counts)
+    )
+    if track_values:
+        profile.value_counts = dict(zip(values.tolist(), value_counts.tolist()))
+
+    if is_text_column(series):
+        strings, weights = _string_values(values, value_counts)
+        flags = string_flags(strings)
+        profile.case_counts = {label: int(weights[flag].sum()) for label, flag in flags.items()}
+        lengths = pc.utf8_length(strings).to_numpy()
+        length_counts = np.bincount(lengths, weights=weights) if len(lengths) else np.array([])
+        profile.length_counts = {
+            int(length): int(count) for length, count in enumerate(length_counts) if count
+        }
+        total = int(weights.sum())
+        if total:
+            profile.min_length = int(lengths.min())
+            profile.max_length = int(lengths.max())
+            profile.mean_length = float(np.dot(lengths, weights)) / total
+
+    return profile
+
+
+def profile_dataframe(df, track_columns=(WEBMAIL_COLUMN,)):
+    """
+    Profile every column of a DataFrame with one scan per column.
+
+    Args:
+        df (pd.DataFrame): The dataframe to profile.
+        track_columns (iterable): Columns whose value counts are kept for incremental
+            updates (default is the webmail column).
+
+    Returns:
+        DataProfile: Row count and a ColumnProfile for each column.
+    """
+    return DataProfile(
+        row_count=len(df),
+        columns={col: profile_column(df[col], col in track_columns) for col in df.columns}
+    )
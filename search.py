@@ -0,0 +1,222 @@
+import bisect
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from profiling import is_missing
+
+# Size of the character n-grams in the inverted index.
+GRAM_SIZE = 3
+
+# When the rarest trigram of a query is shared by more than this share of
+# the distinct values, scanning them with an Arrow kernel beats verifying
+# every candidate.
+INDEX_MAX_CANDIDATE_RATIO = 0.05
+
+# Search modes offered by the "Search" filter.
+SEARCH_MODES = ['contains', 'prefix', 'regex']
+
+# Sorts after every other character, to find the end of a prefix range.
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def normalize_value(value):
+    """Normalize a cell for case-insensitive search: its text, casefolded."""
+    return str(value).casefold()
+
+
+def _grams(s, n=GRAM_SIZE):
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+class ColumnIndex:
+    """
+    Search index over one column.
+
+    Each row holds the id of its distinct value (-1 when missing). The
+    distinct values are normalized (casefolded text), and each normalized
+    value is indexed by its trigrams. A substring query only verifies the
+    values sharing all of the query's trigrams, falling back to an Arrow
+    scan of the distinct values for short or unselective queries; a prefix
+    query is a binary search over the sorted normalized values. Either way
+    the hits are mapped to rows with one vectorized lookup.
+
+    `update` keeps the index in step with cell edits: new values are added
+    to the tables, and values no longer used by any row stay behind without
+    affecting results.
+    """
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self.codes = codes.astype('int64')
+        self.raw_values = [str(value) for value in uniques]
+        self.raw_ids = {value: i for i, value in enumerate(self.raw_values)}
+
+        norm_codes, norm_values = pd.factorize(
+            pd.Series([value.casefold() for value in self.raw_values], dtype=object)
+        )
+        self.norm_of_raw = norm_codes.astype('int64')
+        self.norm_values = list(norm_values)
+        self.norm_ids = {value: i for i, value in enumerate(self.norm_values)}
+
+        self.postings = {}
+        for norm_id, value in enumerate(self.norm_values):
+            for gram in _grams(value):
+                self.postings.setdefault(gram, []).append(norm_id)
+
+        self._sorted = None
+        self._norm_array = None
+        self._raw_array = None
+
+    def _add_value(self, value, new_norms):
+        # The normalized ids of new raw values are collected in `new_norms`
+        # and added to `norm_of_raw` once per batch
+        raw = str(value)
+        raw_id = self.raw_ids.get(raw)
+        if raw_id is not None:
+            return raw_id
+
+        norm = raw.casefold()
+        norm_id = self.norm_ids.get(norm)
+        if norm_id is None:
+            norm_id = len(self.norm_values)
+            self.norm_values.append(norm)
+            self.norm_ids[norm] = norm_id
+            for gram in _grams(norm):
+                self.postings.setdefault(gram, []).append(norm_id)
+            self._sorted = None
+            self._norm_array = None
+
+        raw_id = len(self.raw_values)
+        self.raw_values.append(raw)
+        self.raw_ids[raw] = raw_id
+        new_norms.append(norm_id)
+        return raw_id
+
+    def update(self, positions, values):
+        """
+        Apply cell edits to the index.
+
+        Args:
+            positions (array-like): Row positions of the edited cells.
+            values (array-like): The new values.
+        """
+        new_norms = []
+        for position, value in zip(positions, values):
+            self.codes[position] = -1 if is_missing(value) else self._add_value(value, new_norms)
+        if new_norms:
+            self.norm_of_raw = np.concatenate([self.norm_of_raw, np.asarray(new_norms, dtype='int64')])
+            self._raw_array = None
+
+    def _contains(self, query):
+        postings = sorted((self.postings.get(gram, []) for gram in _grams(query)), key=len)
+        if not postings or len(postings[0]) > INDEX_MAX_CANDIDATE_RATIO * len(self.norm_values):
+            if self._norm_array is None:
+                self._norm_array = pa.array(self.norm_values, type=pa.string())
+            hits = pc.match_substring(self._norm_array, query)
+            return np.flatnonzero(hits.to_numpy(zero_copy_only=False))
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [i for i in candidates if query in self.norm_values[i]]
+
+    def _prefix(self, query):
+        if self._sorted is None:
+            order = sorted(range(len(self.norm_values)), key=self.norm_values.__getitem__)
+            self._sorted = (order, [self.norm_values[i] for i in order])
+        order, values = self._sorted
+        low = bisect.bisect_left(values, query)
+        high = bisect.bisect_left(values, query + _MAX_CHAR, low)
+        return order[low:high]
+
+    def _raw_hits(self, query, mode, case_sensitive):
+        """Boolean array over the distinct raw values."""
+        if mode == 'regex':
+            if self._raw_array is None:
+                self._raw_array = pa.array(self.raw_values, type=pa.string())
+            try:
+                hits = pc.match_substring_regex(self._raw_array, query, ignore_case=not case_sensitive)
+            except pa.ArrowInvalid as e:
+                raise ValueError(str(e)) from e
+            return hits.to_numpy(zero_copy_only=False).astype(bool)
+
+        norm_query = normalize_value(query)
+        norm_hits = np.zeros(len(self.norm_values), dtype=bool)
+        norm_hits[self._contains(norm_query) if mode == 'contains' else self._prefix(norm_query)] = True
+        hits = norm_hits[self.norm_of_raw]
+        if case_sensitive:
+            check = str.__contains__ if mode == 'contains' else str.startswith
+            for raw_id in np.flatnonzero(hits):
+                hits[raw_id] = check(self.raw_values[raw_id], query)
+        return hits
+
+    def match(self, query, mode='contains', case_sensitive=False):
+        """
+        Rows whose value matches a query.
+
+        Args:
+            query (str): The text to look for, or a regular expression (RE2 syntax) in regex mode.
+            mode (str): 'contains' (substring), 'prefix' or 'regex' (default is 'contains').
+            case_sensitive (bool): Match case exactly (default is False).
+
+        Returns:
+            np.ndarray: One boolean per row; missing values never match.
+
+        Raises:
+            ValueError: If the mode is unknown or the regular expression is invalid.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        hits = np.append(self._raw_hits(query, mode, case_sensitive), False)
+        return hits[self.codes]  # Missing rows use the -1 code, i.e. the trailing False
+
+
+class SearchIndex:
+    """
+    Search indexes for the columns of one DataFrame, built on first use.
+
+    The owner calls `update` with every batch of applied edits, so the
+    index follows the data without being rebuilt.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._columns = {}
+
+    def column(self, name):
+        """The ColumnIndex of a column, building it if needed."""
+        if name not in self._columns:
+            self._columns[name] = ColumnIndex(self.df[name])
+        return self._columns[name]
+
+    def update(self, changes):
+        """
+        Apply a batch of edits to the columns indexed so far.
+
+        Args:
+            changes (pd.DataFrame): Edits from `edits.apply_edits`, with `position`, `column` and `new`.
+        """
+        for name, column_changes in changes.groupby('column', sort=False):
+            if name in self._columns:
+                self._columns[name].update(column_changes['position'], column_changes['new'])
+
+    def search(self, query, columns=None, mode='contains', case_sensitive=False):
+        """
+        Rows where any of the given columns matches a query.
+
+        Args:
+            query (str): The text or regular expression to look for.
+            columns (list): The columns to search (default is every column).
+            mode (str): 'contains', 'prefix' or 'regex' (default is 'contains').
+            case_sensitive (bool): Match case exactly (default is False).
+
+        Returns:
+            np.ndarray: One boolean per row.
+
+        Raises:
+            ValueError: If the mode is unknown or the regular expression is invalid.
+        """
+        mask = np.zeros(len(self.df), dtype=bool)
+        for name in self.df.columns if columns is None else columns:
+            mask |= self.column(name).match(query, mode, case_sensitive)
+        return mask
@@ -0,0 +1,547 @@
+import math
+import multiprocessing
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# Size of the character n-grams used to build the candidate index.
+NGRAM_SIZE = 2
+
+# Number of worker processes the app offers for parallel scoring. Library
+# calls score serially unless they ask for workers, since spawning processes
+# needs the caller's script to be import-safe.
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Inputs with fewer distinct values than this are always scored serially,
+# since starting the worker processes would cost more than the scoring.
+PARALLEL_MIN_VALUES = 2000
+
+# Number of chunks handed to each worker, so uneven chunks even out.
+CHUNKS_PER_WORKER = 8
+
+# Slack applied to the pruning bounds so float rounding never drops a pair.
+_EPSILON = 1e-9
+
+
+def normalize_string(s):
+    """
+    Normalize a value for similarity comparison.
+
+    Non-string values normalize to an empty string. Strings are lowercased,
+    runs of whitespace are collapsed and punctuation is removed.
+
+    Parameters:
+        s: The value to normalize.
+
+    Returns:
+        str: The normalized string.
+    """
+    if not isinstance(s, str):
+        return ""
+    s = s.lower()
+    s = " ".join(s.split())
+    s = re.sub(r'[^\w\s]', '', s)
+    return s
+
+
+def _char_masks(s):
+    masks = {}
+    for i, c in enumerate(s):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks
+
+
+def _lcs_length(masks, length, other):
+    """
+    Length of the longest common subsequence, using the bit-parallel algorithm.
+
+    `masks` and `length` describe the first string (see _char_masks), so the
+    cost is a handful of integer operations per character of `other`.
+    """
+    full = (1 << length) - 1
+    v = full
+    for c in other:
+        u = v & masks.get(c, 0)
+        v = ((v + u) | (v - u)) & full
+    return length - bin(v).count('1')
+
+
+def _ngrams(s, n=NGRAM_SIZE):
+    return Counter(s[i:i + n] for i in range(len(s) - n + 1))
+
+
+def _min_shared_ngrams(total_length, threshold, n=NGRAM_SIZE):
+    """
+    Lower bound on the n-grams two strings must share to reach `threshold`.
+
+    SequenceMatcher.ratio() is 2*M/T, where M is the number of characters in
+    the matching blocks and T the combined length. Every block of length L
+    contributes L-n+1 shared n-grams, and consecutive blocks are separated by
+    at least one unmatched character, so there are at most T-2*M+1 blocks.
+    """
+    matched = threshold * total_length / 2
+    unmatched = total_length - 2 * matched
+    return matched - (unmatched + 1) * (n - 1)
+
+
+def build_similarity_index(values):
+    """
+    Normalize values once and index them for candidate generation.
+
+    Parameters:
+        values (iterable): The values to index, in their original order.
+
+    Returns:
+        dict: The index with the keys:
+            - values (list): The original values.
+            - norms (list): The distinct normalized strings.
+            - norm_ids (list): For each value, the position of its normalized string in `norms`.
+            - first_positions (list): Position of the first value with each normalized string.
+            - last_positions (list): Position of the last value with each normalized string.
+            - lengths (list): Length of each normalized string.
+            - length_array (np.ndarray): The lengths as an array.
+            - char_matrix (np.ndarray): Dense character counts, one row per normalized string.
+            - char_masks (list): Per-character position bitmasks of each normalized string.
+            - grams (list): N-gram counts of each normalized string.
+            - char_tokens (list): Character tokens of each string, rarest first.
+            - gram_tokens (list): N-gram tokens of each string, rarest first.
+    """
+    values = list(values)
+    norms = []
+    norm_lookup = {}
+    norm_ids = []
+    first_positions = []
+    last_positions = []
+    for position, value in enumerate(values):
+        norm = normalize_string(value)
+        if norm not in norm_lookup:
+            norm_lookup[norm] = len(norms)
+            norms.append(norm)
+            first_positions.append(position)
+            last_positions.append(position)
+        norm_id = norm_lookup[norm]
+        norm_ids.append(norm_id)
+        last_positions[norm_id] = position
+
+    chars = [Counter(norm) for norm in norms]
+    grams = [_ngrams(norm) for norm in norms]
+
+    alphabet = {c: i for i, c in enumerate(sorted(set().union(*chars)))}
+    char_matrix = np.zeros((len(norms), len(alphabet)), dtype=np.int32)
+    for norm_id, counts in enumerate(chars):
+        for c, count in counts.items():
+            char_matrix[norm_id, alphabet[c]] = count
+
+    return {
+        'values': values,
+        'norms': norms,
+        'norm_ids': norm_ids,
+        'first_positions': first_positions,
+        'last_positions': last_positions,
+        'lengths': [len(norm) for norm in norms],
+        'length_array': np.array([len(norm) for norm in norms], dtype=np.int64),
+        'char_matrix': char_matrix,
+        'char_masks': [_char_masks(norm) for norm in norms],
+        'grams': grams,
+        'char_tokens': _ordered_tokens(chars),
+        'gram_tokens': _ordered_tokens(grams),
+    }
+
+
+def _ordered_tokens(counters):
+    """
+    Turn multisets into token lists sorted by global rarity.
+
+    The k-th occurrence of an element becomes the token (element, k), so set
+    overlap of the token lists equals multiset overlap of the counters.
+    """
+    token_lists = [
+        [(element, k) for element, count in counts.items() for k in range(count)]
+        for counts in counters
+    ]
+    frequency = Counter(token for tokens in token_lists for token in tokens)
+    for tokens in token_lists:
+        tokens.sort(key=lambda token: (frequency[token], token))
+    return token_lists
+
+
+def _overlap(counts1, counts2):
+    if len(counts1) > len(counts2):
+        counts1, counts2 = counts2, counts1
+    return sum(min(count, counts2[element]) for element, count in counts1.items() if element in counts2)
+
+
+def _length_bounds(length, threshold):
+    # ratio <= 2*min(len1, len2) / (len1 + len2) bounds the partner length.
+    min_len = math.ceil(length * threshold / (2 - threshold) - _EPSILON)
+    max_len = math.floor(length * (2 - threshold) / threshold + _EPSILON)
+    return min_len, max_len
+
+
+def _required_overlaps(length, threshold, partner_length):
+    """
+    Minimum character and n-gram overlap with a partner of at least `partner_length`.
+
+    Both bounds grow with the partner length, so the shortest allowed partner
+    gives the smallest requirement.
+    """
+    total_length = length + max(partner_length, 1)
+    # quick_ratio(): matched characters are at most the character overlap.
+    char_overlap = math.ceil(threshold * total_length / 2 - _EPSILON)
+    gram_overlap = math.ceil(_min_shared_ngrams(total_length, threshold) - _EPSILON)
+    return char_overlap, gram_overlap
+
+
+def _prefix(tokens, overlap):
+    return tokens[:max(len(tokens) - overlap + 1, 0)]
+
+
+def build_prefix_postings(index, threshold):
+    """
+    Build the prefix-filter postings for a threshold.
+
+    If two token lists overlap in at least `o` tokens, their first
+    `len - o + 1` tokens (in a shared global order) have a token in common.
+    Strings are ranked by length and each pair is probed from its shorter
+    side, so the probing prefix only has to cover longer partners while the
+    indexed prefix covers shorter ones. Strings are indexed by n-grams when
+    the n-gram bound is positive for all their partners, and by characters
+    in every case.
+
+    Parameters:
+        index (dict): The index returned by build_similarity_index.
+        threshold (float): The similarity threshold (must be positive).
+
+    Returns:
+        dict: The postings with the keys:
+            - order (np.ndarray): Normalized string ids sorted by length.
+            - ranks (np.ndarray): Rank of each normalized string id in `order`.
+            - gram_indexed (np.ndarray): Whether each string is in the n-gram postings.
+            - char_postings (dict): Character token -> sorted ranks with the token in their prefix.
+            - char_only_postings (dict): Same as char_postings, restricted to strings not in the n-gram postings.
+            - gram_postings (dict): N-gram token -> sorted ranks with the token in their prefix.
+    """
+    lengths = index['length_array']
+    order = np.argsort(lengths, kind='stable')
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+
+    char_postings = defaultdict(list)
+    char_only_postings = defaultdict(list)
+    gram_postings = defaultdict(list)
+    gram_indexed = np.zeros(len(order), dtype=bool)
+
+    for rank, norm_id in enumerate(order.tolist()):
+        length = index['lengths'][norm_id]
+        if not length:
+            continue
+        min_len, _ = _length_bounds(length, threshold)
+        char_overlap, gram_overlap = _required_overlaps(length, threshold, min_len)
+
+        for token in _prefix(index['char_tokens'][norm_id], char_overlap):
+            char_postings[token].append(rank)
+            if gram_overlap <= 0:
+                char_only_postings[token].append(rank)
+        if gram_overlap > 0:
+            gram_indexed[norm_id] = True
+            for token in _prefix(index['gram_tokens'][norm_id], gram_overlap):
+                gram_postings[token].append(rank)
+
+    def to_arrays(postings):
+        return {token: np.array(ranks, dtype=np.int64) for token, ranks in postings.items()}
+
+    return {
+        'order': order,
+        'ranks': ranks,
+        'gram_indexed': gram_indexed,
+        'char_postings': to_arrays(char_postings),
+        'char_only_postings': to_arrays(char_only_postings),
+        'gram_postings': to_arrays(gram_postings),
+    }
+
+
+def _probe(postings, tokens, low, high):
+    # Posting lists are sorted, so the ranks in [low, high) are a slice.
+    arrays = []
+    for token in tokens:
+        ranks = postings.get(token)
+        if ranks is not None:
+            start, stop = np.searchsorted(ranks, (low, high))
+            if stop > start:
+                arrays.append(ranks[start:stop])
+    return arrays
+
+
+def candidate_norm_pairs(index, threshold, norm_ids=None, postings=None):
+    """
+    Yield pairs of distinct normalized strings that may reach `threshold`.
+
+    Candidates come from the prefix-filter postings, and every candidate then
+    has to pass the length bound, the character multiset bound
+    (SequenceMatcher.quick_ratio), the shared n-gram bound and the longest
+    common subsequence bound (the matching blocks are a common subsequence).
+    All of them are upper bounds of the exact ratio, so no qualifying pair is
+    ever dropped.
+
+    Parameters:
+        index (dict): The index returned by build_similarity_index.
+        threshold (float): The similarity threshold (must be positive).
+        norm_ids (iterable): Only probe from these ids (default is all). Each pair is
+            probed from its shorter side, so a partition of the ids yields every pair once.
+        postings (dict): Postings from build_prefix_postings, built on demand if omitted.
+
+    Yields:
+        tuple: (id1, id2) with id1 < id2, both non-empty normalized strings.
+    """
+    lengths = index['lengths']
+    norms = index['norms']
+    char_matrix = index['char_matrix']
+    char_masks = index['char_masks']
+    grams = index['grams']
+
+    if postings is None:
+        postings = build_prefix_postings(index, threshold)
+    if norm_ids is None:
+        norm_ids = range(len(lengths))
+
+    order = postings['order']
+    ranks = postings['ranks']
+    sorted_lengths = index['length_array'][order]
+    seen = np.zeros(len(order), dtype=bool)
+
+    for id1 in norm_ids:
+        len1 = lengths[id1]
+        if not len1:
+            continue
+
+        # Only longer (or equally long, later ranked) partners are probed here.
+        _, max_len = _length_bounds(len1, threshold)
+        low = ranks[id1] + 1
+        high = np.searchsorted(sorted_lengths, max_len, side='right')
+        if high <= low:
+            continue
+
+        char_overlap, gram_overlap = _required_overlaps(len1, threshold, len1)
+        char_prefix = _prefix(index['char_tokens'][id1], char_overlap)
+        if gram_overlap > 0:
+            arrays = _probe(postings['gram_postings'], _prefix(index['gram_tokens'][id1], gram_overlap), low, high)
+            arrays += _probe(postings['char_only_postings'], char_prefix, low, high)
+        else:
+            arrays = _probe(postings['char_postings'], char_prefix, low, high)
+        if not arrays:
+            continue
+
+        hits = np.concatenate(arrays)
+        seen[hits] = True
+        candidate_ranks = np.flatnonzero(seen[low:high]) + low
+        seen[hits] = False
+
+        candidates = order[candidate_ranks]
+        total_lengths = len1 + sorted_lengths[candidate_ranks]
+        char_overlaps = np.minimum(char_matrix[candidates], char_matrix[id1]).sum(axis=1)
+        keep = 2.0 * char_overlaps / total_lengths >= threshold - _EPSILON
+
+        for id2, total_length in zip(candidates[keep].tolist(), total_lengths[keep].tolist()):
+            required_grams = _min_shared_ngrams(total_length, threshold)
+            if required_grams > _EPSILON and _overlap(grams[id1], grams[id2]) < required_grams - _EPSILON:
+                continue
+            if 2.0 * _lcs_length(char_masks[id1], len1, norms[id2]) / total_length < threshold - _EPSILON:
+                continue
+            yield min(id1, id2), max(id1, id2)
+
+
+def score_norm_pairs(index, pairs, threshold):
+    """
+    Compute exact similarity ratios for candidate normalized string pairs.
+
+    Parameters:
+        index (dict): The index returned by build_similarity_index.
+        pairs (iterable): (id1, id2) pairs of normalized string ids.
+        threshold (float): The similarity threshold.
+
+    Returns:
+        dict: (id1, id2) -> ratio for both orientations of every pair that reaches the threshold.
+    """
+    norms = index['norms']
+    last_positions = index['last_positions']
+    first_positions = index['first_positions']
+    scores = {}
+    for id1, id2 in pairs:
+        matcher = SequenceMatcher(None, norms[id1], norms[id2])
+        ratio = matcher.ratio()
+        if ratio >= threshold:
+            scores[(id1, id2)] = ratio
+        # ratio() is not symmetric, so the reverse orientation is scored too
+        # whenever some value of id2 comes before a value of id1.
+        if first_positions[id2] < last_positions[id1]:
+            matcher.set_seqs(norms[id2], norms[id1])
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                scores[(id2, id1)] = ratio
+    return scores
+
+
+def expand_value_pairs(index, scores, threshold):
+    """
+    Expand scored normalized pairs back to pairs of original values.
+
+    Pairs are returned in the order of the original all-pairs loop, i.e. by
+    the position of the first value and then of the second.
+
+    Parameters:
+        index (dict): The index returned by build_similarity_index.
+        scores (dict): Scores returned by score_norm_pairs.
+        threshold (float): The similarity threshold.
+
+    Returns:
+        list: Dicts with the keys value1, value2 and similarity.
+    """
+    values = index['values']
+    norm_ids = index['norm_ids']
+    norms = index['norms']
+
+    positions = defaultdict(list)
+    for position, norm_id in enumerate(norm_ids):
+        positions[norm_id].append(position)
+
+    position_pairs = []
+    # Values that normalize to the same non-empty string are identical matches.
+    if threshold <= 1.0:
+        for norm_id, group in positions.items():
+            if norms[norm_id] and len(group) > 1:
+                for a, i in enumerate(group):
+                    for j in group[a + 1:]:
+                        position_pairs.append((i, j, 1.0))
+    for (id1, id2), ratio in scores.items():
+        for i in positions[id1]:
+            for j in positions[id2]:
+                if i < j:
+                    position_pairs.append((i, j, ratio))
+
+    position_pairs.sort()
+    return [
+        {'value1': values[i], 'value2': values[j], 'similarity': round(ratio, 3)}
+        for i, j, ratio in position_pairs
+    ]
+
+
+def _all_value_pairs(values, threshold):
+    # With a non-positive threshold every pair qualifies, so nothing can be pruned.
+    norms = [normalize_string(value) for value in values]
+    similar_pairs = []
+    for i, val1 in enumerate(values):
+        for j in range(i + 1, len(values)):
+            if norms[i] and norms[j]:
+                similarity = SequenceMatcher(None, norms[i], norms[j]).ratio()
+            else:
+                similarity = 0.0
+            if similarity >= threshold:
+                similar_pairs.append({
+                    'value1': val1,
+                    'value2': values[j],
+                    'similarity': round(similarity, 3)
+                })
+    return similar_pairs
+
+
+def _chunk_norm_ids(index, threshold, postings, n_chunks):
+    """
+    Split the probing ids into chunks of roughly equal work.
+
+    The work of an id is estimated by the number of partners in its length
+    window, so short strings near the bottom of the ranking (which probe
+    many partners) are spread over more chunks.
+    """
+    order = postings['order']
+    lengths = index['length_array'][order]
+    max_lengths = np.floor(lengths * (2 - threshold) / threshold + _EPSILON)
+    costs = np.searchsorted(lengths, max_lengths, side='right') - np.arange(len(order))
+    costs = np.where(lengths > 0, np.maximum(costs, 1), 0)
+
+    bounds = np.searchsorted(np.cumsum(costs), np.linspace(0, costs.sum(), n_chunks + 1)[1:-1])
+    return [chunk.tolist() for chunk in np.split(order, bounds) if len(chunk)]
+
+
+# Per-process state of the scoring workers, set by _init_worker.
+_worker_state = {}
+
+
+def _init_worker(index, threshold, postings):
+    _worker_state['index'] = index
+    _worker_state['threshold'] = threshold
+    _worker_state['postings'] = postings
+
+
+def _score_chunk(norm_ids):
+    index = _worker_state['index']
+    threshold = _worker_state['threshold']
+    pairs = candidate_norm_pairs(index, threshold, norm_ids, _worker_state['postings'])
+    return score_norm_pairs(index, pairs, threshold)
+
+
+def score_norm_pairs_parallel(index, threshold, workers):
+    """
+    Generate and score candidate pairs in a pool of worker processes.
+
+    The probing ids are split into balanced chunks, every worker receives the
+    index and prefix postings once, and chunk results are merged as they
+    complete. The merged scores are identical to the serial path.
+
+    Parameters:
+        index (dict): The index returned by build_similarity_index.
+        threshold (float): The similarity threshold (must be positive).
+        workers (int): Number of worker processes.
+
+    Returns:
+        dict: (id1, id2) -> ratio, as returned by score_norm_pairs.
+    """
+    postings = build_prefix_postings(index, threshold)
+    chunks = _chunk_norm_ids(index, threshold, postings, workers * CHUNKS_PER_WORKER)
+
+    scores = {}
+    # Spawned workers do not inherit the state of the threads serving the app.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(index, threshold, postings)
+    ) as executor:
+        futures = [executor.submit(_score_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            scores.update(future.result())
+    return scores
+
+
+def find_similar_pairs(values, threshold=0.8, workers=1):
+    """
+    Find all pairs of values whose normalized similarity reaches `threshold`.
+
+    Equivalent to comparing every value with every later value using
+    SequenceMatcher on the normalized strings, but each value is normalized
+    once and only candidate pairs from the n-gram index are scored.
+
+    Parameters:
+        values (iterable): The distinct values to compare, in order.
+        threshold (float): The similarity threshold (default is 0.8).
+        workers (int): Number of worker processes (default is 1, serial). Inputs
+            with fewer than PARALLEL_MIN_VALUES distinct values are scored serially.
+
+    Returns:
+        list: Dicts with the keys value1, value2 and similarity.
+    """
+    values = list(values)
+    if threshold <= 0:
+        return _all_value_pairs(values, threshold)
+
+    index = build_similarity_index(values)
+    if workers > 1 and len(index['norms']) >= PARALLEL_MIN_VALUES:
+        scores = score_norm_pairs_parallel(index, threshold, workers)
+    else:
+        pairs = candidate_norm_pairs(index, threshold)
+        scores = score_norm_pairs(index, pairs, threshold)
+    return expand_value_pairs(index, scores, threshold)
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from profiling import is_text_column
+
+# Name columns that are title-cased.
+NAME_COLUMNS = ['first_name', 'middle_name', 'last_name', 'full_name']
+
+# Name suffixes kept in capitals when names are title-cased.
+ROMAN_SUFFIXES = ['II', 'III', 'IV']
+
+# Columns holding the webmail and the course code.
+WEBMAIL_COLUMN = 'pup_webmail'
+COURSE_COLUMN = 'course'
+
+# Longest course code, in letters; longer values are taken as written-out course names.
+COURSE_CODE_MAX_LENGTH = 8
+
+# Webmail addresses members are expected to use, after lowercasing.
+WEBMAIL_PATTERN = r'^[a-z0-9._+-]+@iskolarngbayan\.pup\.edu\.ph$'
+
+# Fixes that can be applied, in the order they run, with their labels.
+RULES = {
+    'whitespace': "Collapse whitespace",
+    'title_case': "Title-case names",
+    'webmail': "Lowercase webmails",
+    'course': "Normalize course codes"
+}
+
+# Columns of a fix list.
+FIX_COLUMNS = ['row_id', 'position', 'column', 'rule', 'old', 'new']
+
+
+def _collapse_whitespace(values):
+    return pc.utf8_trim_whitespace(pc.replace_substring_regex(values, r'\s+', ' '))
+
+
+def _title_case(values):
+    # Only words in one case are re-cased, so deliberate capitals such as
+    # 'McDonald' are kept even when another word of the name is not
+    words = pc.split_pattern(pc.fill_null(values, ''), ' ')
+    flat = pc.list_flatten(words)
+    titled = pc.utf8_title(flat)
+    for numeral in ROMAN_SUFFIXES:
+        titled = pc.replace_substring_regex(titled, rf'\b{numeral.title()}\b', numeral)
+    miscased = pc.or_(pc.utf8_is_upper(flat), pc.utf8_is_lower(flat))
+    flat = pc.if_else(miscased, titled, flat)
+    joined = pc.binary_join(pa.ListArray.from_arrays(words.offsets, flat), pa.scalar(' ', values.type))
+    return pc.if_else(pc.is_null(values), values, joined)
+
+
+def _lower_webmail(values):
+    return pc.utf8_lower(pc.replace_substring_regex(values, r'\s+', ''))
+
+
+def _course_code(values):
+    # Only values that look like a code are rewritten, so course names written
+    # out in full (e.g. 'BS Computer Science') are kept
+    code = pc.utf8_upper(pc.replace_substring_regex(values, r'[\s.\-]+', ''))
+    looks_like_code = pc.and_(
+        pc.match_substring_regex(values, r'^[\s.\-]*[A-Za-z]+([\s.\-]+[A-Za-z]+)*[\s.\-]*$'),
+        pc.less_equal(pc.utf8_length(code), COURSE_CODE_MAX_LENGTH)
+    )
+    return pc.if_else(looks_like_code, code, values)
+
+
+# The transform of each rule and the columns it applies to (None for every text column).
+_TRANSFORMS = {
+    'whitespace': (_collapse_whitespace, None),
+    'title_case': (_title_case, NAME_COLUMNS),
+    'webmail': (_lower_webmail, [WEBMAIL_COLUMN]),
+    'course': (_course_code, [COURSE_COLUMN])
+}
+
+
+def _text_values(series):
+    """
+    The strings of a text column as an Arrow array, with the entry of each row.
+
+    Categoricals give their categories, so each distinct value is transformed
+    once; other columns give every value.
+
+    Returns:
+        tuple: The Arrow string array and, per row, its entry in the array (-1 if missing).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.categories.astype('string[pyarrow]')
+        entries = series.cat.codes.to_numpy().astype('int64')
+    else:
+        values = series.astype('string[pyarrow]')
+        entries = np.where(values.isna().to_numpy(), -1, np.arange(len(values)))
+    values = pa.array(values.array)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    return values, entries
+
+
+def propose_fixes(df, rules=None):
+    """
+    Work out the cell fixes of the standardization rules, without applying them.
+
+    Each rule is a vectorized Arrow transform of a whole column. Rules run
+    in the order of RULES, and each fixed cell records every rule that
+    changed it.
+
+    Args:
+        df (pd.DataFrame): The data.
+        rules (list): Keys of RULES to run (default is all of them).
+
+    Returns:
+        pd.DataFrame: One row per changed cell with the columns in FIX_COLUMNS,
+            ready for `edits.apply_edits`.
+    """
+    rules = list(RULES) if rules is None else [rule for rule in RULES if rule in rules]
+    fixes = []
+    for column in df.columns:
+        applicable = [
+            rule for rule in rules
+            if _TRANSFORMS[rule][1] is None or column in _TRANSFORMS[rule][1]
+        ]
+        if not applicable or not is_text_column(df[column]):
+            continue
+
+        values, entries = _text_values(df[column])
+        new = values
+        labels = np.full(len(values), '', dtype=object)
+        for rule in applicable:
+            fixed = _TRANSFORMS[rule][0](new)
+            touched = pc.fill_null(pc.not_equal(fixed, new), False).to_numpy(zero_copy_only=False)
+            labels[touched] = labels[touched] + ', ' + RULES[rule]
+            new = fixed
+
+        changed = pc.fill_null(pc.not_equal(values, new), False).to_numpy(zero_copy_only=False)
+        positions = np.flatnonzero((entries >= 0) & changed[np.maximum(entries, 0)])
+        if not len(positions):
+            continue
+        entry = entries[positions]
+        fixes.append(pd.DataFrame({
+            'row_id': df.index[positions],
+            'position': positions,
+            'column': column,
+            'rule': [label[2:] for label in labels[entry]],
+            'old': df[column].iloc[positions].to_numpy(dtype=object),
+            'new': np.asarray(new.take(pa.array(entry)).to_pylist(), dtype=object)
+        }))
+
+    if not fixes:
+        return pd.DataFrame(columns=FIX_COLUMNS)
+    return pd.concat(fixes, ignore_index=True)
+
+
+def summarize_fixes(fixes):
+    """
+    A compact diff: each distinct change once, with the number of cells it fixes.
+
+    Args:
+        fixes (pd.DataFrame): Output of `propose_fixes`.
+
+    Returns:
+        pd.DataFrame: Columns `column`, `rule`, `old`, `new` and `rows`, most common first.
+    """
+    if fixes.empty:
+        return pd.DataFrame(columns=['column', 'rule', 'old', 'new', 'rows'])
+    summary = fixes.groupby(['column', 'rule', 'old', 'new'], sort=False, observed=True).size()
+    return summary.rename('rows').reset_index().sort_values('rows', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def invalid_webmails(df, column=WEBMAIL_COLUMN):
+    """
+    Webmails that do not match WEBMAIL_PATTERN, even after the webmail fix.
+
+    Args:
+        df (pd.DataFrame): The data.
+        column (str): The webmail column (default is WEBMAIL_COLUMN).
+
+    Returns:
+        pd.DataFrame: Columns `row_id`, `position` and `value`; empty if the column is absent.
+    """
+    if column not in df.columns:
+        return pd.DataFrame(columns=['row_id', 'position', 'value'])
+    values, entries = _text_values(df[column])
+    valid = pc.match_substring_regex(_lower_webmail(values), WEBMAIL_PATTERN)
+    invalid = pc.invert(pc.fill_null(valid, True)).to_numpy(zero_copy_only=False)
+    positions = np.flatnonzero((entries >= 0) & invalid[np.maximum(entries, 0)])
+    return pd.DataFrame({
+        'row_id': df.index[positions],
+        'position': positions,
+        'value': df[column].iloc[positions].to_numpy(dtype=object)
+    })
@@ -1,18 +1,37 @@
+import contextlib
+import copy
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import os
+import cor
+import dataset_store
+import duplicates as dup
+import edits
+import export
 import helpers as h
-import visualizations as viz
+import ingest
+import instrumentation
+import linkage
+import missingness
+import profiling
+import search
+import similarity
+import standardize
+import views
 
 pd.set_option('future.no_silent_downcasting', True)
 
-# Add fragment for the data editor
-@st.fragment
+# The data editor is part of the data section fragment, so an edit reruns the
+# section, which commits the edit and then reruns the whole app
 def editable_dataframe(df, editor_key):
+    # Categorical columns would show as fixed-option selectboxes, so they are
+    # shown as text and new values can still be typed in
+    categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if categorical:
+        df = df.astype({col: object for col in categorical})
     edited_df = st.data_editor(
-        df.copy(), 
+        df, 
         hide_index=False,
         key=editor_key,
         use_container_width=True,
@@ -21,33 +40,93 @@ def editable_dataframe(df, editor_key):
     )
     return edited_df
 
+# Row positions of an export scope: every row, the filtered rows or the edited rows
+def export_positions(df, scope, view):
+    if scope == 'view' and not view.full:
+        return view.positions
+    if scope == 'changed':
+        return st.session_state.versions.positions()
+    return None
+
 # Add fragment for the download and history section
 @st.fragment
-def show_download_and_history(df):
-    download_col, history_col = st.columns([1,5])
+def show_download_and_history(df, view):
+    download_col, undo_col, redo_col, history_col = st.columns([1,1,1,3])
     with download_col:
         if not df.empty:
-            df = h.adjust_column_names_for_download(df)
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name="members_data.csv",
-                mime="text/csv",
-                key="download_btn",
-                type='primary',
-                use_container_width=True
-            )
+            # Files are built only when asked for and kept until the data changes
+            with st.popover("Download", use_container_width=True):
+                fmt = st.selectbox(
+                    "Format",
+                    export.available_formats(),
+                    format_func=lambda fmt: export.EXPORT_FORMATS[fmt][0],
+                    key="export_format"
+                )
+                scope = st.radio(
+                    "Rows",
+                    export.EXPORT_SCOPES,
+                    format_func={'all': "All rows", 'view': "Filtered rows", 'changed': "Edited rows"}.get,
+                    key="export_scope"
+                )
+                positions = export_positions(df, scope, view)
+                version = (st.session_state.get('dataset_key'), st.session_state.get('data_version'))
+                export_cache = st.session_state.export_cache
+                data = export_cache.get(version, fmt, positions)
+                if data is None and st.button("Prepare file", key="export_prepare", use_container_width=True):
+                    with instrumentation.stage('export', len(df) if positions is None else len(positions)):
+                        data = export_cache.build(df, version, fmt, positions)
+                if data is not None:
+                    st.download_button(
+                        label=f"Download {export.EXPORT_FORMATS[fmt][0]}",
+                        data=data,
+                        file_name=export.file_name("members_data", fmt),
+                        mime=export.EXPORT_FORMATS[fmt][2],
+                        key="download_btn",
+                        type='primary',
+                        use_container_width=True
+                    )
+                st.caption(f"{len(df) if positions is None else len(positions)} rows")
+    versions = st.session_state.versions
+    with undo_col:
+        if st.button("Undo", disabled=not versions.can_undo, key="undo_btn", use_container_width=True):
+            checkout_version(step=-1)
+            st.rerun()
+    with redo_col:
+        if st.button("Redo", disabled=not versions.can_redo, key="redo_btn", use_container_width=True):
+            checkout_version(step=1)
+            st.rerun()
     with history_col:
         with st.expander("View all changes"):
+            if len(versions):
+                st.subheader("Versions")
+                version_table = versions.to_frame()
+                st.dataframe(version_table, hide_index=True, use_container_width=True)
+                target = st.selectbox(
+                    "Version",
+                    version_table['version'],
+                    index=versions.current,
+                    format_func=lambda version: f"{version}: {version_table['label'][version]}",
+                    key=f"version_select_{versions.current}_{len(versions)}"
+                )
+                if st.button("Go to version", disabled=target == versions.current, key="version_go"):
+                    checkout_version(target)
+                    st.rerun()
+
             st.subheader("Edit History")
-            if st.session_state.change_log["edited_rows"]:
-                st.write("Edited rows:")
-                for idx, edits in st.session_state.change_log["edited_rows"].items():
-                    for edit in edits:
-                        st.write(f"Row {idx} at {edit['timestamp']}:")
-                        for col, values in edit['changes'].items():
-                            st.write(f"  - {col}: from '{values['from']}' to '{values['to']}'")
+            change_log = st.session_state.change_log
+            if len(change_log):
+                columns = st.multiselect("Columns", df.columns, key="history_columns", placeholder="All columns")
+                search = st.text_input("Search values", key="history_search")
+                page = st.number_input("Page", min_value=1, value=1, key="history_page")
+                history = change_log.to_frame(columns, search)
+                history_page, page_count = edits.paginate(history, page)
+                # Values of any type are shown as text so the column serializes to Arrow
+                history_page = history_page.assign(**{
+                    name: history_page[name].map(lambda value: None if profiling.is_missing(value) else str(value))
+                    for name in ('row_id', 'old', 'new')
+                })
+                st.dataframe(history_page, hide_index=True, use_container_width=True)
+                st.caption(f"Page {min(page, page_count)} of {page_count}, {len(history)} of {len(change_log)} changes")
 
 # Page Configuration
 def setup_page():
@@ -76,13 +155,67 @@ def initialize_session_state():
         st.session_state.reset_counter = 0
     # Add a persistent change log for edits only
     if "change_log" not in st.session_state:
-        st.session_state.change_log = {
-            "edited_rows": {}
-        }
+        st.session_state.change_log = edits.ChangeLog()
+    if "versions" not in st.session_state:
+        st.session_state.versions = edits.VersionHistory()
+    if "editor_version" not in st.session_state:
+        st.session_state.editor_version = 0
+    if "export_cache" not in st.session_state:
+        st.session_state.export_cache = export.ExportCache()
+    if "diagnostics" not in st.session_state:
+        st.session_state.diagnostics = instrumentation.RunHistory()
+
+# Stage timings are only recorded while the diagnostics panel is on
+def diagnostics_run(kind):
+    if not st.session_state.get('diagnostics_enabled'):
+        return contextlib.nullcontext()
+    return instrumentation.recording(st.session_state.diagnostics, kind)
+
+# Diagnostics Panel
+def render_diagnostics_panel():
+    history = st.session_state.diagnostics
+    with st.sidebar:
+        st.markdown("#### Diagnostics")
+        if not len(history):
+            st.caption("No runs recorded yet.")
+            return
+        latest = history.runs[-1]
+        st.caption(
+            f"Run {latest['run']} ({latest['kind']}) took {latest['seconds'] * 1000:.0f} ms. "
+            "Fragment reruns appear here after the next full run."
+        )
+        stages = history.stages(latest['run'])
+        st.dataframe(
+            pd.DataFrame({
+                'stage': ['  ' * depth + name for depth, name in zip(stages['depth'], stages['stage'])],
+                'ms': (stages['seconds'] * 1000).round(1),
+                'rows': stages['rows'].astype('Int64'),
+                'memory MiB': (stages['memory_delta'].astype(float) / 2 ** 20).round(2)
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+        st.markdown(f"Last {len(history)} runs")
+        summary = history.summary()
+        st.dataframe(
+            summary.assign(**{col: (summary[col] * 1000).round(1) for col in ['mean_seconds', 'max_seconds', 'total_seconds']})
+            .rename(columns={'mean_seconds': 'mean ms', 'max_seconds': 'max ms', 'total_seconds': 'total ms'}),
+            hide_index=True,
+            use_container_width=True
+        )
+        st.download_button(
+            "Export JSON",
+            data=history.to_json(),
+            file_name="diagnostics.json",
+            mime="application/json",
+            key="diagnostics_export",
+            use_container_width=True
+        )
 
 # Filter Controls
 def reset_filters():
     st.session_state.reset_counter += 1
+    st.session_state.filter_view = None
     st.session_state.columns_selected = False
     st.session_state.column_selected = False
 
@@ -125,24 +258,72 @@ def render_filter_controls(data):
         on_change=on_selectbox_change
     )
 
+    # Rows missing exactly the same columns, most common patterns first
+    patterns = missing_patterns(data)
+    top_patterns = patterns.table()
+    pattern_options = [tuple(patterns.missing_columns(pattern)) for pattern in top_patterns['pattern']]
+    pattern_rows = dict(zip(pattern_options, top_patterns['rows']))
+    missing_pattern = st.selectbox(
+        "Missing value pattern",
+        [()] + pattern_options,
+        format_func=lambda cols: f"{', '.join(cols)} ({pattern_rows[cols]} rows)" if cols else "",
+        help="Show the rows missing exactly these columns",
+        key=f"missing_pattern_{reset_key}"
+    )
+
     # Multi-select column options
     duplicates = False
     missing_values = False
+    link_options = {'enabled': False, 'threshold': linkage.DEFAULT_THRESHOLD, 'weights': {}}
     if st.session_state.columns_selected:
         duplicates = st.checkbox("Check for duplicates", key=f"duplicates_{reset_key}")
         missing_values = st.checkbox("Check for missing values", key=f"missing_values_{reset_key}")
+        link_options['enabled'] = st.checkbox(
+            "Link similar records",
+            help="Group rows that match across all selected columns, allowing for typos",
+            key=f"link_records_{reset_key}"
+        )
+        if link_options['enabled']:
+            link_options['threshold'] = st.slider(
+                "Link threshold", 0.0, 1.0, linkage.DEFAULT_THRESHOLD, key=f"link_threshold_{reset_key}"
+            )
+            for column in selected_columns:
+                link_options['weights'][column] = st.slider(
+                    f"Weight of {column}", 0.0, 1.0,
+                    linkage.DEFAULT_FIELDS.get(column, 0.5),
+                    key=f"link_weight_{column}_{reset_key}"
+                )
 
     # Single column selection options
     option = None
     search_value = ""
+    search_options = {'mode': 'contains', 'case_sensitive': False, 'all_columns': False}
     threshold = 0.8
+    workers = similarity.DEFAULT_WORKERS
     if st.session_state.column_selected and not st.session_state.columns_selected:
         option = st.radio("Select option", ["Search", "String similarity"], key=f"option_{reset_key}")
         
         if option == "Search":
             search_value = st.text_input("Search value", key=f"search_value_{reset_key}")
+            search_options['mode'] = st.radio(
+                "Match",
+                search.SEARCH_MODES,
+                format_func={'contains': "Contains", 'prefix': "Starts with", 'regex': "Regex"}.get,
+                horizontal=True,
+                key=f"search_mode_{reset_key}"
+            )
+            search_options['case_sensitive'] = st.checkbox("Match case", key=f"search_case_{reset_key}")
+            search_options['all_columns'] = st.checkbox("Search all columns", key=f"search_all_{reset_key}")
         elif option == "String similarity":
             threshold = st.slider("Threshold", 0.0, 1.0, 0.5, key=f"threshold_{reset_key}")
+            workers = st.number_input(
+                "Workers",
+                min_value=1,
+                max_value=similarity.DEFAULT_WORKERS,
+                value=similarity.DEFAULT_WORKERS,
+                help="Number of processes used to score large columns",
+                key=f"workers_{reset_key}"
+            )
 
     # Filter and reset buttons
     col1, col2 = st.columns([1,2])
@@ -151,163 +332,487 @@ def render_filter_controls(data):
     with col2:
         filter_button = st.button("Apply Filter", type="primary", key=f"filter_{reset_key}", use_container_width=True)
 
-    return selected_columns, selected_column, duplicates, missing_values, option, search_value, threshold, filter_button
+    return selected_columns, selected_column, missing_pattern, duplicates, missing_values, link_options, option, search_value, search_options, threshold, workers, filter_button
+
+# Missing value patterns are grouped once per data version
+def missing_patterns(data):
+    cache_key = (st.session_state.dataset_key, st.session_state.data_version)
+    if st.session_state.get('missing_patterns_key') != cache_key:
+        with instrumentation.stage('missing_patterns', len(data)):
+            st.session_state.missing_patterns = missingness.MissingPatterns(data)
+        st.session_state.missing_patterns_key = cache_key
+    return st.session_state.missing_patterns
 
-# Function to update the change log with edit history
-def update_change_log(changes, filtered_df):
-    if not changes.get("edited_rows"):
+# Summary of linked clusters: the values of their first row, cluster size and member row ids
+def linked_clusters_table(data, columns, clusters):
+    linked = clusters[clusters['cluster_size'] > 1]
+    positions = data.index.get_indexer(linked.index)
+    members = pd.Series(positions).groupby(linked['cluster'].to_numpy(), sort=True).agg(list)
+    table = data[columns].iloc[[group[0] for group in members]].reset_index(drop=True)
+    table.insert(0, 'size', [len(group) for group in members])
+    table['rows'] = [', '.join(map(str, data.index[group])) for group in members]
+    return table
+
+# Linkage results are kept per data version and settings, so paging does not recompute them
+def linked_records(data, weights, threshold):
+    cache_key = (st.session_state.dataset_key, st.session_state.data_version, tuple(weights.items()), threshold)
+    if st.session_state.get('linkage_key') != cache_key:
+        with instrumentation.stage('linkage', len(data)):
+            st.session_state.linkage_result = linkage.link_records(data, weights, threshold)
+        st.session_state.linkage_key = cache_key
+    return st.session_state.linkage_result
+
+# Write the edits from the previous run into the session data
+def apply_editor_changes(editor_key):
+    if editor_key not in st.session_state or 'editor_view' not in st.session_state:
+        return
+    edited_rows = st.session_state[editor_key].get("edited_rows")
+    if not edited_rows:
         return
-        
-    for idx, row_edits in changes.get("edited_rows", {}).items():
-        row_num = int(idx)
-        if row_num < len(filtered_df):
-            orig_idx = filtered_df.index[row_num]
-            timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-            if str(orig_idx) not in st.session_state.change_log["edited_rows"]:
-                st.session_state.change_log["edited_rows"][str(orig_idx)] = []
-            
-            # Track both old and new values
-            changes_with_history = {}
-            for col, new_val in row_edits.items():
-                old_val = filtered_df.at[orig_idx, col]
-                changes_with_history[col] = {
-                    "from": old_val,
-                    "to": new_val
-                }
-            
-            st.session_state.change_log["edited_rows"][str(orig_idx)].append({
-                "timestamp": timestamp,
-                "changes": changes_with_history
-            })
 
-# Members Tab
-def render_members_tab():
-    uploaded_data = st.file_uploader(
-        "Upload Members Data", 
-        type=["csv"], 
-        help="Upload a CSV file with members data",
-    )
+    delta = edits.editor_delta(edited_rows, st.session_state.editor_view, st.session_state.df.index)
+    commit_edits(delta, "Data editor")
+    # A fresh editor starts with an empty delta, so each batch is applied once
+    st.session_state.editor_version += 1
 
-    if uploaded_data is not None:
-        # Initialize session state for the dataframe if not already present
-        if 'df' not in st.session_state:
-            data = pd.read_csv(uploaded_data, index_col=0)
-            data = h.clean_column_names(data)
-            st.session_state.df = data
-            st.session_state.original_df = data.copy()  # Keep original for comparison
+# Apply a batch of cell edits to the session data, its indexes and the change log.
+# Labelled batches become a new version; undo and redo replay existing ones.
+def commit_edits(delta, label=None):
+    applied = edits.apply_edits(st.session_state.df, delta, st.session_state.profile)
+    if label is not None:
+        st.session_state.versions.record(applied, label)
+    st.session_state.change_log.append(applied)
+    st.session_state.search_index.update(applied)
+    st.session_state.duplicate_index.update(applied)
+    if not applied.empty:
+        st.session_state.data_version += 1
+    return applied
+
+# Move the session data to another version by replaying the batches in between.
+# Edits still pending in the data editor are committed first, so they become
+# the newest version instead of being lost; `step` moves relative to the
+# version current after that commit.
+def checkout_version(version=None, step=0):
+    apply_editor_changes(f"data_editor_{st.session_state.editor_version}")
+    versions = st.session_state.versions
+    target = versions.current + step if version is None else version
+    commit_edits(versions.jump(target))
+    # The editor is rebuilt so it shows the values of the version
+    st.session_state.editor_version += 1
+
+# Dataset Cache
+@st.cache_resource
+def get_dataset_store():
+    # One store per server process, shared by every session
+    return dataset_store.DatasetStore()
+
+def load_dataset(uploaded_data, key):
+    def parse():
+        with instrumentation.stage('parse') as record:
+            data, report = ingest.read_members_csv(uploaded_data)
+            record['rows'] = len(data)
+        data = h.clean_column_names(data)
+        with instrumentation.stage('profile', len(data)):
+            profile = profiling.profile_dataframe(data)
+        return data, {
+            'report': report,
+            'profile': profile,
+            'metrics': h.calculate_data_metrics(data, profile)
+        }
+    return get_dataset_store().get_or_load(key, parse)
+
+# Figures of the unedited data are shared through the store; after edits
+# they are rebuilt from the profile once per data version
+def quality_figures(entry, key, data, profile, version):
+    figures = entry.artifacts.get('figures') if version == 0 else None
+    if figures is None and st.session_state.get('figures_version') == (key, version):
+        figures = st.session_state.figures
+    if figures is None:
+        # Plotly is only loaded once there is data to chart
+        import visualizations as viz
+        case_analysis_df = h.analyze_text_case(data, profile=profile)
+        figures = {
+            'missing_values': viz.create_missing_values_chart(data, profile),
+            'text_case': viz.create_text_case_chart(case_analysis_df)
+        }
+        if version == 0:
+            get_dataset_store().set_artifact(key, 'figures', figures)
         else:
-            data = st.session_state.df  # Always use the edited dataframe from session state
-
-        # Use the original dataframe for metrics and visualizations
-        original_data = st.session_state.original_df
-
-        # Metric Cards (usingh original_data)
-        st.header("Data Quality Check")
-        metrics = h.calculate_data_metrics(original_data)
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric(label="Total Rows", value=metrics['total_rows'], border=True)
-        with col2:
-            st.metric(label="Unique Webmails", value=metrics['unique_webmails'], border=True)
-        with col3:
-            st.metric(label="Duplicate Webmails", value=metrics['duplicate_webmails'], border=True)
-        with col4:
-            st.metric(label="Non-Webmail Members", value=metrics['non_webmail_members'], border=True)
+            st.session_state.figures = figures
+            st.session_state.figures_version = (key, version)
+    return figures
+
+# Quality Check Header
+def render_quality_check(entry, key):
+    # Metrics and charts follow the edited data through the session profile
+    data = st.session_state.df
+    profile = st.session_state.profile
+    version = st.session_state.data_version
+
+    # Metric Cards
+    st.header("Data Quality Check")
+    with instrumentation.stage('metrics', len(data)):
+        metrics = entry.artifacts['metrics'] if version == 0 else profile.metrics()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(label="Total Rows", value=metrics['total_rows'], border=True)
+    with col2:
+        st.metric(label="Unique Webmails", value=metrics['unique_webmails'], border=True)
+    with col3:
+        st.metric(label="Duplicate Webmails", value=metrics['duplicate_webmails'], border=True)
+    with col4:
+        st.metric(label="Non-Webmail Members", value=metrics['non_webmail_members'], border=True)
+
+    with instrumentation.stage('charts', len(data)):
+        figures = quality_figures(entry, key, data, profile, version)
 
         # Missing Values Chart
-        missing_values_fig = viz.create_missing_values_chart(original_data)
-        st.plotly_chart(missing_values_fig, use_container_width=True)
+        st.plotly_chart(figures['missing_values'], use_container_width=True)
 
         # Text Case Analysis Chart
-        text_columns = ['first_name', 'middle_name', 'last_name', 'full_name']
-        case_analysis_df = h.analyze_text_case(original_data, text_columns)
-        text_case_fig = viz.create_text_case_chart(case_analysis_df)
-        st.plotly_chart(text_case_fig, use_container_width=True)
+        st.plotly_chart(figures['text_case'], use_container_width=True)
 
-        # Filter and Data Editor Section
-        filter_col, data_col = st.columns([1, 4])
+    # Missing Value Patterns
+    patterns = missing_patterns(data)
+    table = patterns.table()
+    with st.expander(f"Missing value patterns ({len(patterns)} distinct)"):
+        st.caption("Columns that are missing together in the same rows. Pick a pattern in the filter to inspect its rows.")
+        st.dataframe(
+            table.assign(share=table['share'] * 100),
+            column_config={'share': st.column_config.NumberColumn("share (%)", format="%.1f")},
+            hide_index=True,
+            use_container_width=True
+        )
 
-        with filter_col:
-            st.markdown("#### Filter")
-            selected_columns, selected_column, duplicates, missing_values, option, search_value, threshold, filter_button = render_filter_controls(data)
-        
-        # Apply filters to create a view, but keep the indices to map back to the original dataframe
-        filtered_df = data.copy()
-        
-        # Apply filters when the button is clicked (only affects filtered_df)
-        if filter_button:
-            if st.session_state.columns_selected and selected_columns:
-                conditions = {
-                    'duplicates_by_cols': (data.duplicated(subset=selected_columns, keep=False)) & (~data[selected_columns].isna().any(axis=1)), 
-                    'missing_values_by_cols': data[selected_columns].isna().any(axis=1)
-                }
-                
-                if duplicates and missing_values:
-                    mask = conditions['missing_values_by_cols'] | conditions['duplicates_by_cols']
+# Preview fixes are only worked out when asked for, so edits elsewhere never pay
+# for them; a preview is dropped once the data or the chosen rules change
+def standardization_fixes(data, rules, refresh=False):
+    cache_key = (st.session_state.dataset_key, st.session_state.data_version, tuple(rules))
+    if refresh and st.session_state.get('standardization_key') != cache_key:
+        with instrumentation.stage('standardize', len(data)):
+            fixes = standardize.propose_fixes(data, rules)
+            st.session_state.standardization_result = (
+                fixes, standardize.summarize_fixes(fixes), standardize.invalid_webmails(data)
+            )
+        st.session_state.standardization_key = cache_key
+    if st.session_state.get('standardization_key') != cache_key:
+        return None
+    return st.session_state.standardization_result
+
+# Bulk Cleanup Section
+# Choosing rules and previewing rerun only this fragment; applying fixes reruns the whole app
+@st.fragment
+def render_standardization():
+    data = st.session_state.df
+    with st.expander("Bulk cleanup"):
+        rules = st.multiselect(
+            "Fixes",
+            list(standardize.RULES),
+            default=list(standardize.RULES),
+            format_func=standardize.RULES.get,
+            help="Fixes to preview and apply to the whole dataset",
+            key="standardize_rules"
+        )
+        preview = st.button("Preview fixes", key="standardize_preview")
+        result = standardization_fixes(data, rules, refresh=preview)
+
+        if result is None:
+            st.caption("Click Preview fixes to list the cells the selected fixes would change.")
+        else:
+            fixes, summary, invalid = result
+            if fixes.empty:
+                st.caption("The selected fixes do not change any cell.")
+            else:
+                st.caption(
+                    f"{len(fixes)} cells in {fixes['position'].nunique()} rows would change. "
+                    "Each distinct change is listed once with the number of cells it fixes."
+                )
+                st.dataframe(summary, hide_index=True, use_container_width=True)
+                if st.button(f"Apply {len(fixes)} fixes", type="primary", key="standardize_apply"):
+                    # Edits still pending in the data editor go first, and the
+                    # fixes are worked out again if those edits changed the data
+                    apply_editor_changes(f"data_editor_{st.session_state.editor_version}")
+                    fixes = standardization_fixes(st.session_state.df, rules, refresh=True)[0]
+                    commit_edits(fixes, "Bulk cleanup")
+                    # The editor is rebuilt so it shows the fixed values
+                    st.session_state.editor_version += 1
+                    st.rerun()
+
+            if not invalid.empty:
+                st.warning(f"{len(invalid)} webmails do not look like PUP webmails, even after lowercasing.")
+                st.dataframe(invalid.drop(columns=['position']), hide_index=True, use_container_width=True)
+
+# Filter and Data Editor Section
+# Widgets in this fragment rerun only the fragment, so filtering and paging
+# skip the metrics and charts above it
+@st.fragment
+def render_data_section():
+    with diagnostics_run('fragment'):
+        data_section()
+
+def data_section():
+    version = st.session_state.data_version
+    with instrumentation.stage('apply_edits'):
+        apply_editor_changes(f"data_editor_{st.session_state.editor_version}")
+    data = st.session_state.df  # Always use the edited dataframe from session state
+
+    filter_col, data_col = st.columns([1, 4])
+
+    with filter_col:
+        st.markdown("#### Filter")
+        selected_columns, selected_column, missing_pattern, duplicates, missing_values, link_options, option, search_value, search_options, threshold, workers, filter_button = render_filter_controls(data)
+    
+    # Filters select rows of the session data by position; nothing is copied.
+    # The last applied filter stays active until it is reset, so paging keeps it.
+    view = st.session_state.get('filter_view')
+    if view is None:
+        view = views.RowView.all(data)
+    
+    # Apply filters when the button is clicked (only affects the view)
+    if filter_button:
+        with instrumentation.stage('filter', len(data)):
+            view = views.RowView.all(data)
+            if missing_pattern:
+                patterns = missing_patterns(data)
+                pattern = patterns.find(missing_pattern)
+                view = views.RowView(patterns.rows(pattern) if pattern is not None else np.array([], dtype='int64'))
+            elif st.session_state.columns_selected and selected_columns:
+                # Masks come from row keys cached per column set and kept up to date by edits
+                duplicate_index = st.session_state.duplicate_index
+                missing_mask = duplicate_index.missing_mask(selected_columns)
+
+                if link_options['enabled']:
+                    # Members of each linked cluster are listed together, largest clusters first
+                    clusters, linked_pairs_df = linked_records(data, link_options['weights'], link_options['threshold'])
+                    linked = clusters['cluster_size'].to_numpy() > 1
+                    positions = np.flatnonzero(linked)
+                    view = views.RowView(positions[np.argsort(clusters['cluster'].to_numpy()[linked], kind='stable')])
+                    table = linked_clusters_table(data, selected_columns, clusters)
+                    with st.expander(f"Linked clusters found ({len(table)})"):
+                        st.dataframe(table, hide_index=True)
+                        st.dataframe(linked_pairs_df, hide_index=True)
                 elif duplicates:
-                    mask = conditions['duplicates_by_cols']
+                    # Members of each duplicate group are listed together, largest groups first
+                    groups = duplicate_index.groups(selected_columns)
+                    clustered = [np.concatenate(groups['positions'].tolist())] if len(groups) else []
+                    if missing_values:
+                        clustered.append(np.flatnonzero(missing_mask))
+                    view = views.RowView(np.concatenate(clustered) if clustered else np.array([], dtype='int64'))
+                    with st.expander(f"Duplicate groups found ({len(groups)})"):
+                        st.dataframe(h.duplicate_groups_table(data, selected_columns, groups), hide_index=True)
                 elif missing_values:
-                    mask = conditions['missing_values_by_cols']
-                else:
-                    mask = pd.Series(True, index=data.index)
-                
-                filtered_df = data[mask].copy()
+                    view = views.RowView.from_mask(missing_mask)
+            
             elif st.session_state.column_selected and selected_column:
                 if option == "Search" and search_value:
-                    filtered_df = data[data[selected_column].str.contains(search_value, na=False)]
+                    try:
+                        mask = st.session_state.search_index.search(
+                            search_value,
+                            None if search_options['all_columns'] else [selected_column],
+                            search_options['mode'],
+                            search_options['case_sensitive']
+                        )
+                        view = views.RowView.from_mask(mask)
+                    except ValueError as e:
+                        st.error(f"Invalid search: {e}")
                 elif option == "String similarity":
-                    similar_pairs_df, matching_rows = h.find_similar_strings_with_rows(data, selected_column, threshold)
+                    similar_pairs_df, matching_rows = h.find_similar_strings_with_rows(data, selected_column, threshold, workers)
                     if not matching_rows.empty:
-                        filtered_df = matching_rows
+                        view = views.RowView.from_labels(data, matching_rows.index)
                         with st.expander("Similar pairs found"):
                             st.dataframe(similar_pairs_df)
+            st.session_state.filter_view = view
+            st.session_state.editor_page = 1
 
-        # Display the data editor with the filtered dataframe
-        with data_col:
-            st.markdown("#### Interactive Data Inspection")
-            editor_key = "data_editor_main"
-            
-            # Check if we need to save changes from previous edits before showing new filtered data
-            if editor_key in st.session_state and 'last_edited_df' in st.session_state:
-                changes = st.session_state[editor_key]
-                
-                if changes.get("edited_rows"):
-                    update_change_log(changes, st.session_state.last_edited_df)
-                
-                if changes.get("edited_rows"):
-                    for idx, row_edits in changes.get("edited_rows", {}).items():
-                        idx = int(idx)
-                        if idx < len(st.session_state.last_edited_df):
-                            orig_idx = st.session_state.last_edited_df.index[idx]
-                            for col, val in row_edits.items():
-                                st.session_state.df.at[orig_idx, col] = val
-                    
-                    data = st.session_state.df
-            
-            st.session_state.last_edited_df = filtered_df.copy()
-            edited_df = editable_dataframe(filtered_df, editor_key)
-            show_download_and_history(st.session_state.df)
+    # Display the data editor with the rows of the view
+    with data_col:
+        st.markdown("#### Interactive Data Inspection")
+
+        # Only the visible page is sorted into place and sent to the browser
+        sort_col, order_col, size_col, page_col = st.columns([3, 2, 2, 2])
+        with sort_col:
+            sort_by = st.selectbox(
+                "Sort by",
+                [""] + list(data.columns),
+                format_func=lambda col: col or "Original order",
+                key="editor_sort"
+            )
+        with order_col:
+            descending = st.toggle("Descending", key="editor_descending")
+        with size_col:
+            page_size = st.selectbox(
+                "Rows per page",
+                views.PAGE_SIZES,
+                index=views.PAGE_SIZES.index(views.DEFAULT_PAGE_SIZE),
+                key="editor_page_size"
+            )
+        with page_col:
+            page = st.number_input("Page", min_value=1, value=1, key="editor_page")
+
+        if sort_by:
+            view = view.sort(data, sort_by, ascending=not descending)
+        page_view, page_count = view.page(page, page_size)
+        page = min(page, page_count)
+        first_row = (page - 1) * page_size
+        st.caption(
+            f"Page {page} of {page_count}, rows {min(first_row + 1, len(view))}-"
+            f"{first_row + len(page_view)} of {len(view)}"
+        )
+
+        # Edits on the page map back to the data through this view
+        st.session_state.editor_view = page_view
+        with instrumentation.stage('editor', len(page_view)):
+            edited_df = editable_dataframe(page_view.materialize(data), f"data_editor_{st.session_state.editor_version}")
+        show_download_and_history(st.session_state.df, view)
+
+    # Edits applied by a fragment rerun change the metrics and charts, so refresh the whole page
+    if st.session_state.data_version != version:
+        st.rerun()
+
+# Members Tab
+def render_members_tab():
+    uploaded_data = st.file_uploader(
+        "Upload Members Data", 
+        type=["csv"], 
+        help="Upload a CSV file with members data",
+    )
+
+    if uploaded_data is not None:
+        # The shared entry holds the original data and everything computed from it
+        key = dataset_store.dataset_key(uploaded_data.getvalue())
+        entry = load_dataset(uploaded_data, key)
+
+        # Start a fresh editable copy when this session sees a new upload
+        if st.session_state.get('dataset_key') != key:
+            st.session_state.dataset_key = key
+            st.session_state.df = entry.frame.copy()
+            # The session keeps its own profile, updated cell by cell as edits come in
+            st.session_state.profile = copy.deepcopy(entry.artifacts['profile'])
+            st.session_state.data_version = 0
+            st.session_state.change_log = edits.ChangeLog()
+            st.session_state.versions = edits.VersionHistory()
+            st.session_state.filter_view = None
+            # Column indexes are built on the first search and follow later edits
+            st.session_state.search_index = search.SearchIndex(st.session_state.df)
+            st.session_state.duplicate_index = dup.DuplicateIndex(st.session_state.df)
+
+        with instrumentation.stage('apply_edits'):
+            apply_editor_changes(f"data_editor_{st.session_state.editor_version}")
+
+        report = entry.artifacts['report']
+        st.caption(
+            f"Loaded {report['rows']} rows in {report['chunks']} blocks using "
+            f"{ingest.format_bytes(report['memory_bytes'])} "
+            f"({ingest.format_bytes(report['saved_bytes'])} saved by compact dtypes)"
+        )
+
+        render_quality_check(entry, key)
+        render_standardization()
+        render_data_section()
+
+# COR records are parsed once per set of uploaded files
+def cor_records(uploaded_cors):
+    cache_key = tuple(f.file_id for f in uploaded_cors)
+    if st.session_state.get('cor_key') != cache_key:
+        with instrumentation.stage('cor_parse', len(uploaded_cors)):
+            st.session_state.cor_result = cor.read_cor_files([(f.name, f.getvalue()) for f in uploaded_cors])
+        st.session_state.cor_key = cache_key
+    return st.session_state.cor_result
+
+# The member key index is rebuilt only when the members data changes
+def member_key_index(data):
+    cache_key = (st.session_state.dataset_key, st.session_state.data_version)
+    if st.session_state.get('member_key_index_key') != cache_key:
+        with instrumentation.stage('cor_index', len(data)):
+            st.session_state.member_key_index = cor.MemberKeyIndex(data)
+        st.session_state.member_key_index_key = cache_key
+    return st.session_state.member_key_index
+
+def cor_table(data, matches, columns):
+    # COR fields next to the row id and columns of the member each COR matched
+    members = data[columns].iloc[matches['position'].to_numpy()]
+    table = matches.drop(columns=['position']).rename(
+        columns={field: f"cor_{field}" for field in cor.COR_FIELDS}
+    ).reset_index(drop=True)
+    table.insert(1, 'member_row', members.index)
+    return pd.concat([table, members.reset_index(drop=True)], axis=1)
 
 # COR Tab
 def render_cor_tab():
-    st.file_uploader(
+    uploaded_cors = st.file_uploader(
         "Upload COR Data", 
-        type=["csv"], 
-        help="Upload a CSV file with Certificate of Registrations"
+        type=["csv", "txt"], 
+        accept_multiple_files=True,
+        help="Upload Certificate of Registration exports (CSV or text); select as many files as needed"
+    )
+
+    if not uploaded_cors:
+        return
+    if st.session_state.get('df') is None:
+        st.info("Upload the members data in the Members Data Overview tab to verify these CORs.")
+        return
+
+    data = st.session_state.df
+    records, errors = cor_records(uploaded_cors)
+    if not errors.empty:
+        with st.expander(f"{len(errors)} files could not be read"):
+            st.dataframe(errors, hide_index=True)
+
+    with instrumentation.stage('cor_match', len(records)):
+        matches = cor.match_cors(records, member_key_index(data))
+    missing = cor.members_without_cor(matches, len(data))
+    counts = matches['status'].value_counts()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(label="Enrolled", value=int(counts.get('enrolled', 0)), border=True)
+    with col2:
+        st.metric(label="Conflicts", value=int(counts.get('conflict', 0)), border=True)
+    with col3:
+        st.metric(label="Unmatched CORs", value=int(counts.get('unmatched', 0)), border=True)
+    with col4:
+        st.metric(label="Members Without COR", value=len(missing), border=True)
+
+    columns = [col for col in ['full_name', 'student_number', 'pup_webmail', 'course'] if col in data.columns]
+    enrolled_tab, conflict_tab, unmatched_tab, missing_tab = st.tabs(
+        ["Enrolled", "Conflicts", "Unmatched CORs", "Members Without COR"]
     )
+    with enrolled_tab:
+        enrolled = matches[matches['status'] == 'enrolled']
+        st.dataframe(cor_table(data, enrolled, columns).drop(columns=['status', 'reason']), hide_index=True)
+    with conflict_tab:
+        conflicts = matches[matches['status'] == 'conflict']
+        st.dataframe(cor_table(data, conflicts, columns).drop(columns=['status']), hide_index=True)
+    with unmatched_tab:
+        unmatched = matches[matches['status'] == 'unmatched']
+        st.dataframe(
+            unmatched[['source'] + cor.COR_FIELDS].reset_index(drop=True),
+            hide_index=True
+        )
+    with missing_tab:
+        st.dataframe(data[columns].iloc[missing], use_container_width=True)
 
 # Main Application
 def main():
     setup_page()
     initialize_session_state()
+    diagnostics = st.sidebar.toggle(
+        "Diagnostics",
+        help="Record the time, rows and memory of each stage of every run",
+        key="diagnostics_enabled"
+    )
     
-    members_tab, cor_tab = st.tabs(["Members Data Overview", "Extract COR"])
-    
-    with members_tab:
-        render_members_tab()
-    
-    with cor_tab:
-        render_cor_tab()
+    with diagnostics_run('app'):
+        members_tab, cor_tab = st.tabs(["Members Data Overview", "Extract COR"])
+        
+        with members_tab:
+            render_members_tab()
+        
+        with cor_tab:
+            render_cor_tab()
+
+    if diagnostics:
+        render_diagnostics_panel()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
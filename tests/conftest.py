@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+# The app modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import helpers as h  # noqa: E402
+import ingest  # noqa: E402
+from benchmarks.generate import generate_members  # noqa: E402
+
+
+@pytest.fixture
+def members():
+    """Generated member data, loaded and cleaned like an upload."""
+    csv = generate_members(600, seed=0).to_csv().encode('utf-8')
+    data, _ = ingest.read_members_csv(csv)
+    return h.clean_column_names(data)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+import cor
+
+
+def members_frame():
+    return pd.DataFrame({
+        'student_number': ["2021-00001-MN-0", "2021-00002-MN-0", "2021-00003-MN-0", "2021-00003-MN-0", None],
+        'pup_webmail': ["a@iskolarngbayan.pup.edu.ph", "b@iskolarngbayan.pup.edu.ph", None, None, "e@iskolarngbayan.pup.edu.ph"],
+        'full_name': ["A", "B", "C", "C again", "E"]
+    }, index=[10, 11, 12, 13, 14])
+
+
+def test_parse_csv_with_aliases():
+    content = b"Student No.,Name,Email Address,Program\n2021 00001 mn 0,A,A@IskolarNgBayan.pup.edu.ph,BSIT\n,,,\n"
+    records = cor.parse_cor("batch.csv", content)
+    assert records == [{
+        'source': "batch.csv", 'student_number': "2021 00001 mn 0", 'pup_webmail': "A@IskolarNgBayan.pup.edu.ph",
+        'name': "A", 'course': "BSIT"
+    }]
+
+
+def test_parse_text_export():
+    content = b"Certificate of Registration\nStudent No: 2021-00002-MN-0\nName: DELA CRUZ, JUAN\nCourse: BSCS\n"
+    record = cor.parse_cor("cor.txt", content)[0]
+    assert record['student_number'] == "2021-00002-MN-0"
+    assert record['pup_webmail'] is None
+    assert record['name'] == "DELA CRUZ, JUAN"
+    assert record['course'] == "BSCS"
+
+
+def test_read_files_collects_errors():
+    records, errors = cor.read_cor_files([
+        ("one.txt", b"Student No: 2021 00001 mn 0"),
+        ("junk.txt", b"hello"),
+        ("two.csv", b"webmail\n B@iskolarngbayan.pup.edu.ph \n")
+    ])
+    assert records['source'].tolist() == ["one.txt", "two.csv"]
+    assert records['student_number'].tolist()[0] == "2021-00001-MN-0"
+    assert records['pup_webmail'].tolist()[1] == "b@iskolarngbayan.pup.edu.ph"
+    assert errors['file'].tolist() == ["junk.txt"]
+
+
+def test_normalize_student_numbers():
+    values = pd.Series(["2021-00001-mn-0", "2021 00001 MN 0", "202100001MN0", "not a number", None])
+    assert cor.normalize_student_numbers(values).tolist()[:3] == ["2021-00001-MN-0"] * 3
+    assert cor.normalize_student_numbers(values).isna().tolist()[3:] == [True, True]
+
+
+def test_match_statuses():
+    records = pd.DataFrame({
+        'source': list("abcdef"),
+        'student_number': ["2021-00001-MN-0", "2021-00002-MN-0", None, "2021-00003-MN-0", "2030-99999-MN-0", "2021-00001-MN-0"],
+        'pup_webmail': [None, "e@iskolarngbayan.pup.edu.ph", "e@iskolarngbayan.pup.edu.ph", None, None, None],
+        'name': None,
+        'course': None
+    })
+    matches = cor.match_cors(records, cor.MemberKeyIndex(members_frame()))
+
+    assert matches['position'].tolist() == [0, 1, 4, 2, -1, 0]
+    assert matches['status'].tolist() == ['conflict', 'conflict', 'enrolled', 'conflict', 'unmatched', 'conflict']
+    assert "several CORs match this member" in matches['reason'][0]
+    assert "different members" in matches['reason'][1]
+    assert "listed more than once" in matches['reason'][3]
+    assert matches['matched_by'].tolist()[2] == 'pup_webmail'
+
+
+def test_enrolled_and_members_without_cor():
+    records = pd.DataFrame({
+        'source': ["a"], 'student_number': ["2021-00002-MN-0"],
+        'pup_webmail': ["b@iskolarngbayan.pup.edu.ph"], 'name': None, 'course': None
+    })
+    matches = cor.match_cors(records, cor.MemberKeyIndex(members_frame()))
+    assert matches['status'].tolist() == ['enrolled']
+    assert matches['matched_by'].tolist() == ['student_number, pup_webmail']
+    assert cor.members_without_cor(matches, 5).tolist() == [0, 2, 3, 4]
+
+
+def test_index_without_key_columns():
+    index = cor.MemberKeyIndex(pd.DataFrame({'name': ["A", "B"]}))
+    positions, counts = index.lookup('student_number', pd.Series(["2021-00001-MN-0"]))
+    assert positions.tolist() == [-1] and counts.tolist() == [0]
+    assert np.array_equal(cor.members_without_cor(cor.match_cors(
+        pd.DataFrame(columns=['source'] + cor.COR_FIELDS), index), 2), [0, 1])
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+import dataset_store
+
+
+def frame(seed, rows=1000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'name': pd.array([f"member {i}" for i in rng.integers(0, 10**6, rows)], dtype='string[pyarrow]'),
+        'age': rng.integers(18, 30, rows)
+    })
+
+
+def test_dataset_key_is_content_hash():
+    assert dataset_store.dataset_key(b"a,b\n") == dataset_store.dataset_key(b"a,b\n")
+    assert dataset_store.dataset_key(b"a,b\n") != dataset_store.dataset_key(b"a,c\n")
+
+
+def test_evicted_entries_reload_from_disk(tmp_path):
+    store = dataset_store.DatasetStore(memory_budget_mb=0, spill_dir=str(tmp_path))
+    first = frame(0)
+    store.put('a', first, {'report': {'rows': 1000}})
+    store.put('b', frame(1))
+
+    assert store.stats()['entries'] == 1
+    entry = store.get('a')
+    pd.testing.assert_frame_equal(entry.frame, first)
+    assert entry.artifacts == {'report': {'rows': 1000}}
+    assert store.get('missing') is None
+
+
+def test_get_or_load_parses_once(tmp_path):
+    store = dataset_store.DatasetStore(spill_dir=str(tmp_path))
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return frame(0), {}
+
+    store.get_or_load('a', loader)
+    store.get_or_load('a', loader)
+    assert len(calls) == 1
+
+
+def test_failed_spill_drops_entry(tmp_path):
+    store = dataset_store.DatasetStore(memory_budget_mb=0, spill_dir=str(tmp_path))
+    store.put('a', pd.DataFrame([[1, 2]], columns=['x', 'x']))  # Parquet rejects repeated names
+    store.put('b', frame(1))
+
+    assert store.get('a') is None
+    assert store.get('b') is not None
+    assert store.stats()['memory_bytes'] == store.get('b').size
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_disk_budget_removes_oldest_files(tmp_path):
+    store = dataset_store.DatasetStore(memory_budget_mb=0, disk_budget_mb=0, spill_dir=str(tmp_path))
+    store.put('a', frame(0))
+    store.put('b', frame(1))
+    assert store.get('a') is None
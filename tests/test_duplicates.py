@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+import duplicates as dup
+
+
+def sample_frame(rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    first = np.array(["Juan", "Maria", "Ana", "Jose", None], dtype=object)
+    last = np.array(["Cruz", "Santos", "Reyes", None], dtype=object)
+    return pd.DataFrame({
+        'first_name': first[rng.integers(0, len(first), rows)],
+        'last_name': last[rng.integers(0, len(last), rows)],
+        'pup_webmail': [f"m{i}@iskolarngbayan.pup.edu.ph" for i in rng.integers(0, rows // 2, rows)]
+    })
+
+
+def expected_groups(df, columns):
+    complete = df.dropna(subset=columns)
+    groups = [
+        np.flatnonzero(df.index.isin(rows)) for _, rows in complete.groupby(columns).groups.items()
+        if len(rows) > 1
+    ]
+    return sorted(tuple(group.tolist()) for group in groups)
+
+
+def check(index, df, columns):
+    expected_mask = df.duplicated(subset=columns, keep=False).to_numpy() & df[columns].notna().all(axis=1).to_numpy()
+    assert (index.duplicate_mask(columns) == expected_mask).all()
+    assert (index.missing_mask(columns) == df[columns].isna().any(axis=1).to_numpy()).all()
+    groups = index.groups(columns)
+    assert sorted(tuple(positions.tolist()) for positions in groups['positions']) == expected_groups(df, columns)
+    assert groups['size'].is_monotonic_decreasing
+
+
+def test_matches_pandas():
+    df = sample_frame()
+    index = dup.DuplicateIndex(df)
+    for columns in (['pup_webmail'], ['first_name', 'last_name']):
+        check(index, df, columns)
+
+
+def test_updates_match_rebuild():
+    df = sample_frame()
+    index = dup.DuplicateIndex(df)
+    for columns in (['pup_webmail'], ['first_name', 'last_name'], ['last_name']):
+        index.duplicate_mask(columns)  # Caches the keys before the edits
+
+    rng = np.random.default_rng(1)
+    changes = []
+    for column, values in [
+        ('first_name', ["Zed", None, "Juan", "New"]),
+        ('last_name', ["Cruz", "Other", None]),
+        ('pup_webmail', ["new@iskolarngbayan.pup.edu.ph", None, "m1@iskolarngbayan.pup.edu.ph"])
+    ]:
+        positions = rng.choice(len(df), 120, replace=False)
+        new = [values[i % len(values)] for i in range(len(positions))]
+        df.iloc[positions, df.columns.get_loc(column)] = new
+        changes.append(pd.DataFrame({'position': positions, 'column': column, 'new': new}))
+    index.update(pd.concat(changes, ignore_index=True))
+
+    for columns in (['pup_webmail'], ['first_name', 'last_name'], ['last_name'], ['first_name']):
+        check(index, df, columns)
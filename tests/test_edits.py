@@ -0,0 +1,86 @@
+import pandas as pd
+
+import edits
+import views
+
+
+def delta(df, cells):
+    frame = pd.DataFrame(cells, columns=['position', 'column', 'new'])
+    frame.insert(0, 'row_id', df.index[frame['position']])
+    return frame
+
+
+def test_editor_delta_maps_view_rows(members):
+    view = views.RowView.from_mask((members['course'] == "BSIT").to_numpy())
+    page, _ = view.page(2, page_size=10)
+    result = edits.editor_delta({"0": {'first_name': "A"}, 3: {'course': "B", 'section': None}}, page, members.index)
+
+    assert result['position'].tolist() == [page.positions[0], page.positions[3], page.positions[3]]
+    assert result['row_id'].tolist() == members.index[result['position']].tolist()
+    assert result[['column', 'new']].values.tolist() == [['first_name', "A"], ['course', "B"], ['section', None]]
+
+
+def test_apply_edits_skips_unchanged_cells(members):
+    original = members.copy()
+    applied = edits.apply_edits(members, delta(members, [
+        (0, 'first_name', "Changed"),
+        (1, 'first_name', members['first_name'].iloc[1]),
+        (2, 'course', "BSNEW"),
+        (3, 'missing_column', "x")
+    ]))
+
+    assert applied[['position', 'column', 'new']].values.tolist() == [[0, 'first_name', "Changed"], [2, 'course', "BSNEW"]]
+    assert applied['old'].tolist() == [original['first_name'].iloc[0], original['course'].iloc[2]]
+    assert members['first_name'].iloc[0] == "Changed"
+    assert members['course'].iloc[2] == "BSNEW"
+
+
+def test_change_log_newest_first(members):
+    log = edits.ChangeLog()
+    log.append(edits.apply_edits(members, delta(members, [(0, 'first_name', "First")])))
+    log.append(edits.apply_edits(members, delta(members, [(1, 'last_name', "Second")])))
+
+    frame = log.to_frame()
+    assert len(log) == 2
+    assert frame['new'].tolist() == ["Second", "First"]
+    assert log.to_frame(columns=['first_name'])['new'].tolist() == ["First"]
+    assert log.to_frame(search="secON")['new'].tolist() == ["Second"]
+
+
+def test_versions_replay_to_every_version(members):
+    history = edits.VersionHistory()
+    snapshots = [members.copy()]
+    for i, cells in enumerate([
+        [(0, 'first_name', "One"), (1, 'course', "BSNEW")],
+        [(0, 'first_name', "Two"), (2, 'section', None)],
+        [(1, 'course', "BSIT"), (3, 'last_name', "Three")]
+    ]):
+        history.record(edits.apply_edits(members, delta(members, cells)), f"Batch {i}")
+        snapshots.append(members.copy())
+
+    for version in [0, 2, 1, 3, 0, 3]:
+        edits.apply_edits(members, history.jump(version))
+        assert history.current == version
+        pd.testing.assert_frame_equal(members.astype(object), snapshots[version].astype(object))
+
+
+def test_undo_redo_and_branching(members):
+    history = edits.VersionHistory()
+    history.record(edits.apply_edits(members, delta(members, [(0, 'first_name', "One")])), "First")
+    history.record(edits.apply_edits(members, delta(members, [(1, 'first_name', "Two")])), "Second")
+    assert history.positions().tolist() == [0, 1]
+
+    edits.apply_edits(members, history.undo())
+    assert history.can_redo and members['first_name'].iloc[1] != "Two"
+    assert history.positions().tolist() == [0]
+
+    history.record(edits.apply_edits(members, delta(members, [(2, 'first_name', "Three")])), "Third")
+    assert len(history) == 2 and not history.can_redo
+    assert history.to_frame()['label'].tolist() == ["Uploaded data", "First", "Third"]
+    assert history.jump(10).empty and history.current == 2
+
+
+def test_paginate_clamps_pages(members):
+    page, count = edits.paginate(members, 100, page_size=250)
+    assert count == 3
+    assert page.index.tolist() == members.index[500:].tolist()
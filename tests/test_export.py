@@ -0,0 +1,55 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import export
+
+
+def sample_frame():
+    df = pd.DataFrame({
+        'first_name': pd.array(["Ana", "Juan", None], dtype='string[pyarrow]'),
+        'course': pd.Categorical(["BSIT", "BSCS", "BSIT"]),
+        'age': np.array([18, 19, 20], dtype='int8'),
+        'notes': ["x", 1, None]
+    }, index=[10, 11, 12])
+    return df
+
+
+def test_csv_chunks_match_to_csv():
+    df = sample_frame()
+    chunks = list(export.iter_csv(df, chunk_rows=2))
+    assert len(chunks) == 3
+    assert b''.join(chunks) == df.to_csv(index=False).encode('utf-8')
+    assert export.export_bytes(df, 'csv') == b''.join(chunks)
+
+
+def test_export_frame_selects_rows_and_renames():
+    df = sample_frame()
+    rows = export.export_frame(df, [2, 0])
+    assert rows.index.tolist() == [12, 10]
+    assert rows.columns.tolist() == ['First Name', 'Course', 'Age', 'Notes']
+    assert df.columns.tolist() == ['first_name', 'course', 'age', 'notes']
+
+
+def test_parquet_keeps_mixed_columns():
+    data = export.export_bytes(sample_frame(), 'parquet')
+    loaded = pd.read_parquet(io.BytesIO(data))
+    assert loaded['notes'].tolist() == ["x", "1", None]
+    assert loaded['age'].tolist() == [18, 19, 20]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        export.export_bytes(sample_frame(), 'json')
+
+
+def test_cache_rebuilds_after_data_changes():
+    df = sample_frame()
+    cache = export.ExportCache()
+    first = cache.build(df, ('key', 0), 'csv')
+    assert cache.get(('key', 0), 'csv') is first
+    assert cache.get(('key', 0), 'csv', [0]) is None
+    assert cache.get(('key', 1), 'csv') is None
+    assert cache.get(('key', 0), 'csv') is None
@@ -0,0 +1,73 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+
+
+def sample_csv(rows=200):
+    lines = ["id,name,course,age,score"]
+    for i in range(rows):
+        lines.append(f"{i},Member {i},{['BSIT', 'BSCS'][i % 2]},{18 + i % 5},{i / 4}")
+    return "\n".join(lines).encode()
+
+
+def test_matches_read_csv():
+    data = sample_csv()
+    df, report = ingest.read_members_csv(data, block_size=1024)
+    expected = pd.read_csv(io.BytesIO(data), index_col=0)
+
+    assert report['chunks'] > 1
+    assert report['rows'] == len(expected)
+    assert df.index.tolist() == expected.index.tolist()
+    for column in expected.columns:
+        assert df[column].astype(object).tolist() == expected[column].astype(object).tolist()
+
+
+def test_compact_dtypes():
+    df, report = ingest.read_members_csv(sample_csv())
+    assert isinstance(df['course'].dtype, pd.CategoricalDtype)
+    assert df['name'].dtype == 'string[pyarrow]'
+    assert df['age'].dtype == np.int8
+    assert df['score'].dtype == np.float64
+    assert report['dtypes'] == {'name': 'string', 'course': 'categorical', 'age': 'numeric', 'score': 'numeric'}
+    assert report['saved_bytes'] > 0
+
+
+def test_categorical_columns_option():
+    df, _ = ingest.read_members_csv(sample_csv(), categorical_columns=['name'])
+    assert isinstance(df['name'].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize('header', ["id,a,a,b", "id,a,a,a.1", "id,a,a.1,a", "id,b,a,a,a.2,a"])
+def test_repeated_headers_match_read_csv(header):
+    data = (header + "\n" + ",".join(str(i) for i in range(header.count(',') + 1)) + "\n").encode()
+    df, _ = ingest.read_members_csv(data)
+    assert df.columns.tolist() == pd.read_csv(io.BytesIO(data), index_col=0).columns.tolist()
+
+
+def test_index_only_file():
+    df, report = ingest.read_members_csv(b"id\n1\n2\n")
+    assert df.shape == (2, 0)
+    assert df.columns.dtype == object
+    assert report['columns'] == 0
+
+
+def test_assign_cells_widens_dtypes():
+    df, _ = ingest.read_members_csv(sample_csv())
+    ingest.assign_cells(df, [0, 1], 'course', ["BSNEW", None])
+    ingest.assign_cells(df, [0], 'age', [1000])
+    ingest.assign_cell(df, 2, 'name', "Changed")
+
+    assert df['course'].iloc[0] == "BSNEW"
+    assert pd.isna(df['course'].iloc[1])
+    assert isinstance(df['course'].dtype, pd.CategoricalDtype)
+    assert df['age'].iloc[0] == 1000
+    assert df.loc[2, 'name'] == "Changed"
+
+
+def test_format_bytes():
+    assert ingest.format_bytes(512) == "512 B"
+    assert ingest.format_bytes(1536) == "1.5 KB"
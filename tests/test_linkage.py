@@ -0,0 +1,63 @@
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+import linkage
+
+
+def brute_force_score(norms, weights, i, j, exact_fields):
+    total = score = 0.0
+    for field, weight in weights.items():
+        a, b = norms[field][i], norms[field][j]
+        if not (a and b):
+            continue
+        total += weight
+        # SequenceMatcher is not symmetric; linkage compares the pair in sorted order
+        score += weight * (float(a == b) if field in exact_fields else SequenceMatcher(None, *sorted((a, b))).ratio())
+    return score / total if total else None
+
+
+def test_scores_match_brute_force(members):
+    sample = members.iloc[:150]
+    weights = linkage.DEFAULT_FIELDS
+    norms = {
+        field: np.array([linkage.normalize_field(value) for value in sample[field]], dtype=object)
+        for field in weights
+    }
+    first, second = np.triu_indices(len(sample), k=1)
+    for threshold in (0.5, 0.8):
+        pairs = linkage.score_row_pairs(norms, weights, first, second, threshold, linkage.EXACT_FIELDS)
+        found = {(i, j): s for i, j, s in zip(pairs['first'], pairs['second'], pairs['score'])}
+        expected = {}
+        for i, j in zip(first.tolist(), second.tolist()):
+            score = brute_force_score(norms, weights, i, j, linkage.EXACT_FIELDS)
+            if score is not None and score >= threshold - 1e-9:
+                expected[(i, j)] = score
+        assert found.keys() == expected.keys()
+        assert all(abs(found[pair] - expected[pair]) < 1e-9 for pair in found)
+
+
+def test_clusters_are_connected_components():
+    first = np.array([0, 2, 5, 6])
+    second = np.array([1, 3, 6, 7])
+    cluster = linkage.cluster_rows(9, first, second)
+    assert cluster[5] == cluster[6] == cluster[7] == 0  # Largest cluster first
+    assert cluster[0] == cluster[1] == 1 and cluster[2] == cluster[3] == 2
+    assert len(set(cluster.tolist())) == 5
+
+
+def test_links_repeated_applications(members):
+    clusters, pairs = linkage.link_records(members)
+    repeated = members.duplicated(subset=['pup_webmail', 'full_name'], keep=False)
+    repeated &= members[['pup_webmail', 'full_name']].notna().all(axis=1)
+    assert repeated.any()
+    assert (clusters.loc[repeated, 'cluster_size'] > 1).all()
+    assert pairs['score'].is_monotonic_decreasing
+    assert set(pairs['row1']).union(pairs['row2']) <= set(members.index)
+
+
+def test_normalize_field():
+    assert linkage.normalize_field(" Juan.Cruz@iskolarngbayan.pup.edu.ph") == "juancruz"
+    assert linkage.normalize_field(None) == ""
+    assert linkage.normalize_field(pd.NA) == ""
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+import missingness
+
+
+def sample_frame(rows=500, columns=70, seed=0):
+    rng = np.random.default_rng(seed)
+    data = rng.random((rows, columns))
+    data[rng.random((rows, columns)) < 0.05] = np.nan
+    data[rng.random(rows) < 0.3, 10:20] = np.nan  # A skipped form section
+    return pd.DataFrame(data, columns=[f"c{j}" for j in range(columns)])
+
+
+def test_patterns_match_row_masks():
+    df = sample_frame()
+    patterns = missingness.MissingPatterns(df)
+    masks = [tuple(row) for row in df.isna().to_numpy()]
+    expected = pd.Series(masks).value_counts()
+
+    assert sorted(patterns.counts.tolist(), reverse=True) == patterns.counts.tolist()
+    assert sorted(patterns.counts.tolist()) == sorted(expected.tolist())
+    for pattern in range(len(patterns)):
+        rows = patterns.rows(pattern)
+        assert len(rows) == patterns.counts[pattern]
+        missing = patterns.missing_columns(pattern)
+        for position in rows:
+            assert df.columns[df.iloc[position].isna()].tolist() == missing
+
+
+def test_find_pattern_by_columns():
+    df = pd.DataFrame({'a': [1, None, None], 'b': [1, 2, None]})
+    patterns = missingness.MissingPatterns(df)
+    assert patterns.rows(patterns.find(['a'])).tolist() == [1]
+    assert patterns.rows(patterns.find(['a', 'b'])).tolist() == [2]
+    assert patterns.find(['b']) is None
+
+
+def test_table_skips_complete_rows():
+    df = pd.DataFrame({'a': [1, None, None, 4], 'b': [1, 2, 3, 4]})
+    table = missingness.MissingPatterns(df).table()
+    assert table[['rows', 'columns']].values.tolist() == [[2, 'a']]
+    assert len(missingness.MissingPatterns(df).table(include_complete=True)) == 2
+
+
+def test_frame_without_columns():
+    patterns = missingness.MissingPatterns(pd.DataFrame(index=range(3)))
+    assert len(patterns) == 1
+    assert patterns.rows(0).tolist() == [0, 1, 2]
+    assert patterns.missing_columns(0) == []
+    assert patterns.find([]) == 0
+    assert patterns.table().empty
+    assert len(missingness.MissingPatterns(pd.DataFrame())) == 0
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import edits
+import helpers as h
+import profiling
+
+FIELDS = ['null_count', 'distinct_count', 'duplicate_count', 'case_counts',
+          'min_length', 'max_length', 'mean_length', 'length_counts']
+
+
+def assert_same_profile(profile, expected, columns):
+    for column in columns:
+        for name in FIELDS:
+            value, wanted = getattr(profile.columns[column], name), getattr(expected.columns[column], name)
+            if isinstance(wanted, float):
+                assert value == pytest.approx(wanted), (column, name)
+            else:
+                assert value == wanted, (column, name)
+
+
+def test_profile_matches_pandas(members):
+    profile = profiling.profile_dataframe(members)
+    for column in members.columns:
+        series = members[column]
+        assert profile.columns[column].null_count == series.isna().sum()
+        assert profile.columns[column].distinct_count == series.nunique()
+        assert profile.columns[column].duplicate_count == series.duplicated().sum()
+
+    metrics = profile.metrics()
+    webmails = members['pup_webmail']
+    assert metrics['total_rows'] == len(members)
+    assert metrics['unique_webmails'] == webmails.nunique()
+    assert metrics['non_webmail_members'] == webmails.isna().sum()
+    assert h.calculate_data_metrics(members) == metrics
+
+
+def test_text_flags_match_python_str():
+    values = ["JUAN", "juan", "Juan Dela Cruz", "McDonald", " Ana", "Ana  Marie", "Niño", "123", ""]
+    flags = profiling.string_flags(pd.array(values, dtype='string[pyarrow]').__arrow_array__())
+    assert flags['Uppercase'].tolist() == [value.isupper() for value in values]
+    assert flags['Lowercase'].tolist() == [value.islower() for value in values]
+    assert flags['Title Case'].tolist() == [value.istitle() for value in values]
+    assert flags['Leading/Trailing Whitespace'].tolist() == [value != value.strip() for value in values]
+    assert flags['Double Spaces'].tolist() == ['  ' in value for value in values]
+    assert flags['Non-ASCII'].tolist() == [not value.isascii() for value in values]
+    assert profiling.classify_case("McDonald")['Mixed Case'] == 1
+
+
+def test_case_analysis_from_profile(members):
+    profile = profiling.profile_dataframe(members)
+    direct = h.analyze_text_case(members)
+    pd.testing.assert_frame_equal(profile.case_analysis(), direct, check_dtype=False)
+
+
+def test_updates_match_rebuild(members):
+    profile = profiling.profile_dataframe(members)
+    rng = np.random.default_rng(0)
+    cells = []
+    for column, values in [
+        ('pup_webmail', [None, "new@iskolarngbayan.pup.edu.ph", members['pup_webmail'].iloc[0]]),
+        ('first_name', ["JUAN", "  ana", None, "Niño"]),
+        ('course', ["BSNEW", None]),
+        ('year_level', [5, None])
+    ]:
+        positions = rng.choice(len(members), 80, replace=False)
+        cells.append(pd.DataFrame({
+            'position': positions,
+            'column': column,
+            'new': [values[i % len(values)] for i in range(len(positions))]
+        }))
+    delta = pd.concat(cells, ignore_index=True)
+    delta.insert(0, 'row_id', members.index[delta['position']])
+    edits.apply_edits(members, delta, profile)
+
+    rebuilt = profiling.profile_dataframe(members)
+    assert_same_profile(profile, rebuilt, ['pup_webmail'])
+    for column in ['first_name', 'course', 'year_level']:
+        assert profile.columns[column].null_count == rebuilt.columns[column].null_count
+    assert profile.case_analysis().equals(rebuilt.case_analysis())
+    assert profile.metrics() == rebuilt.metrics()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import search
+
+
+def sample_frame(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    names = np.array(["Juan Dela Cruz", "Maria Santos", "ana reyes", "JOSE GARCIA", "Mark Cruz", None], dtype=object)
+    return pd.DataFrame({
+        'name': names[rng.integers(0, len(names), rows)],
+        'course': rng.choice(["BSIT", "BSCS", "BSIE"], rows)
+    })
+
+
+def expected(series, query, mode, case_sensitive):
+    text = series.dropna().astype(str)
+    if mode == 'regex':
+        hits = text.str.contains(query, case=case_sensitive, regex=True)
+    elif case_sensitive:
+        hits = text.str.contains(query, regex=False) if mode == 'contains' else text.str.startswith(query)
+    else:
+        lowered = text.str.casefold()
+        hits = lowered.str.contains(query.casefold(), regex=False) if mode == 'contains' else lowered.str.startswith(query.casefold())
+    return hits.reindex(series.index, fill_value=False).to_numpy(dtype=bool)
+
+
+@pytest.mark.parametrize('query, mode, case_sensitive', [
+    ("cruz", 'contains', False),
+    ("Cruz", 'contains', True),
+    ("ma", 'prefix', False),
+    ("Ma", 'prefix', True),
+    ("^j.*a$", 'regex', False),
+    ("zzz", 'contains', False),
+])
+def test_matches_pandas(query, mode, case_sensitive):
+    df = sample_frame()
+    index = search.ColumnIndex(df['name'])
+    assert (index.match(query, mode, case_sensitive) == expected(df['name'], query, mode, case_sensitive)).all()
+
+
+def test_updates_match_rebuild():
+    df = sample_frame()
+    searcher = search.SearchIndex(df)
+    searcher.search("cruz", ['name'])  # Builds the name index before the edits
+
+    rng = np.random.default_rng(1)
+    positions = rng.choice(len(df), 150, replace=False)
+    values = [None if i % 10 == 0 else f"New Name {i % 40}" for i in range(len(positions))]
+    df.iloc[positions, df.columns.get_loc('name')] = values
+    searcher.update(pd.DataFrame({'position': positions, 'column': 'name', 'new': values}))
+
+    rebuilt = search.SearchIndex(df)
+    for query, mode in [("new name 1", 'contains'), ("cruz", 'contains'), ("new", 'prefix'), ("3$", 'regex')]:
+        assert (searcher.search(query, ['name'], mode) == rebuilt.search(query, ['name'], mode)).all()
+
+
+def test_invalid_mode_and_regex():
+    index = search.ColumnIndex(sample_frame()['name'])
+    with pytest.raises(ValueError):
+        index.match("a", mode='fuzzy')
+    with pytest.raises(ValueError):
+        index.match("(", mode='regex')
+
+
+def test_search_all_columns():
+    df = sample_frame()
+    mask = search.SearchIndex(df).search("bsit")
+    assert (mask == (df['course'] == "BSIT").to_numpy()).all()
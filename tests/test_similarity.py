@@ -0,0 +1,53 @@
+import random
+
+import pandas as pd
+import pytest
+
+import helpers as h
+import similarity
+
+
+def sample_values(n, seed=0):
+    rng = random.Random(seed)
+    names = ["Juan", "Maria", "Jose", "Ana", "Mark", "Grace", "Dela Cruz", "Santos", "Reyes", "Garcia"]
+    values = set()
+    while len(values) < n:
+        value = " ".join(rng.sample(names, rng.randint(1, 3)))
+        if rng.random() < 0.4:
+            i = rng.randrange(len(value))
+            value = value[:i] + rng.choice("aeiou.- ") + value[i + 1:]
+        if rng.random() < 0.2:
+            value = value.upper()
+        values.add(value)
+    return sorted(values) + ["", "!!!"]
+
+
+def as_set(pairs):
+    return {(pair['value1'], pair['value2'], pair['similarity']) for pair in pairs}
+
+
+@pytest.mark.parametrize('threshold', [0.0, 0.5, 0.8, 0.95, 1.0])
+def test_matches_brute_force(threshold):
+    values = sample_values(150)
+    assert as_set(similarity.find_similar_pairs(values, threshold)) == as_set(similarity._all_value_pairs(values, threshold))
+
+
+def test_normalization():
+    assert similarity.normalize_string("  Dela-Cruz,   JUAN ") == "delacruz juan"
+    assert similarity.normalize_string(None) == ""
+
+
+def test_parallel_matches_serial(monkeypatch):
+    values = sample_values(300, seed=1)
+    monkeypatch.setattr(similarity, 'PARALLEL_MIN_VALUES', 10)
+    serial = similarity.find_similar_pairs(values, 0.8)
+    parallel = similarity.find_similar_pairs(values, 0.8, workers=2)
+    assert as_set(parallel) == as_set(serial)
+
+
+def test_rows_of_similar_strings():
+    df = pd.DataFrame({'name': ["Juan Dela Cruz", "juan dela-cruz", "Maria Santos", None], 'age': [1, 2, 3, 4]})
+    pairs, rows = h.find_similar_strings_with_rows(df, 'name', 0.9)
+    assert len(pairs) == 1
+    assert rows.index.tolist() == [0, 1]
+    assert h.find_similar_strings_with_rows(df, 'age', 0.9)[0].empty
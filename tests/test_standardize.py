@@ -0,0 +1,71 @@
+import pandas as pd
+
+import standardize
+
+
+def fixed(df, rules):
+    fixes = standardize.propose_fixes(df, rules)
+    result = df.astype(object).copy()
+    for fix in fixes.itertuples():
+        result.iat[fix.position, result.columns.get_loc(fix.column)] = fix.new
+    return result
+
+
+def test_title_case_keeps_mixed_case_words():
+    df = pd.DataFrame({'full_name': ["McDonald ronald", "JUAN DELA CRUZ", "maria iii", "SANTOS-CRUZ", None]})
+    assert fixed(df, ['title_case'])['full_name'].tolist() == [
+        "McDonald Ronald", "Juan Dela Cruz", "Maria III", "Santos-Cruz", None
+    ]
+
+
+def test_title_case_only_touches_name_columns():
+    df = pd.DataFrame({'first_name': ["ANA"], 'course': ["BSIT"]})
+    fixes = standardize.propose_fixes(df, ['title_case'])
+    assert fixes['column'].tolist() == ['first_name']
+
+
+def test_course_codes_are_normalized():
+    df = pd.DataFrame({'course': ["bs-it", "BS IT", "b.s.c.s.", "BSIT"]})
+    assert fixed(df, ['course'])['course'].tolist() == ["BSIT", "BSIT", "BSCS", "BSIT"]
+
+
+def test_written_out_courses_are_kept():
+    courses = ["Bachelor of Science in Information Technology", "BS Computer Science", "bsit 2"]
+    df = pd.DataFrame({'course': courses})
+    assert standardize.propose_fixes(df, ['course']).empty
+
+
+def test_whitespace_and_webmail():
+    df = pd.DataFrame({
+        'first_name': ["  Ana   Marie "],
+        'pup_webmail': [" Ana@IskolarNgBayan.pup.edu.ph "]
+    })
+    result = fixed(df, ['whitespace', 'webmail'])
+    assert result.loc[0, 'first_name'] == "Ana Marie"
+    assert result.loc[0, 'pup_webmail'] == "ana@iskolarngbayan.pup.edu.ph"
+
+
+def test_fixes_record_every_rule():
+    df = pd.DataFrame({'first_name': ["  ANA  "]})
+    fixes = standardize.propose_fixes(df, ['whitespace', 'title_case'])
+    assert fixes.loc[0, 'rule'] == "Collapse whitespace, Title-case names"
+    assert fixes.loc[0, 'new'] == "Ana"
+
+
+def test_categoricals_match_plain_strings():
+    values = ["bs-it", "BSIT", "bs cs", None, "bs-it"]
+    plain = standardize.propose_fixes(pd.DataFrame({'course': values}), ['course'])
+    categorical = standardize.propose_fixes(pd.DataFrame({'course': pd.Categorical(values)}), ['course'])
+    assert plain[['position', 'new']].values.tolist() == categorical[['position', 'new']].values.tolist()
+
+
+def test_summary_counts_each_change():
+    df = pd.DataFrame({'course': ["bs-it", "bs-it", "bs cs"]})
+    summary = standardize.summarize_fixes(standardize.propose_fixes(df, ['course']))
+    assert summary[['old', 'new', 'rows']].values.tolist() == [["bs-it", "BSIT", 2], ["bs cs", "BSCS", 1]]
+
+
+def test_invalid_webmails():
+    df = pd.DataFrame({'pup_webmail': ["A@iskolarngbayan.pup.edu.ph", "a@gmail.com", None]})
+    assert standardize.invalid_webmails(df)['value'].tolist() == ["a@gmail.com"]
+    assert standardize.invalid_webmails(df.drop(columns='pup_webmail')).empty
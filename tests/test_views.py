@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+import views
+
+
+def test_from_mask_and_labels(members):
+    mask = (members['course'] == "BSIT").to_numpy()
+    view = views.RowView.from_mask(mask)
+    assert not view.full
+    assert view.positions.tolist() == np.flatnonzero(mask).tolist()
+    assert views.RowView.from_mask(np.ones(len(members), dtype=bool)).full
+
+    labels = [members.index[5], "not a label", members.index[2]]
+    assert views.RowView.from_labels(members, labels).positions.tolist() == [5, 2]
+
+
+def test_sort_matches_pandas(members):
+    view = views.RowView.from_mask((members['year_level'] != 1).to_numpy())
+    for column in ['last_name', 'course', 'year_level']:
+        for ascending in (True, False):
+            rows = members.iloc[view.positions]
+            key = rows[column].astype(object) if isinstance(rows[column].dtype, pd.CategoricalDtype) else rows[column]
+            expected = key.sort_values(ascending=ascending, kind='stable', na_position='last').index
+            assert view.sort(members, column, ascending).materialize(members).index.tolist() == expected.tolist()
+
+
+def test_pages_cover_the_view(members):
+    view = views.RowView.from_mask((members['course'] != "BSIT").to_numpy())
+    first, count = view.page(1, page_size=50)
+    assert count == -(-len(view) // 50)
+    pages = [view.page(page, page_size=50)[0].positions for page in range(1, count + 1)]
+    assert np.concatenate(pages).tolist() == view.positions.tolist()
+    assert view.page(count + 5, page_size=50)[0].positions.tolist() == pages[-1].tolist()
+
+
+def test_materialize_and_data_positions(members):
+    full = views.RowView.all(members)
+    assert full.materialize(members) is members
+    assert full.page(1, page_size=len(members))[0] is full
+
+    view = views.RowView(np.array([7, 3, 9]))
+    pd.testing.assert_frame_equal(view.materialize(members), members.iloc[[7, 3, 9]])
+    assert view.data_positions([2, 0]).tolist() == [9, 7]
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Page sizes offered by the paged data editor.
+PAGE_SIZES = [50, 100, 250, 500, 1000]
+DEFAULT_PAGE_SIZE = 100
+
+
+def _sort_key(series):
+    """Sort categoricals by their values rather than by category order."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        ranks = np.empty(len(categories), dtype='int64')
+        ranks[categories.astype(str).argsort(kind='stable')] = np.arange(len(categories))
+        codes = series.cat.codes.to_numpy()
+        return pd.Series(np.where(codes >= 0, ranks[codes], np.nan), index=series.index)
+    return series
+
+
+@dataclass
+class RowView:
+    """
+    A filter result over the session's data, stored as row positions.
+
+    A view never copies the data it selects. Rows are only gathered by
+    `materialize` when they are sent to the browser, and positions reported
+    by `st.data_editor` map back to the data through `positions`.
+    """
+    positions: np.ndarray
+    full: bool = False
+
+    @classmethod
+    def all(cls, df):
+        """A view of every row of `df`."""
+        return cls(np.arange(len(df)), full=True)
+
+    @classmethod
+    def from_mask(cls, mask):
+        """
+        A view of the rows where a boolean mask is true.
+
+        Args:
+            mask (array-like): One boolean per row of the data.
+
+        Returns:
+            RowView: The selected rows, in data order.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.all():
+            return cls(np.arange(len(mask)), full=True)
+        return cls(np.flatnonzero(mask))
+
+    @classmethod
+    def from_labels(cls, df, labels):
+        """
+        A view of the rows of `df` with the given index labels.
+
+        Args:
+            df (pd.DataFrame): The data.
+            labels (array-like): Row labels; labels not in `df` are ignored.
+
+        Returns:
+            RowView: The selected rows, in the order of `labels`.
+        """
+        positions = df.index.get_indexer(labels)
+        return cls(positions[positions >= 0])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def data_positions(self, view_positions):
+        """
+        Map positions within the view to positions in the data.
+
+        Args:
+            view_positions (array-like): Row positions as reported by the editor.
+
+        Returns:
+            np.ndarray: The matching row positions in the data.
+        """
+        return self.positions[np.asarray(view_positions, dtype='int64')]
+
+    def sort(self, df, column, ascending=True):
+        """
+        The same rows ordered by a column, with missing values last.
+
+        Only the column values of the rows in the view are sorted; the data is
+        not reordered or copied.
+
+        Args:
+            df (pd.DataFrame): The data the view was built on.
+            column (str): The column to sort by.
+            ascending (bool): Sort ascending (default) or descending.
+
+        Returns:
+            RowView: The sorted view.
+        """
+        values = df[column].iloc[self.positions].reset_index(drop=True)
+        order = values.sort_values(
+            ascending=ascending, kind='stable', na_position='last', key=_sort_key
+        ).index.to_numpy()
+        return RowView(self.positions[order])
+
+    def page(self, page, page_size=DEFAULT_PAGE_SIZE):
+        """
+        One page of the view.
+
+        Args:
+            page (int): The 1-based page number; out of range pages are clamped.
+            page_size (int): Rows per page (default is DEFAULT_PAGE_SIZE).
+
+        Returns:
+            tuple: A tuple containing:
+                - page_view (RowView): The rows on the page.
+                - page_count (int): The number of pages, at least 1.
+        """
+        page_count = max(1, -(-len(self) // page_size))
+        page = min(max(page, 1), page_count)
+        if page_count == 1 and self.full:
+            return self, page_count
+        return RowView(self.positions[(page - 1) * page_size:page * page_size]), page_count
+
+    def materialize(self, df):
+        """
+        The rows of the view as a DataFrame.
+
+        A full view returns `df` itself, so callers must not modify the result.
+
+        Args:
+            df (pd.DataFrame): The data the view was built on.
+
+        Returns:
+            pd.DataFrame: The selected rows with their original index.
+        """
+        if self.full:
+            return df
+        return df.take(self.positions)
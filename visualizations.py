@@ -1,18 +1,20 @@
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
+from instrumentation import instrumented
 
-def create_missing_values_chart(df):
+@instrumented
+def create_missing_values_chart(df, profile=None):
     """
     Create a horizontal bar chart for missing values per column.
     
     Args:
         df (pd.DataFrame): The dataframe to analyze.
+        profile (profiling.DataProfile): A precomputed profile of `df`, used instead of scanning it.
     
     Returns:
         go.Figure: Plotly figure for missing values.
     """
-    missing_counts = df.isna().sum()
+    missing_counts = profile.missing_counts() if profile is not None else df.isna().sum()
     missing_counts = missing_counts[missing_counts > 0]  # Only show columns with missing values
     
     if missing_counts.empty:
@@ -48,15 +50,17 @@ def create_missing_values_chart(df):
     )
     return fig
 
+@instrumented
 def create_text_case_chart(case_analysis_df):
     """
-    Create a subplot for text case analysis (uppercase, lowercase, title case).
+    Create a heatmap of text case and string health counts per column.
     
     Args:
-        case_analysis_df (pd.DataFrame): Dataframe with case analysis results.
+        case_analysis_df (pd.DataFrame): Result of `helpers.analyze_text_case`, one row per check
+            and one column per text column.
     
     Returns:
-        go.Figure: Plotly figure with subplots for each column.
+        go.Figure: Plotly heatmap with the count in each cell.
     """
     if case_analysis_df.empty:
         fig = go.Figure()
@@ -73,31 +77,23 @@ def create_text_case_chart(case_analysis_df):
         )
         return fig
     
-    columns = case_analysis_df.columns
-    fig = make_subplots(
-        rows=1,
-        cols=len(columns),
-        subplot_titles=columns,
-        shared_yaxes=True
-    )
-    
-    for i, col in enumerate(columns, start=1):
-        fig.add_trace(
-            go.Bar(
-                x=case_analysis_df[col].index,
-                y=case_analysis_df[col].values,
-                name=col,
-                marker_color=['#7B169E', '#7B169E', '#7B169E']  # Colors for uppercase, lowercase, title case
-            ),
-            row=1,
-            col=i
+    fig = go.Figure(
+        go.Heatmap(
+            z=case_analysis_df.values,
+            x=list(case_analysis_df.columns),
+            y=list(case_analysis_df.index),
+            text=case_analysis_df.values,
+            texttemplate="%{text}",
+            colorscale=[[0, '#FFFFFF'], [1, '#7B169E']],
+            showscale=False,
+            hovertemplate="%{x}<br>%{y}: %{z}<extra></extra>"
         )
+    )
     
     fig.update_layout(
-        title="Text Case Analysis (Uppercase, Lowercase, Title Case)",
-        height=400,
-        showlegend=False,
+        title="Text Case Analysis (Case, Whitespace, Non-ASCII)",
+        height=max(400, len(case_analysis_df.index) * 45),
         template="plotly_white"
     )
-    fig.update_yaxes(title_text="Count", row=1, col=1)
-    return fig
\ No newline at end of file
+    fig.update_yaxes(autorange="reversed")  # Keep the checks in the order they are listed
+    return fig